@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from pathlib import Path
+import os
 
 class Settings(BaseSettings):
     # Application Settings
@@ -11,15 +12,54 @@ class Settings(BaseSettings):
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
     ALLOWED_EXTENSIONS: set = {"pdf", "jpg", "jpeg", "png"}
     UPLOAD_FOLDER: str = "uploads"
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    UPLOAD_ENVELOPE_ALLOWANCE: int = 64 * 1024  # request body bytes allowed over MAX_FILE_SIZE for multipart overhead
+    
+    # Processor Pool Settings (0 workers runs extraction in the calling thread)
+    PROCESSOR_POOL_SIZE: int = os.cpu_count() or 1
+    PROCESSOR_MAX_CONCURRENCY: int = 2 * (os.cpu_count() or 1)
     
     # OCR Settings
     OCR_LANGUAGE: str = "eng"
     OCR_DPI: int = 300
+    OCR_MIN_PAGE_CHARS: int = 10
+    OCR_ENGINE: str = "pytesseract"  # or "persistent" for long-lived tesserocr workers (tesserocr extra)
+    # Pages OCRed at once across all processor pool workers (0: one per CPU).
+    # The workers share this budget, so one scanned document can use every
+    # CPU while concurrent documents split them instead of multiplying the
+    # pools; persistent engines divide it by PROCESSOR_POOL_SIZE
+    OCR_WORKERS: int = 0
+    OCR_RENDER_BATCH: int = 2  # pages rasterized per pdf2image call
+    OCR_MAX_PAGES_IN_MEMORY: int = 8
+    OCR_CACHE_DIR: str = "cache/ocr"  # empty disables the page OCR cache
+    OCR_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
     
     # Analysis Settings
     RISK_THRESHOLD_HIGH: float = 7.0
     RISK_THRESHOLD_MEDIUM: float = 4.0
+    DEFAULT_ANALYSIS_TYPE: str = "COMPREHENSIVE"  # BASIC, DETAILED or COMPREHENSIVE
     CONTEXT_WINDOW_SIZE: int = 50
+    CONTEXT_TOP_N: int = 20  # findings returned with a rendered context snippet
+    MAX_FINDINGS: int = 100
+    AGGREGATE_FINDINGS: bool = True  # merge repeats of a keyword into one finding
+    STREAM_ANALYSIS_MIN_PAGES: int = 200  # longer documents are analyzed page by page
+    STREAM_CHUNK_OVERLAP: int = 256  # normalized characters kept between streamed chunks
+    CLASSIFICATION_PREFIX_CHARS: int = 10000  # first prefix checked; 0 classifies whole documents
+    CLASSIFICATION_MARGIN: float = 15.0  # score lead that settles the document type early
+    
+    # Job Settings
+    JOB_WORKERS: int = os.cpu_count() or 1
+    MAX_PENDING_JOBS: int = 100
+    JOB_RESULT_TTL: int = 3600  # seconds
+    
+    # Result Cache Settings (empty RESULT_CACHE_DIR keeps the cache in memory only)
+    RULES_VERSION: str = "1"
+    RESULT_CACHE_SIZE: int = 256
+    RESULT_CACHE_DIR: str = ""
+    RESULT_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    
+    # Rule Pack Settings (empty RULE_PACK_PATH uses the bundled rules/irish_employment.json)
+    RULE_PACK_PATH: str = ""
     
     # Path Settings
     BASE_DIR: Path = Path(__file__).resolve().parent.parent
@@ -1,28 +1,34 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
 from fastapi.templating import Jinja2Templates
+import hashlib
 import time
-import os
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 from .config import settings
 from irish_law_analyzer.services.processor.pdf_processor import PDFProcessor
 from irish_law_analyzer.services.processor.image_processor import ImageProcessor
+from irish_law_analyzer.services.processor.executor import ProcessPoolBackend
 from irish_law_analyzer.services.analyzer.document_analyzer import DocumentAnalyzer
-from irish_law_analyzer.core.models import ProcessingStatus
+from irish_law_analyzer.services.analyzer.rule_snapshot import RuleSnapshot
+from irish_law_analyzer.core.models import Finding
+from irish_law_analyzer.core.enums import AnalysisType, RiskLevel
+from irish_law_analyzer.services.jobs.job_manager import JobManager, JobQueueFullError
+from irish_law_analyzer.services.cache.result_cache import AnalysisResultCache
 
 # Utils importları
 from irish_law_analyzer.utils.logger import logger
+from irish_law_analyzer.utils.cache import DiskCache
 from irish_law_analyzer.utils.helpers import (
     generate_document_id,
-    create_temp_file_path,
-    cleanup_old_files,
-    extract_metadata
+    cleanup_old_files
 )
 from irish_law_analyzer.utils.validators import (
     validate_file_type,
-    validate_file_size,
+    validate_upload_size,
     validate_text_content
 )
 
@@ -39,12 +45,86 @@ templates = Jinja2Templates(directory=str(settings.TEMPLATES_DIR))
 # Initialize services
 pdf_processor = PDFProcessor()
 image_processor = ImageProcessor()
+processor_backend = ProcessPoolBackend(
+    max_workers=settings.PROCESSOR_POOL_SIZE,
+    max_concurrency=settings.PROCESSOR_MAX_CONCURRENCY
+)
 document_analyzer = DocumentAnalyzer()
+result_cache = AnalysisResultCache(
+    max_entries=settings.RESULT_CACHE_SIZE,
+    analyzer_version=f"{settings.APP_VERSION}:{settings.RULES_VERSION}",
+    disk_cache=DiskCache(
+        settings.BASE_DIR / settings.RESULT_CACHE_DIR,
+        max_bytes=settings.RESULT_CACHE_MAX_BYTES
+    ) if settings.RESULT_CACHE_DIR else None
+)
+job_manager = JobManager(
+    max_workers=settings.JOB_WORKERS,
+    max_pending=settings.MAX_PENDING_JOBS,
+    result_ttl=settings.JOB_RESULT_TTL
+)
 
 # Uygulama başlatılırken uploads klasörünü oluştur
 UPLOAD_DIR = Path(__file__).parent.parent / "uploads"
 UPLOAD_DIR.mkdir(exist_ok=True)
 
+UPLOAD_PATHS = {"/upload/", "/jobs/"}
+
+class UploadSizeLimitMiddleware:
+    """Refuse upload request bodies over the size limit while they are received.
+
+    A declared Content-Length over the limit is refused before the body is
+    read. Otherwise bytes are counted as the server receives them, so bodies
+    without a Content-Length (chunked transfer encoding) are cut off as soon
+    as they pass the limit instead of being spooled in full.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in UPLOAD_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        # Allow for the multipart boundaries and part headers around the file
+        limit = settings.MAX_FILE_SIZE + settings.UPLOAD_ENVELOPE_ALLOWANCE
+        detail = f"File size exceeds maximum limit of {settings.MAX_FILE_SIZE} bytes"
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > limit:
+            logger.log_error("HTTPException", f"413: Declared upload size {content_length} bytes")
+            await JSONResponse(status_code=413, content={"detail": detail})(scope, receive, send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def receive_within_limit():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    logger.log_error("HTTPException", f"413: Upload body passed {limit} bytes")
+                    # Body parsing re-raises HTTPException, so this becomes the response
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        async def track_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive_within_limit, track_send)
+        except HTTPException as e:
+            if e.status_code != 413 or response_started:
+                raise
+            await JSONResponse(status_code=413, content={"detail": e.detail})(scope, receive, send)
+
+app.add_middleware(UploadSizeLimitMiddleware)
+
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Render the home page with upload form"""
@@ -53,104 +133,192 @@ async def home(request: Request):
         {"request": request, "app_name": settings.APP_NAME}
     )
 
-@app.post("/upload/")
-async def upload_file(file: UploadFile = File(...)):
-    """Handle file upload and analysis"""
-    temp_file_path = None
-    try:
-        # Read file content
-        file_content = await file.read()
-        
-        # Validate file
-        is_valid_type, type_error = validate_file_type(file_content, file.filename)
-        if not is_valid_type:
-            raise HTTPException(status_code=415, detail=type_error)
-            
-        is_valid_size, size_error = validate_file_size(file_content)
-        if not is_valid_size:
-            raise HTTPException(status_code=413, detail=size_error)
+def _run_pipeline(
+    file_content: bytes,
+    filename: str,
+    document_id: str,
+    content_hash: str,
+    analysis_type: str
+) -> Dict:
+    """Serve a validated upload from the result cache or analyze it (runs on a worker thread)"""
+    # Pin the rules for this request; a reload meanwhile only affects later requests
+    rules = document_analyzer.rules
+    cache_key = result_cache.make_key(content_hash, f"{analysis_type}:{rules.fingerprint}")
+    response_data, cache_hit = result_cache.get_or_compute(
+        cache_key, _analyze_upload, file_content, filename, document_id, analysis_type, rules
+    )
 
-        # Generate unique document ID
-        document_id = generate_document_id(file.filename, file_content)
-        
-        # Save file temporarily
-        temp_file_name = f"{int(time.time())}_{file.filename}"
-        temp_file_path = UPLOAD_DIR / temp_file_name
-        
-        with open(temp_file_path, "wb") as buffer:
-            buffer.write(file_content)
-        
-        # Log processing start
-        logger.logger.info(f"Starting processing for document: {document_id}")
+    if cache_hit:
+        logger.logger.info(f"Serving cached analysis for document: {document_id}")
+        response_data["document_id"] = document_id
+        response_data["filename"] = filename
+        response_data["metadata"].update({
+            "filename": filename,
+            "document_id": document_id,
+            "upload_time": time.strftime("%Y-%m-%d %H:%M:%S")
+        })
+    response_data["metadata"]["cache_hit"] = cache_hit
+
+    return response_data
+
+def _analyze_upload(
+    file_content: bytes,
+    filename: str,
+    document_id: str,
+    analysis_type: str,
+    rules: Optional[RuleSnapshot] = None
+) -> Dict:
+    """Extract, analyze and serialize a validated upload"""
+    # Log processing start
+    logger.logger.info(f"Starting processing for document: {document_id}")
+    
+    start_time = time.time()
+
+    # Process file based on type, extracting text in a worker process
+    processor = pdf_processor if filename.endswith('.pdf') else image_processor
+    processor_result = processor_backend.process_document(processor, file_content, filename)
         
-        start_time = time.time()
-
-        # Process file based on type
-        if file.filename.endswith('.pdf'):
-            processor_result = pdf_processor.process_document(file_content, file.filename)
-        else:
-            processor_result = image_processor.process_document(file_content, file.filename)
-            
-        if not processor_result.success:
-            logger.log_error("ProcessingError", processor_result.error)
-            raise HTTPException(
-                status_code=422,
-                detail=f"File processing failed: {processor_result.error}"
-            )
-
-        # Validate extracted text
-        is_valid_text, text_error = validate_text_content(processor_result.extracted_text)
-        if not is_valid_text:
-            logger.log_error("TextExtractionError", text_error)
-            raise HTTPException(status_code=422, detail=text_error)
-
-        # Analyze document
-        analysis_result = await document_analyzer.analyze_document(
+    if not processor_result.success:
+        logger.log_error("ProcessingError", processor_result.error)
+        raise HTTPException(
+            status_code=422,
+            detail=f"File processing failed: {processor_result.error}"
+        )
+
+    # Validate extracted text
+    is_valid_text, text_error = validate_text_content(processor_result.extracted_text)
+    if not is_valid_text:
+        logger.log_error("TextExtractionError", text_error)
+        raise HTTPException(status_code=422, detail=text_error)
+
+    # Analyze document
+    if len(processor_result.pages) >= settings.STREAM_ANALYSIS_MIN_PAGES:
+        # Long documents are analyzed page by page, so the analysis stage
+        # adds bounded memory; extraction has already returned every page,
+        # so only the redundant joined copy of the text is released
+        processor_result.extracted_text = ""
+        analysis_result = document_analyzer.analyze_pages(
+            processor_result.pages,
+            document_id=document_id,
+            analysis_type=analysis_type,
+            rules=rules
+        )
+    else:
+        analysis_result = document_analyzer.analyze(
             processor_result.extracted_text,
-            document_id=document_id
+            document_id=document_id,
+            pages=processor_result.pages,
+            analysis_type=analysis_type,
+            rules=rules
         )
-        
-        # Calculate processing time
-        processing_time = time.time() - start_time
-        
-        # Extract metadata
-        metadata = {
-            "filename": file.filename,
-            "size": len(file_content),
-            "document_id": document_id,
-            "processing_time": processing_time,
-            "upload_time": time.strftime("%Y-%m-%d %H:%M:%S"),
-            "file_type": "PDF" if file.filename.endswith('.pdf') else "Image"
-        }
-        
-        # Log analysis completion
-        logger.log_analysis(document_id, {
+    
+    # Calculate processing time
+    processing_time = time.time() - start_time
+    
+    # Extract metadata
+    metadata = {
+        "filename": filename,
+        "size": len(file_content),
+        "document_id": document_id,
+        "processing_time": processing_time,
+        "upload_time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "file_type": "PDF" if filename.endswith('.pdf') else "Image"
+    }
+    
+    # Log analysis completion
+    logger.log_analysis(document_id, {
+        "risk_score": analysis_result.risk_score,
+        "overall_risk_level": analysis_result.overall_risk_level.value,
+        "findings_count": len(analysis_result.findings),
+        "processing_time": processing_time
+    })
+
+    return {
+        "document_id": document_id,
+        "filename": filename,
+        "analysis": {
             "risk_score": analysis_result.risk_score,
             "overall_risk_level": analysis_result.overall_risk_level.value,
-            "findings_count": len(analysis_result.findings),
+            "findings": _serialize_findings(analysis_result.findings),
+            # Categories list indices into findings rather than repeating them
+            "categories": {
+                cat: list(indices)
+                for cat, indices in analysis_result.categories.items()
+            },
+            "recommendations": analysis_result.recommendations,
+            "document_type": analysis_result.document_type.value,
+            "analysis_type": analysis_type,
             "processing_time": processing_time
-        })
+        },
+        "metadata": metadata,
+        "status": analysis_result.status.value
+    }
 
-        response_data = {
-            "document_id": document_id,
-            "filename": file.filename,
-            "analysis": {
-                "risk_score": analysis_result.risk_score,
-                "overall_risk_level": analysis_result.overall_risk_level.value,
-                "findings": [vars(f) for f in analysis_result.findings],
-                "categories": {
-                    cat: [vars(f) for f in findings]
-                    for cat, findings in analysis_result.categories.items()
-                },
-                "recommendations": analysis_result.recommendations,
-                "document_type": analysis_result.document_type.value,
-                "processing_time": processing_time
-            },
-            "metadata": metadata,
-            "status": analysis_result.status.value
-        }
+def _serialize_findings(findings: List[Finding]) -> List[Dict]:
+    """Serialize findings, rendering context only for the riskiest CONTEXT_TOP_N"""
+    risk_rank = {RiskLevel.HIGH.value: 0, RiskLevel.MEDIUM.value: 1, RiskLevel.LOW.value: 2}
+    ranked = sorted(
+        range(len(findings)),
+        key=lambda i: risk_rank.get(findings[i].risk_level, len(risk_rank))
+    )
+    with_context = set(ranked[:settings.CONTEXT_TOP_N])
+    return [
+        f.to_dict(
+            include_context=i in with_context,
+            context_window=settings.CONTEXT_WINDOW_SIZE
+        )
+        for i, f in enumerate(findings)
+    ]
+
+async def _receive_upload(file: UploadFile) -> Tuple[bytes, str]:
+    """Read an upload in chunks, rejecting it as soon as it breaks a limit.
+
+    The type is sniffed from the first chunk and the SHA-256 and byte count
+    are updated as chunks are read. Returns (content, content_hash).
+    """
+    if file.size is not None:
+        is_valid_size, size_error = validate_upload_size(file.size)
+        if not is_valid_size:
+            raise HTTPException(status_code=413, detail=size_error)
 
-        return response_data
+    digest = hashlib.sha256()
+    chunks: List[bytes] = []
+    received = 0
+    while True:
+        chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+        if received == 0:
+            is_valid_type, type_error = validate_file_type(chunk, file.filename)
+            if not is_valid_type:
+                raise HTTPException(status_code=415, detail=type_error)
+        if not chunk:
+            break
+
+        received += len(chunk)
+        is_valid_size, size_error = validate_upload_size(received)
+        if not is_valid_size:
+            raise HTTPException(status_code=413, detail=size_error)
+
+        digest.update(chunk)
+        chunks.append(chunk)
+
+    return b"".join(chunks), digest.hexdigest()
+
+@app.post("/upload/")
+async def upload_file(file: UploadFile = File(...), analysis_type: Optional[AnalysisType] = None):
+    """Handle file upload and analysis at the requested depth"""
+    try:
+        level = document_analyzer.resolve_analysis_type(analysis_type).value
+
+        # Stream, validate and hash the file
+        file_content, content_hash = await _receive_upload(file)
+
+        # Generate unique document ID
+        document_id = generate_document_id(file.filename, file_content, content_hash)
+        
+        # Run the pipeline on the worker pool so the event loop stays free
+        return await job_manager.run(
+            _run_pipeline, file_content, file.filename, document_id, content_hash, level
+        )
         
     except HTTPException as he:
         logger.log_error("HTTPException", str(he))
@@ -161,13 +329,67 @@ async def upload_file(file: UploadFile = File(...)):
             status_code=500,
             detail=f"An error occurred during processing: {str(e)}"
         )
-    finally:
-        # Cleanup temporary file
-        if temp_file_path and temp_file_path.exists():
-            try:
-                temp_file_path.unlink()
-            except Exception as e:
-                logger.log_error("CleanupError", f"Failed to delete temporary file: {str(e)}")
+
+@app.post("/jobs/", status_code=202)
+async def create_job(file: UploadFile = File(...), analysis_type: Optional[AnalysisType] = None):
+    """Queue a file for background analysis and return its job id"""
+    try:
+        level = document_analyzer.resolve_analysis_type(analysis_type).value
+
+        file_content, content_hash = await _receive_upload(file)
+        document_id = generate_document_id(file.filename, file_content, content_hash)
+
+        job = job_manager.submit(
+            file.filename, _run_pipeline, file_content, file.filename, document_id, content_hash, level
+        )
+        logger.logger.info(f"Queued job {job.job_id} for document: {document_id}")
+
+        return {
+            "job_id": job.job_id,
+            "document_id": document_id,
+            "status": job.status.value
+        }
+
+    except HTTPException as he:
+        logger.log_error("HTTPException", str(he))
+        raise he
+    except JobQueueFullError as e:
+        logger.log_error("JobQueueFull", str(e))
+        raise HTTPException(status_code=503, detail=str(e))
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Return the status and, once finished, the result of a job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job_manager.to_dict(job)
+
+def _describe_rules(rules: RuleSnapshot) -> Dict:
+    return {
+        "name": rules.rule_pack.name,
+        "version": rules.rule_pack.version,
+        "fingerprint": rules.fingerprint,
+        "source": rules.rule_pack.source,
+        "compile_time": round(rules.compile_time, 4)
+    }
+
+@app.get("/rules")
+async def get_rules():
+    """Describe the rule pack currently used for analysis"""
+    return _describe_rules(document_analyzer.rules)
+
+@app.post("/rules/reload")
+def reload_rules():
+    """Reload the configured rule pack and swap it in without interrupting running analyses"""
+    try:
+        rules = document_analyzer.reload_rules()
+    except ValueError as e:
+        # Invalid rule packs (RulePackError) leave the current rules in place
+        logger.log_error("RulePackError", str(e))
+        raise HTTPException(status_code=422, detail=str(e))
+    logger.logger.info(f"Reloaded rule pack {rules.fingerprint}")
+    return _describe_rules(rules)
 
 @app.get("/health")
 async def health_check():
@@ -201,6 +423,8 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     try:
+        job_manager.shutdown(wait=False)
+        processor_backend.shutdown(wait=False)
         cleanup_old_files()
         logger.logger.info("Application shutdown successfully")
     except Exception as e:
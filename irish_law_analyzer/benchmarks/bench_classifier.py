@@ -0,0 +1,65 @@
+"""Measure classification throughput, one document at a time and in batches.
+
+Run from the irish_law_analyzer directory:
+
+    python -m benchmarks.bench_classifier --documents 2000 --words 400
+"""
+import argparse
+import random
+import time
+
+from services.classifier.document_classifier import DocumentClassifier
+
+FILLER = (
+    "the parties agree that this document is governed by irish law and that "
+    "any amendment must be agreed in writing by both sides before it applies"
+).split()
+
+def make_documents(classifier: DocumentClassifier, count: int, words: int, seed: int = 7):
+    rng = random.Random(seed)
+    tables = list(classifier.patterns.values())
+    documents = []
+    for _ in range(count):
+        keywords = rng.choice(tables)['keywords']
+        tokens = [
+            rng.choice(keywords) if rng.random() < 0.05 else rng.choice(FILLER)
+            for _ in range(words)
+        ]
+        documents.append(" ".join(tokens).capitalize() + ".")
+    return documents
+
+def best_of(func, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=400)
+    args = parser.parse_args()
+
+    classifier = DocumentClassifier()
+    documents = make_documents(classifier, args.documents, args.words)
+
+    single = [classifier.classify_document(document) for document in documents]
+    batch = classifier.classify_batch(documents)
+    agreement = sum(a == b for a, b in zip(single, batch)) / len(documents)
+    print(f"documents: {len(documents)} x {args.words} words, agreement {agreement:.1%}")
+
+    one_by_one = best_of(lambda: [classifier.classify_document(d) for d in documents])
+    batched = best_of(lambda: classifier.classify_batch(documents))
+    print(f"{'classify_document loop':<24} {len(documents) / one_by_one:10.0f} docs/s")
+    print(f"{'classify_batch':<24} {len(documents) / batched:10.0f} docs/s")
+    print(f"{'speedup':<24} {one_by_one / batched:10.2f}x")
+
+    # Once trained, character n-gram features carry weight and are extracted too
+    classifier.ngram_classifier.partial_fit(documents, single)
+    trained = best_of(lambda: classifier.classify_batch(documents))
+    print(f"{'classify_batch, trained':<24} {len(documents) / trained:10.0f} docs/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Compare the memory held by Finding dataclasses and by a FindingsStore.
+
+Run from the irish_law_analyzer directory:
+
+    python -m benchmarks.bench_findings_memory --findings 50000
+"""
+import argparse
+import tracemalloc
+
+from core.findings_store import FindingsStore
+from core.models import Finding
+
+ROWS = [
+    ("shall be", "Contractual Clauses", "LOW"),
+    ("section 12", "Legal References", "MEDIUM"),
+    ("15 march 2024", "Dates and Deadlines", "LOW"),
+    ("eur 2,500.00", "Monetary Values", "MEDIUM"),
+]
+
+def build_dataclasses(source: str, count: int):
+    """One Finding per match plus per-category lists, as the analyzer used to"""
+    findings = []
+    categories = {}
+    for i in range(count):
+        keyword, category, risk_level = ROWS[i % len(ROWS)]
+        finding = Finding(
+            keyword=keyword,
+            risk_level=risk_level,
+            category=category,
+            occurrences=1,
+            page_number=i // 100 + 1,
+            start=i * 40,
+            end=i * 40 + len(keyword),
+            source=source
+        )
+        findings.append(finding)
+        categories.setdefault(category, []).append(finding)
+    return findings, categories
+
+def build_store(source: str, count: int):
+    store = FindingsStore(source)
+    for i in range(count):
+        keyword, category, risk_level = ROWS[i % len(ROWS)]
+        store.add(
+            keyword,
+            category,
+            risk_level,
+            start=i * 40,
+            end=i * 40 + len(keyword),
+            page_number=i // 100 + 1
+        )
+    return store, store.category_index()
+
+def measure(build, *args) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(*args)
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del result
+    return size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--findings", type=int, default=50000)
+    args = parser.parse_args()
+
+    source = "x" * (args.findings * 40)
+    legacy = measure(build_dataclasses, source, args.findings)
+    columnar = measure(build_store, source, args.findings)
+    views = measure(lambda: build_store(source, args.findings)[0].views())
+
+    print(f"findings: {args.findings}")
+    print(f"{'Finding dataclasses':<24} {legacy / 1024 / 1024:9.2f} MB {legacy / args.findings:7.0f} B/finding")
+    print(f"{'FindingsStore':<24} {columnar / 1024 / 1024:9.2f} MB {columnar / args.findings:7.0f} B/finding")
+    print(f"{'store + row views':<24} {views / 1024 / 1024:9.2f} MB {views / args.findings:7.0f} B/finding")
+    print(f"{'reduction':<24} {legacy / columnar:9.1f}x")
+
+if __name__ == "__main__":
+    main()
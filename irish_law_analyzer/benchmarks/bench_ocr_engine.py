@@ -0,0 +1,65 @@
+"""Compare the pytesseract OCR path with the persistent tesseract workers.
+
+Run from the irish_law_analyzer directory (requires the tesseract binary
+and, for the persistent workers, the tesserocr extra):
+
+    python -m benchmarks.bench_ocr_engine --pages 20 --workers 4
+"""
+import argparse
+import time
+from PIL import Image, ImageDraw, ImageFont
+
+from services.processor.ocr import PageOCRPool, PersistentTesseractEngine, TESSERACT_CONFIG
+
+SAMPLE_LINES = [
+    "This Employment Contract is made between Company Ltd. and the Employee.",
+    "The Employee shall be entitled to 20 days annual leave per year.",
+    "Either party may terminate this agreement with one month notice period.",
+    "Salary: 50,000 EUR per annum, payable monthly in arrears.",
+]
+
+def render_page(page_number: int, width: int = 1240, height: int = 1754) -> Image.Image:
+    """Render a synthetic A4 page at 150 DPI"""
+    image = Image.new('L', (width, height), color=255)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default()
+    y = 80
+    for i in range(40):
+        draw.text((80, y), f"{page_number}.{i} {SAMPLE_LINES[i % len(SAMPLE_LINES)]}", font=font, fill=0)
+        y += 40
+    return image
+
+def run(engine, pages, label: str):
+    start = time.perf_counter()
+    engine.ocr_pages(list(enumerate(pages, start=1)), "eng", TESSERACT_CONFIG)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:8.2f}s  {len(pages) / elapsed:8.2f} pages/s")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    pages = [render_page(n) for n in range(1, args.pages + 1)]
+
+    for workers in sorted({1, args.workers}):
+        pool = PageOCRPool(max_workers=workers)
+        persistent = PersistentTesseractEngine(max_workers=workers)
+        try:
+            # Warm up both engines the same way, timing their startup
+            # separately: start workers (and load the model) outside the runs
+            for engine, label in ((pool, "pytesseract"), (persistent, "persistent")):
+                start = time.perf_counter()
+                engine.ocr_pages([(1, pages[0])] * workers, "eng", TESSERACT_CONFIG)
+                print(f"{label + ' startup':<32} {time.perf_counter() - start:8.2f}s")
+            baseline = run(pool, pages, f"pytesseract ({workers} workers)")
+            candidate = run(persistent, pages, f"persistent ({workers} workers)")
+            print(f"{'speedup':<32} {baseline / candidate:8.2f}x\n")
+        finally:
+            pool.shutdown()
+            persistent.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Measure rule pack compile time and match speed as the pack grows.
+
+Run from the irish_law_analyzer directory:
+
+    python -m benchmarks.bench_rule_pack --documents 500 --words 400 --scale 1 10 50
+"""
+import argparse
+import copy
+import random
+import time
+
+from core.prepared_document import PreparedDocument
+from core.rule_pack import RulePack, load_rule_pack
+from services.analyzer.rule_snapshot import RuleSnapshot
+
+SYLLABLES = "ba de ki lo mu ra se ti vo za".split()
+FILLER = (
+    "the parties agree that this document is governed by irish law and that "
+    "any amendment must be agreed in writing by both sides before it applies"
+).split()
+
+def made_up_phrase(rng: random.Random) -> str:
+    return " ".join(
+        "".join(rng.choice(SYLLABLES) for _ in range(3)) for _ in range(rng.randint(1, 3))
+    )
+
+def scaled_pack(pack: RulePack, scale: int, seed: int = 11) -> RulePack:
+    """``pack`` with (scale - 1) generated statutes and clauses per original one"""
+    rng = random.Random(seed)
+    data = {
+        "format_version": 1,
+        "name": pack.name,
+        "version": f"{pack.version}+x{scale}",
+        "classifier": copy.deepcopy(dict(pack.classifier)),
+        "document_requirements": copy.deepcopy(dict(pack.document_requirements)),
+        "acts": dict(pack.acts),
+        "legal_requirements": copy.deepcopy(dict(pack.legal_requirements))
+    }
+    for copy_index in range(1, scale):
+        for name, info in data["document_requirements"].items():
+            original = pack.document_requirements[name]["required_clauses"]
+            info["required_clauses"].extend(made_up_phrase(rng) for _ in original)
+        for name, requirements in pack.legal_requirements.items():
+            data["legal_requirements"][f"{name}_{copy_index}"] = [
+                {
+                    "description": f"{requirement['description']} ({copy_index})",
+                    "references": requirement.get("references", []),
+                    "compliance_checklist": [
+                        made_up_phrase(rng) for _ in requirement.get("compliance_checklist", [])
+                    ]
+                }
+                for requirement in requirements
+            ]
+    return RulePack.from_dict(data)
+
+def make_documents(rules: RuleSnapshot, count: int, words: int, seed: int = 7):
+    rng = random.Random(seed)
+    keywords = rules.keyword_matcher.keywords
+    documents = []
+    for _ in range(count):
+        tokens = [
+            rng.choice(keywords) if rng.random() < 0.05 else rng.choice(FILLER)
+            for _ in range(words)
+        ]
+        documents.append(" ".join(tokens).capitalize() + ".")
+    return documents
+
+def match(rules: RuleSnapshot, documents):
+    """The rule-driven stages of an analysis: one keyword scan, then the compiled plans"""
+    for text in documents:
+        document = PreparedDocument(text)
+        doc_type = rules.document_classifier.classify_document(document)
+        rules.document_requirements.validate_document(doc_type, document)
+        rules.irish_law.check_compliance(doc_type.value.lower(), document)
+
+def best_of(func, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=500)
+    parser.add_argument("--words", type=int, default=400)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+
+    load_time = best_of(load_rule_pack)
+    print(f"load and validate bundled pack: {load_time * 1000:.1f} ms")
+    base = load_rule_pack()
+
+    print(f"{'scale':>5} {'keywords':>9} {'compile ms':>11} {'match docs/s':>13}")
+    for scale in args.scale:
+        pack = scaled_pack(base, scale)
+        compile_time = best_of(lambda: RuleSnapshot.compile(pack))
+        rules = RuleSnapshot.compile(pack)
+        documents = make_documents(rules, args.documents, args.words)
+        matching = best_of(lambda: match(rules, documents))
+        print(
+            f"{scale:>5} {len(rules.keyword_matcher.keywords):>9} "
+            f"{compile_time * 1000:>11.1f} {len(documents) / matching:>13.0f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Compare one-pattern-at-a-time scanning with the combined pattern matcher.
+
+Run from the irish_law_analyzer directory:
+
+    python -m benchmarks.bench_text_patterns --pages 500
+"""
+import argparse
+import re
+import time
+
+from services.analyzer.text_analyzer import FINDING_PATTERNS, compile_finding_patterns
+
+PAGE = (
+    "pursuant to section 12 of the act of 1997 the employee shall be paid eur 2,500.00 "
+    "per month. this agreement commences on 01/02/2024 and regulation 4 applies. "
+    "notice given on 15 march 2024 must be acknowledged within 14 days. "
+    "the employer will not deduct more than 300 euros under article 7. "
+) * 20
+
+def legacy_scan(text: str) -> int:
+    """One re.finditer call per pattern, as TextAnalyzer used to do"""
+    count = 0
+    for _, _, patterns in FINDING_PATTERNS:
+        for pattern in patterns:
+            count += sum(1 for _ in re.finditer(pattern, text))
+    return count
+
+def combined_scan(matcher, groups, text: str) -> int:
+    count = 0
+    for match in matcher.finditer(text):
+        groups[match.lastgroup]
+        count += 1
+    return count
+
+def best_of(func, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=500)
+    args = parser.parse_args()
+
+    text = PAGE * args.pages
+    matcher, groups = compile_finding_patterns(FINDING_PATTERNS)
+
+    print(f"document size: {len(text) / 1024 / 1024:.1f} MB")
+    print(f"matches: legacy={legacy_scan(text)} combined={combined_scan(matcher, groups, text)}")
+
+    legacy = best_of(lambda: legacy_scan(text))
+    combined = best_of(lambda: combined_scan(matcher, groups, text))
+    print(f"{'per-pattern finditer':<24} {legacy * 1000:9.1f} ms")
+    print(f"{'combined matcher':<24} {combined * 1000:9.1f} ms")
+    print(f"{'speedup':<24} {legacy / combined:9.2f}x")
+
+if __name__ == "__main__":
+    main()
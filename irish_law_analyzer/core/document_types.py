@@ -1,8 +1,11 @@
 from enum import Enum
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import AbstractSet, List, Dict, Optional, Tuple, Union
 from datetime import datetime
 from dataclasses import dataclass, field
+from .keyword_matcher import KeywordAutomaton
+from .prepared_document import PreparedDocument
+from .rule_pack import RulePack, default_rule_pack, parse_enum
 
 class DocumentType(Enum):
     EMPLOYMENT_CONTRACT = "EMPLOYMENT_CONTRACT"
@@ -24,126 +27,121 @@ class DocumentRequirement:
     keywords: List[str] = field(default_factory=list)
     compliance_rules: List[str] = field(default_factory=list)
 
+def default_requirement() -> DocumentRequirement:
+    """Requirements of a document type without any; a new object on every call"""
+    return DocumentRequirement(
+        required_clauses=[],
+        recommended_clauses=[],
+        risk_multiplier=1.0,
+        minimum_content_length=0,
+        maximum_content_length=None,
+        required_sections=[],
+        keywords=[],
+        compliance_rules=[]
+    )
+
+@dataclass(frozen=True)
+class RequirementPlan:
+    """A document type's requirements compiled for validation.
+
+    Each clause and section is stored as a (name, matcher keyword) pair,
+    so validating a document is a set lookup per item against the
+    keywords found by one scan of the document.
+    """
+    required_clauses: Tuple[Tuple[str, str], ...]
+    recommended_clauses: Tuple[Tuple[str, str], ...]
+    required_sections: Tuple[Tuple[str, str], ...]
+    minimum_content_length: int
+    maximum_content_length: Optional[int]
+    # Every matcher keyword the plan looks up
+    keywords: Tuple[str, ...]
+
+    @classmethod
+    def compile(cls, requirement: DocumentRequirement) -> "RequirementPlan":
+        def items(names: List[str]) -> Tuple[Tuple[str, str], ...]:
+            return tuple((name, name.lower()) for name in names)
+
+        required_clauses = items(requirement.required_clauses)
+        recommended_clauses = items(requirement.recommended_clauses)
+        required_sections = items(requirement.required_sections)
+        return cls(
+            required_clauses=required_clauses,
+            recommended_clauses=recommended_clauses,
+            required_sections=required_sections,
+            minimum_content_length=requirement.minimum_content_length,
+            maximum_content_length=requirement.maximum_content_length,
+            keywords=tuple(
+                keyword for _, keyword in required_clauses + recommended_clauses + required_sections
+            )
+        )
+
+    def validate(self, found: AbstractSet[str], content_length: int) -> Dict:
+        """Validation results for a document of ``content_length`` containing ``found``"""
+        missing_required = [name for name, keyword in self.required_clauses if keyword not in found]
+        length_too_short = content_length < self.minimum_content_length
+        length_too_long = bool(self.maximum_content_length) and content_length > self.maximum_content_length
+        return {
+            "is_valid": not missing_required and not length_too_short,
+            "missing_required_clauses": missing_required,
+            "missing_recommended_clauses": [
+                name for name, keyword in self.recommended_clauses if keyword not in found
+            ],
+            "missing_sections": [
+                name for name, keyword in self.required_sections if keyword not in found
+            ],
+            "content_length_valid": not (length_too_short or length_too_long),
+            "compliance_issues": []
+        }
+
+# Plans are immutable, so one is shared by every type without requirements
+DEFAULT_PLAN = RequirementPlan.compile(default_requirement())
+
 class DocumentRequirements:
-    def __init__(self):
-        self.requirements = {
-            DocumentType.EMPLOYMENT_CONTRACT: DocumentRequirement(
-                required_clauses=[
-                    "job title",
-                    "salary",
-                    "working hours",
-                    "annual leave",
-                    "notice period",
-                    "probation period"
-                ],
-                recommended_clauses=[
-                    "grievance procedure",
-                    "disciplinary procedure",
-                    "sick leave",
-                    "confidentiality"
-                ],
-                risk_multiplier=1.5,
-                minimum_content_length=1000,
-                maximum_content_length=10000,
-                required_sections=[
-                    "terms and conditions",
-                    "compensation and benefits",
-                    "working hours and leave",
-                    "termination"
-                ],
-                keywords=[
-                    "employment",
-                    "contract",
-                    "agreement",
-                    "position",
-                    "salary"
-                ],
-                compliance_rules=[
-                    "must_include_minimum_wage",
-                    "must_specify_working_hours",
-                    "must_include_leave_entitlement"
-                ]
-            ),
-            DocumentType.TERMINATION_LETTER: DocumentRequirement(
-                required_clauses=[
-                    "termination date",
-                    "notice period",
-                    "reason for termination",
-                    "final payment details"
-                ],
-                recommended_clauses=[
-                    "appeal rights",
-                    "return of company property",
-                    "reference provision"
-                ],
-                risk_multiplier=2.0,
-                minimum_content_length=300,
-                maximum_content_length=2000,
-                required_sections=[
-                    "notice of termination",
-                    "reason for termination",
-                    "final arrangements"
-                ],
-                keywords=[
-                    "termination",
-                    "dismissal",
-                    "notice",
-                    "effective date"
-                ],
-                compliance_rules=[
-                    "must_specify_notice_period",
-                    "must_include_appeal_rights",
-                    "must_state_reason"
-                ]
+    def __init__(self, rule_pack: Optional[RulePack] = None):
+        rule_pack = rule_pack or default_rule_pack()
+        self.requirements: Dict[DocumentType, DocumentRequirement] = {
+            parse_enum(DocumentType, name, f"document_requirements.{name}"): DocumentRequirement(
+                required_clauses=list(entry["required_clauses"]),
+                recommended_clauses=list(entry["recommended_clauses"]),
+                risk_multiplier=float(entry["risk_multiplier"]),
+                minimum_content_length=entry["minimum_content_length"],
+                maximum_content_length=entry.get("maximum_content_length"),
+                required_sections=list(entry.get("required_sections", [])),
+                keywords=list(entry.get("keywords", [])),
+                compliance_rules=list(entry.get("compliance_rules", []))
             )
+            for name, entry in rule_pack.document_requirements.items()
         }
 
-    def get_requirements(self, doc_type: DocumentType) -> DocumentRequirement:
-        return self.requirements.get(doc_type, DocumentRequirement(
-            required_clauses=[],
-            recommended_clauses=[],
-            risk_multiplier=1.0,
-            minimum_content_length=0,
-            maximum_content_length=None,
-            required_sections=[],
-            keywords=[],
-            compliance_rules=[]
-        ))
-
-    def validate_document(self, doc_type: DocumentType, content: str) -> Dict:
-        requirements = self.get_requirements(doc_type)
-        validation_results = {
-            "is_valid": True,
-            "missing_required_clauses": [],
-            "missing_recommended_clauses": [],
-            "missing_sections": [],
-            "content_length_valid": True,
-            "compliance_issues": []
+        self.compile()
+
+    def compile(self):
+        """Compile a validation plan per document type and one matcher covering them all.
+
+        Called at construction; call again after changing ``requirements``.
+        """
+        self.plans: Dict[DocumentType, RequirementPlan] = {
+            doc_type: RequirementPlan.compile(requirement)
+            for doc_type, requirement in self.requirements.items()
         }
-        
-        # Validate content length
-        content_length = len(content)
-        if content_length < requirements.minimum_content_length:
-            validation_results["is_valid"] = False
-            validation_results["content_length_valid"] = False
-        
-        if requirements.maximum_content_length and content_length > requirements.maximum_content_length:
-            validation_results["content_length_valid"] = False
-
-        # Check required clauses
-        for clause in requirements.required_clauses:
-            if clause.lower() not in content.lower():
-                validation_results["is_valid"] = False
-                validation_results["missing_required_clauses"].append(clause)
-
-        # Check recommended clauses
-        for clause in requirements.recommended_clauses:
-            if clause.lower() not in content.lower():
-                validation_results["missing_recommended_clauses"].append(clause)
-
-        # Check required sections
-        for section in requirements.required_sections:
-            if section.lower() not in content.lower():
-                validation_results["missing_sections"].append(section)
-
-        return validation_results
\ No newline at end of file
+        self.keyword_matcher = KeywordAutomaton(self.vocabulary())
+
+    def vocabulary(self) -> List[str]:
+        """Every clause and section checked for any document type, lowercased"""
+        return [keyword for plan in self.plans.values() for keyword in plan.keywords]
+
+    def get_requirements(self, doc_type: DocumentType) -> DocumentRequirement:
+        requirement = self.requirements.get(doc_type)
+        return requirement if requirement is not None else default_requirement()
+
+    def get_plan(self, doc_type: DocumentType) -> RequirementPlan:
+        return self.plans.get(doc_type, DEFAULT_PLAN)
+
+    def validate_document(self, doc_type: DocumentType, content: Union[str, PreparedDocument]) -> Dict:
+        document = PreparedDocument.ensure(content)
+        plan = self.get_plan(doc_type)
+        if not plan.keywords:
+            return plan.validate(frozenset(), document.text_length)
+
+        # Find every clause and section in one scan
+        return plan.validate(document.keywords_present(self.keyword_matcher), document.text_length)
@@ -0,0 +1,283 @@
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from .models import Finding, render_context
+
+# Stored in place of None in the signed offset columns
+_MISSING = -1
+
+
+def _column(value: Optional[int]) -> int:
+    return _MISSING if value is None else value
+
+
+def _value(column_value: int) -> Optional[int]:
+    return None if column_value == _MISSING else column_value
+
+
+class FindingsStore:
+    """Columnar storage for the findings of one document.
+
+    Keywords, categories and risk levels are interned and stored as small
+    integer ids; spans, pages and counts live in typed arrays, and the
+    occurrence offsets of every row share one flat array. A document with
+    tens of thousands of findings therefore costs a few dozen bytes per
+    finding instead of a dataclass instance with its own ``__dict__``.
+    ``FindingView`` rows give existing callers the ``Finding`` interface.
+    """
+
+    def __init__(self, source: Optional[str] = None):
+        self.source = source
+
+        self.keywords: List[str] = []
+        self.categories: List[str] = []
+        self.risk_levels: List[str] = []
+        self._ids: Dict[Tuple[int, str], int] = {}
+
+        self.keyword_ids = array('I')
+        self.category_ids = array('H')
+        self.risk_ids = array('B')
+        self.occurrences = array('I')
+        self.confidences = array('d')
+        self.starts = array('i')
+        self.ends = array('i')
+        self.page_numbers = array('i')
+        self.context_starts = array('i')
+        self.context_ends = array('i')
+        # Row i's occurrence offsets are offsets[offset_bounds[i]:offset_bounds[i + 1]]
+        self.offsets = array('I')
+        self.offset_bounds = array('I', [0])
+        # Explicit or already rendered context, by row
+        self.contexts: Dict[int, str] = {}
+
+    def _intern(self, table: List[str], kind: int, value: str) -> int:
+        key = (kind, value)
+        value_id = self._ids.get(key)
+        if value_id is None:
+            value_id = self._ids[key] = len(table)
+            table.append(value)
+        return value_id
+
+    def add(
+        self,
+        keyword: str,
+        category: str,
+        risk_level: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        page_number: Optional[int] = None,
+        context_start: Optional[int] = None,
+        context_end: Optional[int] = None,
+        occurrences: int = 1,
+        confidence: float = 1.0,
+        offsets: Iterable[int] = (),
+        context: str = ""
+    ) -> int:
+        """Append a finding and return its row index"""
+        row = len(self.keyword_ids)
+        self.keyword_ids.append(self._intern(self.keywords, 0, keyword))
+        self.category_ids.append(self._intern(self.categories, 1, category))
+        self.risk_ids.append(self._intern(self.risk_levels, 2, risk_level))
+        self.occurrences.append(occurrences)
+        self.confidences.append(confidence)
+        self.starts.append(_column(start))
+        self.ends.append(_column(end))
+        self.page_numbers.append(_column(page_number))
+        self.context_starts.append(_column(context_start))
+        self.context_ends.append(_column(context_end))
+        self.offsets.extend(offsets)
+        self.offset_bounds.append(len(self.offsets))
+        if context:
+            self.contexts[row] = context
+        return row
+
+    def append(self, finding: Finding) -> int:
+        """Append a ``Finding`` instance"""
+        return self.add(
+            finding.keyword,
+            finding.category,
+            finding.risk_level,
+            start=finding.start,
+            end=finding.end,
+            page_number=finding.page_number,
+            context_start=finding.context_start,
+            context_end=finding.context_end,
+            occurrences=finding.occurrences,
+            confidence=finding.confidence,
+            offsets=finding.offsets or (),
+            context=finding.context
+        )
+
+    def _copy_row(self, target: "FindingsStore", row: int, occurrences: int, offsets: Iterable[int]) -> int:
+        return target.add(
+            self.keywords[self.keyword_ids[row]],
+            self.categories[self.category_ids[row]],
+            self.risk_levels[self.risk_ids[row]],
+            start=_value(self.starts[row]),
+            end=_value(self.ends[row]),
+            page_number=_value(self.page_numbers[row]),
+            context_start=_value(self.context_starts[row]),
+            context_end=_value(self.context_ends[row]),
+            occurrences=occurrences,
+            confidence=self.confidences[row],
+            offsets=offsets,
+            context=self.contexts.get(row, "")
+        )
+
+    def row_offsets(self, row: int) -> array:
+        return self.offsets[self.offset_bounds[row]:self.offset_bounds[row + 1]]
+
+    def aggregate(self) -> "FindingsStore":
+        """Merge rows sharing (keyword, category, risk_level) into one row each.
+
+        The first row of each group is kept, so its span, page and context
+        still describe where the keyword first appears; the start offset of
+        every occurrence is collected in the row's offsets.
+        """
+        groups: Dict[Tuple[int, int, int], List[int]] = {}
+        for row, key in enumerate(zip(self.keyword_ids, self.category_ids, self.risk_ids)):
+            groups.setdefault(key, []).append(row)
+
+        merged = FindingsStore(self.source)
+        for rows in groups.values():
+            offsets = array('I')
+            for row in rows:
+                if self.offset_bounds[row] != self.offset_bounds[row + 1]:
+                    offsets.extend(self.row_offsets(row))
+                elif self.starts[row] != _MISSING:
+                    offsets.append(self.starts[row])
+            occurrences = sum(self.occurrences[row] for row in rows)
+            self._copy_row(merged, rows[0], occurrences, offsets)
+        return merged
+
+    def select(self, rows: Iterable[int]) -> "FindingsStore":
+        """New store holding the given rows, in the given order"""
+        selected = FindingsStore(self.source)
+        for row in rows:
+            self._copy_row(selected, row, self.occurrences[row], self.row_offsets(row))
+        return selected
+
+    def category_index(self) -> Dict[str, array]:
+        """Row indices of the findings in each category, in row order"""
+        index: Dict[str, array] = {}
+        for row, category_id in enumerate(self.category_ids):
+            category = self.categories[category_id]
+            if category not in index:
+                index[category] = array('I')
+            index[category].append(row)
+        return index
+
+    def get_context(self, row: int, window: int = 50) -> str:
+        """Return a row's context, rendering it from the source text on first use"""
+        context = self.contexts.get(row)
+        if context is None:
+            context = ""
+            start = _value(self.starts[row])
+            if self.source is not None and start is not None:
+                context_start = _value(self.context_starts[row])
+                if context_start is not None:
+                    context = ' '.join(self.source[context_start:self.context_ends[row]].split())
+                else:
+                    context = render_context(self.source, start, self.ends[row], window)
+            self.contexts[row] = context
+        return context
+
+    def views(self) -> List["FindingView"]:
+        return [FindingView(self, row) for row in range(len(self))]
+
+    def __len__(self) -> int:
+        return len(self.keyword_ids)
+
+    def __getitem__(self, row: int) -> "FindingView":
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("finding index out of range")
+        return FindingView(self, row)
+
+    def __iter__(self) -> Iterator["FindingView"]:
+        return (FindingView(self, row) for row in range(len(self)))
+
+
+class FindingView:
+    """Read-only ``Finding``-like view of one row of a ``FindingsStore``"""
+
+    __slots__ = ("store", "row")
+
+    def __init__(self, store: FindingsStore, row: int):
+        self.store = store
+        self.row = row
+
+    @property
+    def keyword(self) -> str:
+        return self.store.keywords[self.store.keyword_ids[self.row]]
+
+    @property
+    def category(self) -> str:
+        return self.store.categories[self.store.category_ids[self.row]]
+
+    @property
+    def risk_level(self) -> str:
+        return self.store.risk_levels[self.store.risk_ids[self.row]]
+
+    @property
+    def occurrences(self) -> int:
+        return self.store.occurrences[self.row]
+
+    @property
+    def confidence(self) -> float:
+        return self.store.confidences[self.row]
+
+    @property
+    def start(self) -> Optional[int]:
+        return _value(self.store.starts[self.row])
+
+    @property
+    def end(self) -> Optional[int]:
+        return _value(self.store.ends[self.row])
+
+    @property
+    def page_number(self) -> Optional[int]:
+        return _value(self.store.page_numbers[self.row])
+
+    @property
+    def context_start(self) -> Optional[int]:
+        return _value(self.store.context_starts[self.row])
+
+    @property
+    def context_end(self) -> Optional[int]:
+        return _value(self.store.context_ends[self.row])
+
+    @property
+    def offsets(self) -> Optional[array]:
+        offsets = self.store.row_offsets(self.row)
+        return offsets if offsets else None
+
+    @property
+    def context(self) -> str:
+        """Context if already set or rendered; use get_context() to render it"""
+        return self.store.contexts.get(self.row, "")
+
+    def get_context(self, window: int = 50) -> str:
+        return self.store.get_context(self.row, window)
+
+    def to_dict(self, include_context: bool = True, context_window: int = 50) -> Dict[str, Any]:
+        """Serializable view of the finding; context is only rendered when included"""
+        offsets = self.offsets
+        return {
+            "keyword": self.keyword,
+            "risk_level": self.risk_level,
+            "category": self.category,
+            "occurrences": self.occurrences,
+            "context": self.get_context(context_window) if include_context else "",
+            "page_number": self.page_number,
+            "confidence": self.confidence,
+            "start": self.start,
+            "end": self.end,
+            "offsets": list(offsets) if offsets is not None else None
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"FindingView(keyword={self.keyword!r}, risk_level={self.risk_level!r}, "
+            f"category={self.category!r}, occurrences={self.occurrences})"
+        )
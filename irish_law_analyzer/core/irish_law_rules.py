@@ -1,7 +1,11 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import AbstractSet, List, Dict, Mapping, Optional, Tuple, Union
 from datetime import datetime
+from types import MappingProxyType
 from enum import Enum
+from .keyword_matcher import KeywordAutomaton
+from .prepared_document import PreparedDocument
+from .rule_pack import RulePack, RulePackError, default_rule_pack, parse_datetime, parse_enum
 
 class LawCategory(Enum):
     EMPLOYMENT = "EMPLOYMENT"
@@ -30,73 +34,184 @@ class LegalRequirement:
     category: LawCategory = LawCategory.EMPLOYMENT
     compliance_checklist: List[str] = field(default_factory=list)
 
-class IrishEmploymentLaw:
-    def __init__(self):
-        self._initialize_acts()
-        self._initialize_requirements()
-
-    def _initialize_acts(self):
-        self.acts: Dict[str, str] = {
-            "UNFAIR_DISMISSALS": "Unfair Dismissals Acts 1977-2015",
-            "EMPLOYMENT_EQUALITY": "Employment Equality Acts 1998-2015",
-            "ORGANISATION_OF_TIME": "Organisation of Working Time Act 1997",
-            "TERMS_OF_EMPLOYMENT": "Terms of Employment (Information) Acts 1994-2014",
-            "MINIMUM_WAGE": "National Minimum Wage Act 2000",
-            "PARENTAL_LEAVE": "Parental Leave Acts 1998-2019",
-            "PROTECTION_OF_EMPLOYMENT": "Protection of Employment Acts 1977-2007",
-            "PAYMENT_OF_WAGES": "Payment of Wages Act 1991"
+@dataclass(frozen=True)
+class CompiledRequirement:
+    description: str
+    # (checklist item, predicate id), in checking order
+    checklist: Tuple[Tuple[str, int], ...]
+    reference_act: Optional[str]
+
+@dataclass(frozen=True)
+class CompliancePlan:
+    """The legal requirements of one document type, compiled for evaluation.
+
+    The legal reference payloads do not depend on the document, so they
+    are built once here as read-only mappings; each result gets copies.
+    """
+    requirements: Tuple[CompiledRequirement, ...]
+    legal_references: Tuple[Mapping[str, Optional[str]], ...]
+
+EMPTY_COMPLIANCE_PLAN = CompliancePlan(requirements=(), legal_references=())
+
+class ComplianceEngine:
+    """Requirements of every document type compiled into one evaluation graph.
+
+    Checklist items are predicates shared by every requirement that lists
+    them: each distinct item gets one predicate id, looked up at most once
+    per evaluation and memoized. A requirement stops at its first unmet
+    item, and the keywords found in a document come from one automaton
+    scan, so adding statutes adds little per-document work.
+    """
+
+    def __init__(self, requirements: Dict[str, List[LegalRequirement]]):
+        # Predicate id -> the lowercased checklist item it looks for
+        self.predicates: List[str] = []
+        self._predicate_ids: Dict[str, int] = {}
+        self.plans: Dict[str, CompliancePlan] = {
+            doc_type: self._compile(doc_requirements)
+            for doc_type, doc_requirements in requirements.items()
         }
 
-    def _initialize_requirements(self):
-        self.requirements: Dict[str, List[LegalRequirement]] = {
-            "employment_contract": [
-                LegalRequirement(
-                    description="Written statement of terms of employment",
-                    references=[
-                        LegalReference(
-                            act=self.acts["TERMS_OF_EMPLOYMENT"],
-                            section="Section 3",
-                            description="Obligation to provide written statement",
-                            url="http://www.irishstatutebook.ie/eli/1994/act/5/section/3",
-                            effective_date=datetime(1994, 5, 16)
-                        )
-                    ],
-                    is_mandatory=True,
-                    applicable_from=datetime(1994, 5, 16),
-                    penalties="Up to 4 weeks' remuneration",
-                    category=LawCategory.EMPLOYMENT,
-                    compliance_checklist=[
-                        "Document must be provided within 2 months",
-                        "Must include all statutory terms",
-                        "Must be signed by employer"
-                    ]
-                )
-            ],
-            "termination": [
-                LegalRequirement(
-                    description="Minimum notice periods",
-                    references=[
-                        LegalReference(
-                            act="Minimum Notice and Terms of Employment Act 1973",
-                            section="Section 4",
-                            description="Minimum notice requirements",
-                            url="http://www.irishstatutebook.ie/eli/1973/act/4/section/4",
-                            effective_date=datetime(1973, 1, 1)
-                        )
-                    ],
-                    is_mandatory=True,
-                    applicable_from=datetime(1973, 1, 1),
-                    penalties="Up to 2 years' remuneration",
-                    category=LawCategory.TERMINATION,
-                    compliance_checklist=[
-                        "Check length of service",
-                        "Verify notice period calculation",
-                        "Ensure proper notice delivery"
-                    ]
+    def _predicate(self, item: str) -> int:
+        keyword = item.lower()
+        predicate_id = self._predicate_ids.get(keyword)
+        if predicate_id is None:
+            predicate_id = self._predicate_ids[keyword] = len(self.predicates)
+            self.predicates.append(keyword)
+        return predicate_id
+
+    def _compile(self, requirements: List[LegalRequirement]) -> CompliancePlan:
+        return CompliancePlan(
+            requirements=tuple(
+                CompiledRequirement(
+                    description=requirement.description,
+                    checklist=tuple(
+                        (item, self._predicate(item)) for item in requirement.compliance_checklist
+                    ),
+                    reference_act=requirement.references[0].act if requirement.references else None
                 )
+                for requirement in requirements
+            ),
+            legal_references=tuple(
+                MappingProxyType({
+                    "act": ref.act,
+                    "section": ref.section,
+                    "description": ref.description,
+                    "url": ref.url
+                })
+                for requirement in requirements
+                for ref in requirement.references
+            )
+        )
+
+    def get_plan(self, doc_type: str) -> CompliancePlan:
+        return self.plans.get(doc_type, EMPTY_COMPLIANCE_PLAN)
+
+    def evaluate(self, doc_type: str, found: AbstractSet[str]) -> Dict:
+        """Compliance results for a document containing the keywords ``found``"""
+        plan = self.get_plan(doc_type)
+        compliance_results = {
+            "compliant": True,
+            "missing_requirements": [],
+            "recommendations": [],
+            "legal_references": [dict(ref) for ref in plan.legal_references],
+            "risk_areas": [],
+            "compliance_score": 100.0
+        }
+
+        predicates = self.predicates
+        satisfied: Dict[int, bool] = {}
+        for requirement in plan.requirements:
+            # A requirement without checklist items is never met
+            requirement_met = bool(requirement.checklist)
+            for checklist_item, predicate_id in requirement.checklist:
+                met = satisfied.get(predicate_id)
+                if met is None:
+                    met = satisfied[predicate_id] = predicates[predicate_id] in found
+                if not met:
+                    compliance_results["missing_requirements"].append({
+                        "requirement": requirement.description,
+                        "checklist_item": checklist_item,
+                        "reference": requirement.reference_act
+                    })
+                    requirement_met = False
+                    break
+
+            if not requirement_met:
+                compliance_results["compliant"] = False
+                compliance_results["compliance_score"] -= (100.0 / len(plan.requirements))
+
+        compliance_results["compliance_score"] = max(0.0, compliance_results["compliance_score"])
+        return compliance_results
+
+class IrishEmploymentLaw:
+    def __init__(self, rule_pack: Optional[RulePack] = None):
+        rule_pack = rule_pack or default_rule_pack()
+        self._initialize_acts(rule_pack)
+        self._initialize_requirements(rule_pack)
+        self.compile()
+
+    def compile(self):
+        """Compile the requirements and the matcher for their checklist items.
+
+        Called at construction; call again after changing ``requirements``.
+        """
+        self.engine = ComplianceEngine(self.requirements)
+        self.keyword_matcher = KeywordAutomaton(self.vocabulary())
+
+    def vocabulary(self) -> List[str]:
+        """Every compliance checklist item, lowercased"""
+        return list(self.engine.predicates)
+
+    def _initialize_acts(self, rule_pack: RulePack):
+        self.acts: Dict[str, str] = dict(rule_pack.acts)
+
+    def _initialize_requirements(self, rule_pack: RulePack):
+        self.requirements: Dict[str, List[LegalRequirement]] = {
+            doc_type: [
+                self._parse_requirement(entry, f"legal_requirements.{doc_type}[{index}]")
+                for index, entry in enumerate(entries)
             ]
+            for doc_type, entries in rule_pack.legal_requirements.items()
         }
 
+    def _parse_reference(self, entry: Dict, where: str) -> LegalReference:
+        if ("act" in entry) == ("act_id" in entry):
+            raise RulePackError(f"{where}: give exactly one of 'act' and 'act_id'")
+        act = entry.get("act")
+        if act is None:
+            act = self.acts.get(entry["act_id"])
+            if act is None:
+                raise RulePackError(f"{where}.act_id: unknown act '{entry['act_id']}'")
+
+        reference = LegalReference(
+            act=act,
+            section=entry["section"],
+            description=entry["description"],
+            url=entry.get("url")
+        )
+        if "effective_date" in entry:
+            reference.effective_date = parse_datetime(entry["effective_date"], f"{where}.effective_date")
+        if entry.get("last_amended") is not None:
+            reference.last_amended = parse_datetime(entry["last_amended"], f"{where}.last_amended")
+        return reference
+
+    def _parse_requirement(self, entry: Dict, where: str) -> LegalRequirement:
+        requirement = LegalRequirement(
+            description=entry["description"],
+            references=[
+                self._parse_reference(reference, f"{where}.references[{index}]")
+                for index, reference in enumerate(entry.get("references", []))
+            ],
+            is_mandatory=entry.get("is_mandatory", True),
+            penalties=entry.get("penalties"),
+            category=parse_enum(LawCategory, entry.get("category", "EMPLOYMENT"), f"{where}.category"),
+            compliance_checklist=list(entry.get("compliance_checklist", []))
+        )
+        if "applicable_from" in entry:
+            requirement.applicable_from = parse_datetime(entry["applicable_from"], f"{where}.applicable_from")
+        return requirement
+
     def get_requirements_for_document(self, doc_type: str) -> List[LegalRequirement]:
         return self.requirements.get(doc_type, [])
 
@@ -120,45 +235,13 @@ class IrishEmploymentLaw:
         else:
             return {"required_notice": notice_periods["more_than_15"]}
 
-    def check_compliance(self, doc_type: str, content: str) -> Dict:
-        requirements = self.get_requirements_for_document(doc_type)
-        compliance_results = {
-            "compliant": True,
-            "missing_requirements": [],
-            "recommendations": [],
-            "legal_references": [],
-            "risk_areas": [],
-            "compliance_score": 100.0
-        }
-        
-        for requirement in requirements:
-            requirement_met = False
-            for checklist_item in requirement.compliance_checklist:
-                if not self._check_requirement(content, checklist_item):
-                    compliance_results["missing_requirements"].append({
-                        "requirement": requirement.description,
-                        "checklist_item": checklist_item,
-                        "reference": requirement.references[0].act if requirement.references else None
-                    })
-                    requirement_met = False
-                    break
-                requirement_met = True
-
-            if not requirement_met:
-                compliance_results["compliant"] = False
-                compliance_results["compliance_score"] -= (100.0 / len(requirements))
+    def check_compliance(self, doc_type: str, content: Union[str, PreparedDocument]) -> Dict:
+        if not self.engine.get_plan(doc_type).requirements:
+            return self.engine.evaluate(doc_type, frozenset())
 
-            compliance_results["legal_references"].extend([
-                {
-                    "act": ref.act,
-                    "section": ref.section,
-                    "description": ref.description,
-                    "url": ref.url
-                } for ref in requirement.references
-            ])
-
-        compliance_results["compliance_score"] = max(0.0, compliance_results["compliance_score"])
-        return compliance_results
+        # Find every checklist item in one scan
+        found = PreparedDocument.ensure(content).keywords_present(self.keyword_matcher)
+        return self.engine.evaluate(doc_type, found)
 
     def _check_requirement(self, content: str, requirement: str) -> bool:
         # Basic implementation - can be enhanced with more sophisticated checking
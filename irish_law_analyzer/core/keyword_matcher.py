@@ -0,0 +1,101 @@
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over a fixed keyword vocabulary.
+
+    The automaton is built once; every scan then reports all (possibly
+    overlapping) keyword hits with their offsets in a single pass over the
+    text, so its cost does not grow with the number of keywords. Matching
+    is case-sensitive: callers pass lowercase keywords and text.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = list(dict.fromkeys(k for k in keywords if k))
+        self.keyword_ids: Dict[str, int] = {k: i for i, k in enumerate(self.keywords)}
+        self._build()
+
+    def _build(self):
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[int, ...]] = [()]
+
+        # Trie of all keywords
+        for keyword_id, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append(())
+                state = next_state
+            outputs[state] += (keyword_id,)
+
+        # Breadth-first pass: failure links folded into a full transition table
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        pending = deque(goto[0].values())
+        while pending:
+            state = pending.popleft()
+            fallback = delta[fail[state]]
+            transitions = dict(fallback)
+            for char, next_state in goto[state].items():
+                fail[next_state] = fallback.get(char, 0)
+                outputs[next_state] += outputs[fail[next_state]]
+                transitions[char] = next_state
+                pending.append(next_state)
+            delta[state] = transitions
+
+        self._delta = delta
+        self._outputs = outputs
+        self._lengths = [len(k) for k in self.keywords]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yield (start, end, keyword_id) for every hit, ordered by end offset"""
+        delta = self._delta
+        outputs = self._outputs
+        lengths = self._lengths
+        state = 0
+        for position, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                end = position + 1
+                for keyword_id in outputs[state]:
+                    yield end - lengths[keyword_id], end, keyword_id
+
+    def scan(self, text: str, state: int = 0) -> Tuple[List[Tuple[int, int, int]], int]:
+        """Scan one chunk of a longer text, resuming from ``state``.
+
+        Returns the (start, end, keyword_id) hits relative to the chunk and
+        the state to resume from with the next chunk; a hit that began in
+        an earlier chunk has a negative start.
+        """
+        delta = self._delta
+        outputs = self._outputs
+        lengths = self._lengths
+        hits = []
+        for position, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                end = position + 1
+                for keyword_id in outputs[state]:
+                    hits.append((end - lengths[keyword_id], end, keyword_id))
+        return hits, state
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """Return every hit as (start, end, keyword)"""
+        return [(start, end, self.keywords[keyword_id])
+                for start, end, keyword_id in self.iter_matches(text)]
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Count occurrences of each keyword found in the text"""
+        counts = [0] * len(self.keywords)
+        for _, _, keyword_id in self.iter_matches(text):
+            counts[keyword_id] += 1
+        return {self.keywords[i]: c for i, c in enumerate(counts) if c}
+
+    def present(self, text: str) -> Set[str]:
+        """Return the set of keywords that occur in the text"""
+        return {self.keywords[keyword_id] for _, _, keyword_id in self.iter_matches(text)}
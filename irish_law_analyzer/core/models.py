@@ -1,10 +1,15 @@
+from array import array
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
 from datetime import datetime
-from .enums import RiskLevel, ProcessingStatus, DocumentStatus
+import re
+from .enums import RiskLevel, ProcessingStatus, DocumentStatus, AnalysisType
 from .document_types import DocumentType
 from dataclasses import dataclass, field
 
+if TYPE_CHECKING:
+    from .findings_store import FindingsStore
+
 @dataclass
 class KeywordInfo:
     risk: RiskLevel
@@ -13,6 +18,24 @@ class KeywordInfo:
     weight: float = 1.0
     requires_context: bool = False
 
+def render_context(text: str, start: int, end: int, window: int = 50) -> str:
+    """Render the text around ``text[start:end]`` with the match in bold"""
+    context_start = max(0, start - window)
+    context_end = min(len(text), end + window)
+
+    # Collapse whitespace and make the matched text stand out
+    context = (
+        f"{text[context_start:start]}**{text[start:end]}**{text[end:context_end]}"
+    )
+    context = re.sub(r'\s+', ' ', context).strip()
+
+    # Add ellipsis if context is truncated
+    if context_start > 0:
+        context = f"...{context}"
+    if context_end < len(text):
+        context = f"{context}..."
+    return context
+
 @dataclass
 class Finding:
     keyword: str
@@ -22,6 +45,40 @@ class Finding:
     context: str = ""
     page_number: Optional[int] = None
     confidence: float = 1.0
+    # Span of the match in the original (un-normalized) text
+    start: Optional[int] = None
+    end: Optional[int] = None
+    # Span of the enclosing sentence when the context is the whole sentence
+    context_start: Optional[int] = None
+    context_end: Optional[int] = None
+    # Original text, kept by reference so context can be rendered on demand
+    source: Optional[str] = field(default=None, repr=False, compare=False)
+    # Start offset of every occurrence once findings are aggregated
+    offsets: Optional[array] = field(default=None, repr=False)
+
+    def get_context(self, window: int = 50) -> str:
+        """Return the context, rendering it from the source text on first use"""
+        if not self.context and self.source is not None and self.start is not None:
+            if self.context_start is not None:
+                self.context = ' '.join(self.source[self.context_start:self.context_end].split())
+            else:
+                self.context = render_context(self.source, self.start, self.end, window)
+        return self.context
+
+    def to_dict(self, include_context: bool = True, context_window: int = 50) -> Dict[str, Any]:
+        """Serializable view of the finding; context is only rendered when included"""
+        return {
+            "keyword": self.keyword,
+            "risk_level": self.risk_level,
+            "category": self.category,
+            "occurrences": self.occurrences,
+            "context": self.get_context(context_window) if include_context else "",
+            "page_number": self.page_number,
+            "confidence": self.confidence,
+            "start": self.start,
+            "end": self.end,
+            "offsets": list(self.offsets) if self.offsets is not None else None
+        }
 
 @dataclass
 class AnalysisResult:
@@ -29,13 +86,16 @@ class AnalysisResult:
     document_type: DocumentType
     risk_score: float = 0.0
     findings: List[Finding] = field(default_factory=list)
-    categories: Dict[str, List[Finding]] = field(default_factory=dict)
+    # Indices into ``findings`` for each category
+    categories: Dict[str, Sequence[int]] = field(default_factory=dict)
     overall_risk_level: RiskLevel = RiskLevel.LOW
     recommendations: List[str] = field(default_factory=list)
     processing_time: float = 0.0
     processed_at: datetime = field(default_factory=datetime.now)
     status: ProcessingStatus = ProcessingStatus.PENDING
     metadata: Dict = field(default_factory=dict)
+    # Columnar storage behind ``findings`` when they were produced by the analyzers
+    findings_store: Optional["FindingsStore"] = field(default=None, repr=False)
 
 @dataclass
 class DocumentMetadata:
@@ -49,6 +109,7 @@ class DocumentMetadata:
     processing_duration: Optional[float] = None
     word_count: Optional[int] = None
     language: Optional[str] = None
+    ocr_pages: List[int] = field(default_factory=list)
 
 @dataclass
 class ProcessingResult:
@@ -58,6 +119,7 @@ class ProcessingResult:
     error: Optional[str] = None
     metadata: Optional[DocumentMetadata] = None
     processing_time: float = 0.0
+    pages: List[str] = field(default_factory=list)
 
 @dataclass
 class AnalysisConfig:
@@ -66,5 +128,21 @@ class AnalysisConfig:
     context_window_size: int = 50
     minimum_confidence: float = 0.6
     include_recommendations: bool = True
+    # Raises a BASIC default depth to DETAILED; requests naming a depth are unaffected
     detailed_analysis: bool = False
-    max_findings: int = 100
\ No newline at end of file
+    max_findings: int = 100
+    aggregate_findings: bool = True
+    # Default depth for requests that do not ask for one
+    analysis_type: AnalysisType = AnalysisType.COMPREHENSIVE
+
+@dataclass
+class Job:
+    job_id: str
+    filename: str
+    status: ProcessingStatus = ProcessingStatus.PENDING
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    error_code: Optional[int] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
@@ -0,0 +1,217 @@
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional, Set, Tuple, Union
+import re
+from .keyword_matcher import KeywordAutomaton
+
+SENTENCE_END_PATTERN = re.compile(r'[.!?]+')
+TOKEN_PATTERN = re.compile(r'\S+')
+# Runs of characters kept by normalization, and runs of whitespace
+NORMALIZE_PATTERN = re.compile(r'([\w.!?,;:€-]+)|(\s+)')
+DROPPED_PATTERN = re.compile(r'[^\w\s.!?,;:€-]+')
+
+
+def normalize_text(text: str) -> str:
+    """Normalize without tracking offsets; same output as ``TextNormalizer``"""
+    return ' '.join(DROPPED_PATTERN.sub('', text).lower().split())
+
+
+class TextNormalizer:
+    """Normalizes text in one pass, one chunk at a time.
+
+    Output is lowercase, has whitespace collapsed to single spaces and keeps
+    only word characters, sentence punctuation and the euro sign. ``feed``
+    also returns, for every output character, its offset in the original
+    text; offsets continue across chunks, as do collapsed whitespace runs.
+    """
+
+    def __init__(self):
+        self.position = 0
+        self._started = False
+        self._pending_space: Optional[int] = None
+
+    def feed(self, text: str) -> Tuple[str, array]:
+        parts: List[str] = []
+        offsets = array('I')
+        base = self.position
+        for match in NORMALIZE_PATTERN.finditer(text):
+            start = base + match.start()
+            if match.group(2) is not None:
+                if self._started and self._pending_space is None:
+                    self._pending_space = start
+                continue
+            if self._pending_space is not None:
+                parts.append(' ')
+                offsets.append(self._pending_space)
+                self._pending_space = None
+
+            run = match.group(1)
+            lowered = run.lower()
+            parts.append(lowered)
+            if len(lowered) == len(run):
+                offsets.extend(range(start, base + match.end()))
+            else:
+                # A few characters lowercase to several; map each to its source
+                for index, char in enumerate(run):
+                    offsets.extend([start + index] * len(char.lower()))
+            self._started = True
+        self.position += len(text)
+        return ''.join(parts), offsets
+
+
+class PreparedDocument:
+    """A document normalized, tokenized and indexed once for every analysis stage.
+
+    ``normalized`` is the ``TextNormalizer`` output for the whole text.
+    ``offsets[i]`` (computed only when a span is mapped back) is the
+    position in ``text`` of normalized character ``i``, so any span found
+    in ``normalized`` maps back to the source text and, when ``pages`` is
+    given, to its page. Tokens and sentences are indexed on first use as
+    offset arrays into ``normalized``, so a position maps to its sentence
+    by binary search and sentence text is only sliced on request; keyword
+    scans are memoized per automaton so stages sharing an automaton share
+    one scan.
+    """
+
+    def __init__(self, text: str, pages: Optional[List[str]] = None):
+        self.text = text
+        self.normalized = normalize_text(text)
+        self._offsets: Optional[array] = None
+
+        # Start offset in ``text`` of each page; pages are joined with newlines
+        self.page_starts = array('I')
+        position = 0
+        for page in pages or ():
+            self.page_starts.append(position)
+            position += len(page) + 1
+
+        # Token and sentence indexes are built on first use
+        self._tokens: Optional[Tuple[array, array]] = None
+        self._sentences: Optional[Tuple[array, array]] = None
+        self._keyword_hits: Dict[int, List[Tuple[int, int, str]]] = {}
+        self._keyword_counts: Dict[int, Dict[str, int]] = {}
+
+    @classmethod
+    def ensure(cls, document: Union[str, "PreparedDocument"]) -> "PreparedDocument":
+        """Accept raw text or an already prepared document.
+
+        Anything other than a string is passed through, so objects offering
+        ``text_length`` and the keyword methods (such as the tally kept by
+        streaming analysis) can stand in for a prepared document.
+        """
+        return cls(document) if isinstance(document, str) else document
+
+    def _index_tokens(self) -> Tuple[array, array]:
+        if self._tokens is None:
+            starts = array('I')
+            ends = array('I')
+            for match in TOKEN_PATTERN.finditer(self.normalized):
+                starts.append(match.start())
+                ends.append(match.end())
+            self._tokens = (starts, ends)
+        return self._tokens
+
+    def _index_sentences(self) -> Tuple[array, array]:
+        """Boundaries of each non-empty sentence, excluding surrounding spaces"""
+        if self._sentences is not None:
+            return self._sentences
+
+        text = self.normalized
+        starts = array('I')
+        ends = array('I')
+
+        start = 0
+        boundaries = [(m.start(), m.end()) for m in SENTENCE_END_PATTERN.finditer(text)]
+        boundaries.append((len(text), len(text)))
+        for end, next_start in boundaries:
+            # Whitespace is already collapsed, so at most one space on each side
+            if start < end and text[start] == ' ':
+                start += 1
+            if end > start and text[end - 1] == ' ':
+                end -= 1
+            if start < end:
+                starts.append(start)
+                ends.append(end)
+            start = next_start
+        self._sentences = (starts, ends)
+        return self._sentences
+
+    @property
+    def offsets(self) -> array:
+        """Source offset of every normalized character, computed on first use"""
+        if self._offsets is None:
+            self._offsets = TextNormalizer().feed(self.text)[1]
+        return self._offsets
+
+    @property
+    def token_starts(self) -> array:
+        return self._index_tokens()[0]
+
+    @property
+    def token_ends(self) -> array:
+        return self._index_tokens()[1]
+
+    @property
+    def sentence_starts(self) -> array:
+        return self._index_sentences()[0]
+
+    @property
+    def sentence_ends(self) -> array:
+        return self._index_sentences()[1]
+
+    def original_span(self, start: int, end: int) -> Tuple[int, int]:
+        """Map a non-empty span of ``normalized`` to the matching span of ``text``"""
+        return self.offsets[start], self.offsets[end - 1] + 1
+
+    def page_number(self, position: int) -> Optional[int]:
+        """1-based page containing a position of ``text``, if pages are known"""
+        if not self.page_starts:
+            return None
+        return bisect_right(self.page_starts, position)
+
+    @property
+    def text_length(self) -> int:
+        return len(self.text)
+
+    @property
+    def word_count(self) -> int:
+        return len(self.token_starts)
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentence_starts)
+
+    def sentence_at(self, position: int) -> Optional[int]:
+        """Index of the sentence containing a position of ``normalized``, if any"""
+        index = bisect_right(self.sentence_starts, position) - 1
+        if index >= 0 and position < self.sentence_ends[index]:
+            return index
+        return None
+
+    def sentence_span(self, index: int) -> Tuple[int, int]:
+        return self.sentence_starts[index], self.sentence_ends[index]
+
+    def sentence(self, index: int) -> str:
+        return self.normalized[self.sentence_starts[index]:self.sentence_ends[index]]
+
+    def sentences(self) -> List[str]:
+        return [self.sentence(index) for index in range(self.sentence_count)]
+
+    def keyword_hits(self, matcher: KeywordAutomaton) -> List[Tuple[int, int, str]]:
+        """All (start, end, keyword) hits of ``matcher`` in the normalized text"""
+        key = id(matcher)
+        if key not in self._keyword_hits:
+            self._keyword_hits[key] = matcher.find_all(self.normalized)
+        return self._keyword_hits[key]
+
+    def keyword_counts(self, matcher: KeywordAutomaton) -> Dict[str, int]:
+        key = id(matcher)
+        if key not in self._keyword_counts:
+            counts: Dict[str, int] = {}
+            for _, _, keyword in self.keyword_hits(matcher):
+                counts[keyword] = counts.get(keyword, 0) + 1
+            self._keyword_counts[key] = counts
+        return self._keyword_counts[key]
+
+    def keywords_present(self, matcher: KeywordAutomaton) -> Set[str]:
+        return set(self.keyword_counts(matcher))
@@ -0,0 +1,199 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Type, TypeVar, Union
+import hashlib
+import json
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+# Rule pack shipped with the application
+DEFAULT_RULE_PACK_PATH = Path(__file__).resolve().parent.parent / "rules" / "irish_employment.json"
+SUPPORTED_FORMAT_VERSION = 1
+
+E = TypeVar("E", bound=Enum)
+
+
+class RulePackError(ValueError):
+    """A rule pack file could not be read or does not match the rule pack schema"""
+
+
+class MappingOf:
+    """Schema of an object with arbitrary string keys and values matching ``values``"""
+
+    def __init__(self, values: Any):
+        self.values = values
+
+
+STRINGS = [str]
+NUMBER = (int, float)
+DATE = (str, date)
+OPTIONAL_STRING = (str, type(None))
+
+# Objects list their fields; a trailing '?' marks an optional field
+RULE_PACK_SCHEMA = {
+    "format_version": int,
+    "name": str,
+    "version": str,
+    "classifier": MappingOf({
+        "keywords": STRINGS,
+        "weight": NUMBER
+    }),
+    "document_requirements": MappingOf({
+        "required_clauses": STRINGS,
+        "recommended_clauses": STRINGS,
+        "risk_multiplier": NUMBER,
+        "minimum_content_length": int,
+        "maximum_content_length?": (int, type(None)),
+        "required_sections?": STRINGS,
+        "keywords?": STRINGS,
+        "compliance_rules?": STRINGS
+    }),
+    "acts": MappingOf(str),
+    "legal_requirements": MappingOf([{
+        "description": str,
+        "references?": [{
+            "act?": str,
+            "act_id?": str,
+            "section": str,
+            "description": str,
+            "url?": OPTIONAL_STRING,
+            "effective_date?": DATE,
+            "last_amended?": (str, date, type(None))
+        }],
+        "is_mandatory?": bool,
+        "applicable_from?": DATE,
+        "penalties?": OPTIONAL_STRING,
+        "category?": str,
+        "compliance_checklist?": STRINGS
+    }])
+}
+
+
+def _type_names(types: tuple) -> str:
+    return " or ".join("null" if t is type(None) else t.__name__ for t in types)
+
+
+def validate_schema(value: Any, schema: Any, where: str = "rule pack"):
+    """Raise ``RulePackError`` naming the first place ``value`` breaks ``schema``"""
+    if isinstance(schema, dict):
+        if not isinstance(value, dict):
+            raise RulePackError(f"{where}: expected an object")
+        fields = {key.rstrip('?'): key for key in schema}
+        for name, key in fields.items():
+            if name in value:
+                validate_schema(value[name], schema[key], f"{where}.{name}")
+            elif not key.endswith('?'):
+                raise RulePackError(f"{where}: missing field '{name}'")
+        for name in value:
+            if name not in fields:
+                raise RulePackError(f"{where}: unknown field '{name}'")
+    elif isinstance(schema, MappingOf):
+        if not isinstance(value, dict):
+            raise RulePackError(f"{where}: expected an object")
+        for key, item in value.items():
+            validate_schema(item, schema.values, f"{where}.{key}")
+    elif isinstance(schema, list):
+        if not isinstance(value, list):
+            raise RulePackError(f"{where}: expected a list")
+        for index, item in enumerate(value):
+            validate_schema(item, schema[0], f"{where}[{index}]")
+    else:
+        types = schema if isinstance(schema, tuple) else (schema,)
+        # bool is an int subclass, but true is not a valid length or weight
+        if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+            raise RulePackError(f"{where}: expected {_type_names(types)}")
+
+
+def parse_enum(enum_class: Type[E], name: str, where: str) -> E:
+    """Enum member by name, as written in rule packs"""
+    try:
+        return enum_class[name]
+    except KeyError:
+        raise RulePackError(f"{where}: unknown {enum_class.__name__} '{name}'") from None
+
+
+def parse_datetime(value: Union[str, date], where: str) -> datetime:
+    """Datetime from an ISO date string (or a date already parsed by YAML)"""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise RulePackError(f"{where}: invalid date '{value}'") from None
+
+
+@dataclass(frozen=True)
+class RulePack:
+    """A validated rule pack: the tables each analysis stage compiles its matchers from.
+
+    Sections keep the structure of the file; the stages turn them into
+    their own objects. ``fingerprint`` identifies the exact rules, so it
+    changes whenever any rule does, even if the version is not bumped.
+    """
+    name: str
+    version: str
+    classifier: Mapping[str, Dict[str, Any]]
+    document_requirements: Mapping[str, Dict[str, Any]]
+    acts: Mapping[str, str]
+    legal_requirements: Mapping[str, Any]
+    fingerprint: str
+    source: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Any, source: Optional[str] = None) -> "RulePack":
+        validate_schema(data, RULE_PACK_SCHEMA)
+        if data["format_version"] != SUPPORTED_FORMAT_VERSION:
+            raise RulePackError(
+                f"rule pack.format_version: unsupported format {data['format_version']}, "
+                f"expected {SUPPORTED_FORMAT_VERSION}"
+            )
+        digest = hashlib.sha256(
+            json.dumps(data, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return cls(
+            name=data["name"],
+            version=data["version"],
+            classifier=data["classifier"],
+            document_requirements=data["document_requirements"],
+            acts=data["acts"],
+            legal_requirements=data["legal_requirements"],
+            fingerprint=f"{data['name']}@{data['version']}:{digest[:12]}",
+            source=source
+        )
+
+
+def load_rule_pack(path: Union[str, Path, None] = None) -> RulePack:
+    """Read and validate a rule pack; ``.yaml``/``.yml`` files need PyYAML"""
+    path = Path(path) if path else DEFAULT_RULE_PACK_PATH
+    try:
+        raw = path.read_text(encoding="utf-8")
+    except OSError as e:
+        raise RulePackError(f"Cannot read rule pack {path}: {e}") from e
+
+    is_yaml = path.suffix in (".yaml", ".yml")
+    if is_yaml and yaml is None:
+        raise RulePackError(f"Reading {path} requires PyYAML")
+    try:
+        data = yaml.safe_load(raw) if is_yaml else json.loads(raw)
+    except (ValueError, getattr(yaml, "YAMLError", ValueError)) as e:
+        raise RulePackError(f"Cannot parse rule pack {path}: {e}") from e
+
+    return RulePack.from_dict(data, source=str(path))
+
+
+_default_rule_pack: Optional[RulePack] = None
+
+
+def default_rule_pack() -> RulePack:
+    """The shipped rule pack, read once per process"""
+    global _default_rule_pack
+    if _default_rule_pack is None:
+        _default_rule_pack = load_rule_pack(DEFAULT_RULE_PACK_PATH)
+    return _default_rule_pack
@@ -1,93 +1,286 @@
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Union
 from datetime import datetime
+import threading
 import time
 from core.models import AnalysisResult, Finding, AnalysisConfig
-from core.enums import RiskLevel, ProcessingStatus
+from core.findings_store import FindingsStore
+from core.enums import RiskLevel, ProcessingStatus, AnalysisType
 from core.document_types import DocumentType, DocumentRequirements
 from core.irish_law_rules import IrishEmploymentLaw
+from core.keyword_matcher import KeywordAutomaton
+from core.prepared_document import PreparedDocument
+from core.rule_pack import RulePack, load_rule_pack
 from ..classifier.document_classifier import DocumentClassifier
 from .text_analyzer import TextAnalyzer
+from .stream_analyzer import StreamingAnalysis
+from .rule_snapshot import RuleSnapshot
 from app.config import settings
 
 class DocumentAnalyzer:
-    def __init__(self):
-        self.text_analyzer = TextAnalyzer()
-        self.document_classifier = DocumentClassifier()
-        self.document_requirements = DocumentRequirements()
-        self.irish_law = IrishEmploymentLaw()
+    def __init__(self, rule_pack: Optional[RulePack] = None):
         self.config = AnalysisConfig(
         risk_threshold_high=settings.RISK_THRESHOLD_HIGH,
         risk_threshold_medium=settings.RISK_THRESHOLD_MEDIUM,
-        context_window_size=settings.CONTEXT_WINDOW_SIZE
+        context_window_size=settings.CONTEXT_WINDOW_SIZE,
+        max_findings=settings.MAX_FINDINGS,
+        aggregate_findings=settings.AGGREGATE_FINDINGS,
+        analysis_type=AnalysisType(settings.DEFAULT_ANALYSIS_TYPE)
 )
+        self.rule_pack_path = settings.RULE_PACK_PATH or None
+        self._reload_lock = threading.Lock()
+        if rule_pack is None:
+            rule_pack = load_rule_pack(self.rule_pack_path)
+        self.rules = self.compile_rules(rule_pack)
+
+    def compile_rules(self, rule_pack: RulePack) -> RuleSnapshot:
+        return RuleSnapshot.compile(
+            rule_pack,
+            prefix_chars=settings.CLASSIFICATION_PREFIX_CHARS,
+            margin_threshold=settings.CLASSIFICATION_MARGIN
+        )
+
+    def reload_rules(self, path: Optional[str] = None) -> RuleSnapshot:
+        """Load, validate and compile a rule pack, then swap it in.
+
+        The new snapshot replaces the current one in a single assignment
+        once it is fully compiled; analyses already running finish with
+        the snapshot they started with. On ``RulePackError`` the current
+        rules stay in place.
+        """
+        with self._reload_lock:
+            if path is not None:
+                self.rule_pack_path = path
+            rules = self.compile_rules(load_rule_pack(self.rule_pack_path))
+            self.rules = rules
+        return rules
+
+    # Stages of the current rule snapshot
+    @property
+    def text_analyzer(self) -> TextAnalyzer:
+        return self.rules.text_analyzer
+
+    @property
+    def document_classifier(self) -> DocumentClassifier:
+        return self.rules.document_classifier
+
+    @property
+    def document_requirements(self) -> DocumentRequirements:
+        return self.rules.document_requirements
+
+    @property
+    def irish_law(self) -> IrishEmploymentLaw:
+        return self.rules.irish_law
+
+    @property
+    def keyword_matcher(self) -> KeywordAutomaton:
+        return self.rules.keyword_matcher
 
     async def analyze_document(self, text: str, document_id: str) -> AnalysisResult:
+        return self.analyze(text, document_id)
+
+    def resolve_analysis_type(self, analysis_type: Union[AnalysisType, str, None]) -> AnalysisType:
+        """The requested analysis depth, or the configured default.
+
+        Accepts an ``AnalysisType`` or its value, so callers holding the
+        enum from another import path can pass it through. The default is
+        at least DETAILED when ``config.detailed_analysis`` is set.
+        """
+        if analysis_type is None:
+            if self.config.detailed_analysis and self.config.analysis_type == AnalysisType.BASIC:
+                return AnalysisType.DETAILED
+            return self.config.analysis_type
+        return AnalysisType(getattr(analysis_type, "value", analysis_type))
+
+    def analyze(
+        self,
+        text: str,
+        document_id: str,
+        pages: Optional[List[str]] = None,
+        analysis_type: Union[AnalysisType, str, None] = None,
+        rules: Optional[RuleSnapshot] = None
+    ) -> AnalysisResult:
+        """Synchronous analysis entry point, safe to call from worker threads.
+
+        ``pages`` are the page texts ``text`` was joined from with newlines;
+        when given, findings carry the page they were found on.
+
+        ``analysis_type`` selects the depth: BASIC classifies the document
+        and checks its requirements, DETAILED adds pattern and clause
+        findings, and COMPREHENSIVE adds compliance checks and
+        recommendations.
+
+        ``rules`` defaults to the current rule snapshot.
+        """
         start_time = time.time()
+        analysis_type = self.resolve_analysis_type(analysis_type)
+        rules = rules or self.rules
+        result = AnalysisResult(
+            document_id=document_id,
+            document_type=DocumentType.UNKNOWN,
+            status=ProcessingStatus.PROCESSING
+        )
 
         try:
-            # Initialize result
-            result = AnalysisResult(
-                document_id=document_id,
-                document_type=DocumentType.UNKNOWN,
-                status=ProcessingStatus.PROCESSING
-            )
+            # Normalize, tokenize and index the text once for every stage
+            document = PreparedDocument(text, pages)
 
             # Classify document
-            doc_type = self.document_classifier.classify_document(text)
-            result.document_type = doc_type
+            doc_type = rules.document_classifier.classify_document(document)
 
             # Perform text analysis
-            text_analysis = self.text_analyzer.analyze(text, doc_type)
-            result.findings.extend(text_analysis.findings)
-            result.categories.update(text_analysis.categories)
+            findings = FindingsStore(text)
+            if analysis_type != AnalysisType.BASIC:
+                findings = rules.text_analyzer.analyze(document, doc_type).findings_store
 
-            # Check document requirements
-            requirements_validation = self.document_requirements.validate_document(doc_type, text)
-            
-            # Check legal compliance
-            compliance_results = self.irish_law.check_compliance(doc_type.value.lower(), text)
-
-            # Calculate risk score
-            risk_score = self._calculate_risk_score(
-                text_analysis.findings,
-                requirements_validation,
-                compliance_results
+            return self._complete(
+                result,
+                document,
+                doc_type,
+                findings,
+                document.word_count,
+                start_time,
+                analysis_type,
+                rules
             )
-            result.risk_score = risk_score
-
-            # Set overall risk level
-            result.overall_risk_level = self._determine_risk_level(risk_score)
-
-            # Generate recommendations
-            if self.config.include_recommendations:
-                result.recommendations = self._generate_recommendations(
-                    doc_type,
-                    requirements_validation,
-                    compliance_results
-                )
-
-            # Update metadata
-            result.metadata.update({
-                "processing_time": time.time() - start_time,
-                "requirements_validation": requirements_validation,
-                "compliance_results": compliance_results,
-                "word_count": len(text.split()),
-                "processed_at": datetime.now().isoformat()
-            })
-
-            result.status = ProcessingStatus.COMPLETED
-            return result
 
         except Exception as e:
             result.status = ProcessingStatus.FAILED
             result.metadata["error"] = str(e)
             return result
 
+    def start_stream(
+        self,
+        document_id: str,
+        overlap: Optional[int] = None,
+        analysis_type: Union[AnalysisType, str, None] = None,
+        rules: Optional[RuleSnapshot] = None
+    ) -> "StreamingAnalysis":
+        """Begin analyzing a document fed page by page or chunk by chunk"""
+        return StreamingAnalysis(
+            self,
+            document_id,
+            overlap=overlap if overlap is not None else settings.STREAM_CHUNK_OVERLAP,
+            analysis_type=self.resolve_analysis_type(analysis_type),
+            rules=rules or self.rules
+        )
+
+    def analyze_pages(
+        self,
+        pages: Iterable[str],
+        document_id: str,
+        analysis_type: Union[AnalysisType, str, None] = None,
+        rules: Optional[RuleSnapshot] = None,
+        on_findings: Optional[Callable[[List[Finding]], None]] = None
+    ) -> AnalysisResult:
+        """Analyze a document one page at a time.
+
+        The analysis itself holds only the last ``overlap`` characters and
+        the current sentence, so memory does not grow with the document
+        when ``pages`` is a lazy iterable; a list of pages is of course
+        held in full by the caller. ``on_findings`` receives each
+        batch of findings as soon as the pages fed so far complete it.
+        """
+        stream = self.start_stream(document_id, analysis_type=analysis_type, rules=rules)
+        for page in pages:
+            findings = stream.feed_page(page)
+            if on_findings is not None and findings:
+                on_findings(findings)
+        findings = stream.flush()
+        if on_findings is not None and findings:
+            on_findings(findings)
+        return stream.finish()
+
+    def _complete(
+        self,
+        result: AnalysisResult,
+        document: PreparedDocument,
+        doc_type: DocumentType,
+        findings: FindingsStore,
+        word_count: int,
+        start_time: float,
+        analysis_type: AnalysisType = AnalysisType.COMPREHENSIVE,
+        rules: Optional[RuleSnapshot] = None
+    ) -> AnalysisResult:
+        """Score, trim and annotate the findings of a classified document.
+
+        ``document`` only needs ``text_length`` and the keyword methods, so
+        streaming analysis can pass the keyword tally it accumulated.
+        """
+        rules = rules or self.rules
+        result.document_type = doc_type
+        if self.config.aggregate_findings:
+            findings = findings.aggregate()
+
+        # Check document requirements
+        requirements_validation = rules.document_requirements.validate_document(doc_type, document)
+        
+        # Check legal compliance
+        compliance_results = None
+        if analysis_type == AnalysisType.COMPREHENSIVE:
+            compliance_results = rules.irish_law.check_compliance(doc_type.value.lower(), document)
+
+        # Calculate risk score
+        risk_score = self._calculate_risk_score(
+            findings,
+            requirements_validation,
+            compliance_results
+        )
+        result.risk_score = risk_score
+
+        # Keep the most significant findings once every one has been scored
+        kept = self._limit_findings(findings, self.config.max_findings)
+        result.findings_store = kept
+        result.findings = kept.views()
+        result.categories = kept.category_index()
+
+        # Set overall risk level
+        result.overall_risk_level = self._determine_risk_level(risk_score)
+
+        # Generate recommendations
+        if analysis_type == AnalysisType.COMPREHENSIVE and self.config.include_recommendations:
+            result.recommendations = self._generate_recommendations(
+                doc_type,
+                requirements_validation,
+                compliance_results
+            )
+
+        # Update metadata
+        result.metadata.update({
+            "processing_time": time.time() - start_time,
+            "analysis_type": analysis_type.value,
+            "requirements_validation": requirements_validation,
+            "word_count": word_count,
+            "total_findings": len(findings),
+            "processed_at": datetime.now().isoformat(),
+            "rules": rules.fingerprint
+        })
+        if compliance_results is not None:
+            result.metadata["compliance_results"] = compliance_results
+
+        result.status = ProcessingStatus.COMPLETED
+        return result
+
+    def _limit_findings(self, findings: FindingsStore, max_findings: int) -> FindingsStore:
+        """Keep the highest-risk, most frequent findings, in their original order"""
+        if len(findings) <= max_findings:
+            return findings
+        risk_rank = {
+            RiskLevel.HIGH.value: 0,
+            RiskLevel.MEDIUM.value: 1,
+            RiskLevel.LOW.value: 2
+        }
+        ranks = [risk_rank.get(level, 3) for level in findings.risk_levels]
+        ranked = sorted(
+            range(len(findings)),
+            key=lambda row: (ranks[findings.risk_ids[row]], -findings.occurrences[row])
+        )
+        return findings.select(sorted(ranked[:max_findings]))
+
     def _calculate_risk_score(
         self,
-        findings: List[Finding],
+        findings: Iterable[Finding],
         requirements_validation: Dict,
-        compliance_results: Dict
+        compliance_results: Optional[Dict]
     ) -> float:
         base_score = 0.0
         
@@ -107,7 +300,7 @@ class DocumentAnalyzer:
             base_score += len(requirements_validation["missing_recommended_clauses"]) * 1.0
 
         # Score from compliance
-        if not compliance_results["compliant"]:
+        if compliance_results is not None and not compliance_results["compliant"]:
             base_score += len(compliance_results["missing_requirements"]) * 2.5
 
         # Normalize score to 1-10 range
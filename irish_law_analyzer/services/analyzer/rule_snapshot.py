@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+import time
+from core.document_types import DocumentRequirements
+from core.irish_law_rules import IrishEmploymentLaw
+from core.keyword_matcher import KeywordAutomaton
+from core.rule_pack import RulePack
+from ..classifier.document_classifier import DocumentClassifier
+from .text_analyzer import TextAnalyzer
+
+
+@dataclass(frozen=True)
+class RuleSnapshot:
+    """Every analysis stage compiled from one rule pack.
+
+    A snapshot is never modified once compiled: reloading rules compiles
+    a new snapshot and swaps the reference, so an analysis that started
+    with this one finishes with the same rules.
+    """
+    rule_pack: RulePack
+    text_analyzer: TextAnalyzer
+    document_classifier: DocumentClassifier
+    document_requirements: DocumentRequirements
+    irish_law: IrishEmploymentLaw
+    keyword_matcher: KeywordAutomaton
+    compile_time: float
+
+    @property
+    def fingerprint(self) -> str:
+        return self.rule_pack.fingerprint
+
+    @classmethod
+    def compile(
+        cls,
+        rule_pack: RulePack,
+        prefix_chars: int = 10000,
+        margin_threshold: float = 15.0
+    ) -> "RuleSnapshot":
+        """Build every stage from ``rule_pack``; raises ``RulePackError`` for invalid rules"""
+        start = time.perf_counter()
+        text_analyzer = TextAnalyzer()
+        document_classifier = DocumentClassifier(
+            prefix_chars=prefix_chars,
+            margin_threshold=margin_threshold,
+            rule_pack=rule_pack
+        )
+        document_requirements = DocumentRequirements(rule_pack)
+        irish_law = IrishEmploymentLaw(rule_pack)
+
+        # One automaton over every stage's vocabulary: one keyword scan per document
+        keyword_matcher = KeywordAutomaton(
+            document_classifier.vocabulary()
+            + text_analyzer.vocabulary()
+            + document_requirements.vocabulary()
+            + irish_law.vocabulary()
+        )
+        for stage in (document_classifier, text_analyzer, document_requirements, irish_law):
+            stage.keyword_matcher = keyword_matcher
+
+        return cls(
+            rule_pack=rule_pack,
+            text_analyzer=text_analyzer,
+            document_classifier=document_classifier,
+            document_requirements=document_requirements,
+            irish_law=irish_law,
+            keyword_matcher=keyword_matcher,
+            compile_time=time.perf_counter() - start
+        )
@@ -0,0 +1,381 @@
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+from array import array
+from bisect import bisect_left, bisect_right
+import time
+from core.models import AnalysisResult, Finding, render_context
+from core.enums import ProcessingStatus, AnalysisType
+from core.document_types import DocumentType
+from core.findings_store import FindingsStore
+from core.keyword_matcher import KeywordAutomaton
+from core.prepared_document import SENTENCE_END_PATTERN, TextNormalizer
+from .text_analyzer import CLAUSE_INDICATORS
+
+if TYPE_CHECKING:
+    from .document_analyzer import DocumentAnalyzer
+    from .rule_snapshot import RuleSnapshot
+
+
+class KeywordTally:
+    """Keyword counts accumulated over a streamed document.
+
+    Offers the ``text_length`` and keyword methods of ``PreparedDocument``,
+    so the classifier, requirement checks and compliance checks accept it
+    in place of a prepared document.
+    """
+
+    def __init__(self, matcher: KeywordAutomaton):
+        self.matcher = matcher
+        self.counts = [0] * len(matcher.keywords)
+        self.text_length = 0
+        self.state = 0
+
+    def feed(self, normalized: str) -> List[Tuple[int, int, int]]:
+        """Scan the next normalized chunk; returns its hits relative to the chunk"""
+        hits, self.state = self.matcher.scan(normalized, self.state)
+        for _, _, keyword_id in hits:
+            self.counts[keyword_id] += 1
+        return hits
+
+    def _check_matcher(self, matcher: KeywordAutomaton):
+        if matcher is not self.matcher:
+            raise ValueError("Streamed documents only have counts for their own keyword matcher")
+
+    def keyword_counts(self, matcher: KeywordAutomaton) -> Dict[str, int]:
+        self._check_matcher(matcher)
+        return {matcher.keywords[i]: c for i, c in enumerate(self.counts) if c}
+
+    def keywords_present(self, matcher: KeywordAutomaton) -> Set[str]:
+        return set(self.keyword_counts(matcher))
+
+
+class StreamingAnalysis:
+    """Analyzes a document fed incrementally, holding only a bounded window of text.
+
+    Each chunk is normalized and scanned for keywords as it arrives, with
+    the automaton state carried across chunks. Pattern matches are
+    reported once the ``overlap`` normalized characters after them and
+    their context window of original text are known; clause indicators
+    once their sentence has ended. Only that much normalized and original
+    text is kept, plus the current sentence when clause indicators are
+    looked for, so memory is bounded by ``overlap`` and the longest
+    sentence rather than the document; matches crossing a chunk boundary
+    are not lost as long as they are shorter than ``overlap``.
+
+    Findings are returned by ``feed``/``feed_page`` and finally ``flush`` in
+    document order, with the same context as ``DocumentAnalyzer.analyze``
+    renders from the original text; ``finish`` classifies the document and
+    scores it exactly like ``DocumentAnalyzer.analyze``.
+    """
+
+    def __init__(
+        self,
+        analyzer: "DocumentAnalyzer",
+        document_id: str,
+        overlap: int = 256,
+        analysis_type: AnalysisType = AnalysisType.COMPREHENSIVE,
+        rules: Optional["RuleSnapshot"] = None
+    ):
+        self.analyzer = analyzer
+        # The whole document is analyzed with the rules current when it started
+        self.rules = rules or analyzer.rules
+        self.document_id = document_id
+        self.analysis_type = analysis_type
+        # BASIC analysis only needs the keyword counts
+        self.find_patterns = analysis_type != AnalysisType.BASIC
+        self.context_window = analyzer.config.context_window_size
+        self.overlap = max(overlap, self.context_window)
+        self.start_time = time.time()
+
+        self.normalizer = TextNormalizer()
+        self.tally = KeywordTally(self.rules.keyword_matcher)
+        self.classification = self.rules.document_classifier.start_classification()
+        self.store = FindingsStore()
+        self.page_starts = array('I')
+        self.word_count = 0
+
+        # Normalized text from global position ``base`` on, and its source offsets
+        self.buffer = ""
+        self.buffer_offsets = array('I')
+        self.base = 0
+        # Original text from offset ``raw_base`` on, for rendering contexts
+        self.raw = ""
+        self.raw_base = 0
+        # Source offset just past the last normalized character so far
+        self._offset_end = 0
+        # Where the next pattern scan resumes (global normalized position)
+        self.pattern_position = 0
+
+        self._clause_ids = {
+            self.rules.keyword_matcher.keyword_ids[indicator]: indicator
+            for indicator in CLAUSE_INDICATORS
+            if self.find_patterns and indicator in self.rules.keyword_matcher.keyword_ids
+        }
+        # (start, end, indicator, sentence start, sentence end or None while open)
+        self._pending_clauses: List[Tuple[int, int, str, int, Optional[int]]] = []
+        self._sentence = 0
+        # Global normalized position where the current sentence starts
+        self._sentence_start = 0
+        self._sentence_indicators: Set[str] = set()
+        self._in_terminator = False
+        self._in_token = False
+        self._first_contexts: Set[Tuple[str, str, str]] = set()
+
+    def feed_page(self, text: str) -> List[Finding]:
+        """Feed the next page; pages are treated as joined with newlines"""
+        if self.page_starts:
+            self.feed("\n")
+        self.page_starts.append(self.normalizer.position)
+        return self.feed(text)
+
+    def feed(self, text: str) -> List[Finding]:
+        """Feed the next chunk of the current page and return the findings it completes"""
+        if not self.page_starts:
+            self.page_starts.append(0)
+        self.tally.text_length += len(text)
+        self.raw += text
+        normalized, offsets = self.normalizer.feed(text)
+        if not normalized:
+            return []
+
+        chunk_base = self.base + len(self.buffer)
+        self._count_words(normalized)
+        hits = self.tally.feed(normalized)
+        keywords = self.tally.matcher.keywords
+        self.classification.feed(
+            (chunk_base + end, keywords[keyword_id]) for _, end, keyword_id in hits
+        )
+        self._track_clauses(normalized, chunk_base, hits)
+
+        self.buffer += normalized
+        self.buffer_offsets.extend(offsets)
+        self._offset_end = offsets[-1] + 1
+        findings = self._emit(self.base + len(self.buffer) - self.overlap)
+        self._trim()
+        return findings
+
+    def flush(self) -> List[Finding]:
+        """Return the findings still held back at the end of the document"""
+        end = self.base + len(self.buffer)
+        self._pending_clauses = [
+            (start, stop, indicator, sentence_start, end if sentence_end is None else sentence_end)
+            for start, stop, indicator, sentence_start, sentence_end in self._pending_clauses
+        ]
+        return self._emit(end, final=True)
+
+    def finish(self) -> AnalysisResult:
+        """Classify and score the document; call ``flush`` first to see its last findings"""
+        self.flush()
+        result = AnalysisResult(
+            document_id=self.document_id,
+            document_type=DocumentType.UNKNOWN,
+            status=ProcessingStatus.PROCESSING
+        )
+        try:
+            doc_type = self.classification.result()[0]
+            return self.analyzer._complete(
+                result,
+                self.tally,
+                doc_type,
+                self.store,
+                self.word_count,
+                self.start_time,
+                self.analysis_type,
+                self.rules
+            )
+        except Exception as e:
+            result.status = ProcessingStatus.FAILED
+            result.metadata["error"] = str(e)
+            return result
+
+    def _count_words(self, normalized: str):
+        words = len(normalized.split())
+        if self._in_token and not normalized[0].isspace():
+            words -= 1  # the chunk continues the previous chunk's last token
+        self.word_count += words
+        self._in_token = not normalized[-1].isspace()
+
+    def _track_clauses(self, normalized: str, chunk_base: int, hits: List[Tuple[int, int, int]]):
+        """Queue the first hit of each clause indicator in every sentence, with its sentence span"""
+        boundaries = []
+        boundary_ends = []
+        for match in SENTENCE_END_PATTERN.finditer(normalized):
+            if match.start() == 0 and self._in_terminator:
+                # The previous chunk's terminator run goes on
+                self._sentence_start = chunk_base + match.end()
+                continue
+            boundaries.append(match.start())
+            boundary_ends.append(match.end())
+        self._in_terminator = normalized[-1] in '.!?'
+
+        if boundaries:
+            # The sentence open at the start of the chunk ends at its first boundary
+            self._pending_clauses = [
+                (start, end, indicator, sentence_start,
+                 chunk_base + boundaries[0] if sentence_end is None else sentence_end)
+                for start, end, indicator, sentence_start, sentence_end in self._pending_clauses
+            ]
+
+        sentence_at_chunk_start = self._sentence
+        for start, end, keyword_id in hits:
+            indicator = self._clause_ids.get(keyword_id)
+            if indicator is None:
+                continue
+            # Indicators contain no sentence punctuation, so every boundary
+            # before the end of a hit is also before its start
+            index = bisect_left(boundaries, end)
+            sentence = sentence_at_chunk_start + index
+            if sentence != self._sentence:
+                self._sentence = sentence
+                self._sentence_indicators = set()
+            if indicator not in self._sentence_indicators:
+                self._sentence_indicators.add(indicator)
+                sentence_start = chunk_base + boundary_ends[index - 1] if index else self._sentence_start
+                sentence_end = chunk_base + boundaries[index] if index < len(boundaries) else None
+                self._pending_clauses.append(
+                    (chunk_base + start, chunk_base + end, indicator, sentence_start, sentence_end)
+                )
+
+        if boundaries:
+            self._sentence_start = chunk_base + boundary_ends[-1]
+        if sentence_at_chunk_start + len(boundaries) != self._sentence:
+            self._sentence = sentence_at_chunk_start + len(boundaries)
+            self._sentence_indicators = set()
+
+    def _emit(self, limit: int, final: bool = False) -> List[Finding]:
+        """Record and return the findings that start before global position ``limit``.
+
+        Unless ``final``, a finding whose context is not complete yet holds
+        back itself and every finding after it, keeping document order.
+        """
+        matches: List[Tuple[int, int, str, str, str, Optional[Tuple[int, int]]]] = []
+        if not self.find_patterns:
+            self.pattern_position = max(self.pattern_position, limit)
+            return []
+
+        for start, _, _, _, sentence_end in self._pending_clauses:
+            if sentence_end is None:
+                limit = min(limit, start)
+                break
+
+        matcher = self.rules.text_analyzer.pattern_matcher
+        groups = self.rules.text_analyzer.pattern_groups
+        position = self.pattern_position
+        for match in matcher.finditer(self.buffer, position - self.base):
+            start = self.base + match.start()
+            if start >= limit:
+                break
+            original_end = self.buffer_offsets[match.end() - 1] + 1
+            if not final and original_end + self.context_window >= self.normalizer.position:
+                # The original text after its context window is not known yet
+                limit = start
+                break
+            category, risk_level = groups[match.lastgroup]
+            matches.append((start, self.base + match.end(), match.group(), category, risk_level, None))
+            position = self.base + match.end()
+        self.pattern_position = max(position, limit)
+
+        remaining = []
+        for start, end, indicator, sentence_start, sentence_end in self._pending_clauses:
+            if start < limit:
+                matches.append(
+                    (start, end, indicator, "Contractual Clauses", "LOW", (sentence_start, sentence_end))
+                )
+            else:
+                remaining.append((start, end, indicator, sentence_start, sentence_end))
+        self._pending_clauses = remaining
+
+        findings = []
+        for start, end, keyword, category, risk_level, sentence in sorted(matches):
+            findings.append(self._record(start, end, keyword, category, risk_level, sentence))
+        return findings
+
+    def _original_span(self, start: int, end: int) -> Tuple[int, int]:
+        """Map a non-empty span of global normalized positions to source offsets"""
+        return self.buffer_offsets[start - self.base], self.buffer_offsets[end - 1 - self.base] + 1
+
+    def _render_context(
+        self,
+        original_start: int,
+        original_end: int,
+        sentence: Optional[Tuple[int, int]]
+    ) -> str:
+        """Render a finding's context from the original text, as ``FindingsStore.get_context`` does"""
+        if sentence is None:
+            return render_context(
+                self.raw,
+                original_start - self.raw_base,
+                original_end - self.raw_base,
+                self.context_window
+            )
+        start, end = sentence
+        # Whitespace is already collapsed, so at most one space on each side
+        if start < end and self.buffer[start - self.base] == ' ':
+            start += 1
+        if end > start and self.buffer[end - 1 - self.base] == ' ':
+            end -= 1
+        context_start, context_end = self._original_span(start, end)
+        return ' '.join(self.raw[context_start - self.raw_base:context_end - self.raw_base].split())
+
+    def _record(
+        self,
+        start: int,
+        end: int,
+        keyword: str,
+        category: str,
+        risk_level: str,
+        sentence: Optional[Tuple[int, int]] = None
+    ) -> Finding:
+        original_start, original_end = self._original_span(start, end)
+        page_number = bisect_right(self.page_starts, original_start)
+        context = self._render_context(original_start, original_end, sentence)
+
+        # Only the first occurrence keeps its context: it is the one an
+        # aggregated finding reports
+        key = (keyword, category, risk_level)
+        stored_context = ""
+        if key not in self._first_contexts:
+            self._first_contexts.add(key)
+            stored_context = context
+        self.store.add(
+            keyword,
+            category,
+            risk_level,
+            start=original_start,
+            end=original_end,
+            page_number=page_number,
+            context=stored_context
+        )
+        return Finding(
+            keyword=keyword,
+            risk_level=risk_level,
+            category=category,
+            occurrences=1,
+            context=context,
+            page_number=page_number,
+            start=original_start,
+            end=original_end
+        )
+
+    def _trim(self):
+        """Drop text that no pending match or context can still need"""
+        keep_from = self.pattern_position
+        if self._clause_ids:
+            # A clause indicator's context is its whole sentence
+            keep_from = min(keep_from, self._sentence_start)
+        for start, _, _, sentence_start, _ in self._pending_clauses:
+            keep_from = min(keep_from, start, sentence_start)
+        drop = keep_from - self.base
+        if drop > 0:
+            self.buffer = self.buffer[drop:]
+            del self.buffer_offsets[:drop]
+            self.base = keep_from
+
+        # One character more than the context window, so a context that
+        # starts after the beginning of the document is still rendered
+        # with its leading ellipsis
+        anchor = self.buffer_offsets[0] if self.buffer_offsets else self._offset_end
+        raw_keep_from = anchor - self.context_window - 1
+        raw_drop = raw_keep_from - self.raw_base
+        if raw_drop > 0:
+            self.raw = self.raw[raw_drop:]
+            self.raw_base = raw_keep_from
@@ -1,181 +1,182 @@
-from typing import Dict, List, Optional
-from core.models import Finding, AnalysisResult
+from typing import Dict, List, Optional, Pattern, Tuple, Union
+from core.models import AnalysisResult
+from core.findings_store import FindingsStore
 from core.document_types import DocumentType
+from core.keyword_matcher import KeywordAutomaton
+from core.prepared_document import PreparedDocument
 import re
 
+# (category, risk level, patterns); order decides ties at the same position
+FINDING_PATTERNS: List[Tuple[str, str, List[str]]] = [
+    ("Legal References", "MEDIUM", [
+        r'section\s+\d+',
+        r'article\s+\d+',
+        r'act\s+of\s+\d{4}',
+        r'regulation\s+\d+'
+    ]),
+    ("Dates and Deadlines", "LOW", [
+        r'\d{1,2}/\d{1,2}/\d{4}',
+        r'\d{1,2}-\d{1,2}-\d{4}',
+        r'\d{1,2}\s+(?:january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{4}'
+    ]),
+    ("Monetary Values", "MEDIUM", [
+        r'€\s*\d+(?:,\d{3})*(?:\.\d{2})?',
+        r'eur\s*\d+(?:,\d{3})*(?:\.\d{2})?',
+        r'\d+(?:,\d{3})*(?:\.\d{2})?\s*euros?'
+    ])
+]
+
+def _leading_class(pattern: str) -> Optional[str]:
+    """Character-class body matching the first character of ``pattern``, if simple"""
+    if pattern[:2] in ('\\d', '\\w'):
+        return pattern[:2]
+    if pattern and (pattern[0].isalnum() or pattern[0] in '€$£'):
+        return re.escape(pattern[0])
+    return None
+
+def compile_finding_patterns(
+    pattern_table: List[Tuple[str, str, List[str]]]
+) -> Tuple[Pattern, Dict[str, Tuple[str, str]]]:
+    """Combine every pattern into one alternation with a named group per pattern.
+
+    Returns the compiled matcher and a map from group name to
+    (category, risk level), looked up through ``match.lastgroup``. When
+    every pattern starts with a simple character, a lookahead on those
+    characters lets the scan skip positions where no pattern can begin.
+    """
+    alternatives = []
+    leading = []
+    groups: Dict[str, Tuple[str, str]] = {}
+    for category, risk_level, patterns in pattern_table:
+        for pattern in patterns:
+            name = f"p{len(groups)}"
+            groups[name] = (category, risk_level)
+            alternatives.append(f"(?P<{name}>{pattern})")
+            leading.append(_leading_class(pattern))
+
+    combined = "|".join(alternatives)
+    if all(leading):
+        combined = f"(?=[{''.join(dict.fromkeys(leading))}])(?:{combined})"
+    return re.compile(combined), groups
+
+CLAUSE_INDICATORS = [
+    "hereby agrees",
+    "shall be",
+    "must",
+    "will not",
+    "is prohibited",
+    "is required"
+]
+
 class TextAnalyzer:
     def __init__(self):
-        self.context_window = 50
-        self.sentence_end_pattern = re.compile(r'[.!?]+')
+        self.pattern_matcher, self.pattern_groups = compile_finding_patterns(FINDING_PATTERNS)
+        self.keyword_matcher = KeywordAutomaton(self.vocabulary())
+
+    def vocabulary(self) -> List[str]:
+        """Every keyword matched by the clause analysis"""
+        return list(CLAUSE_INDICATORS)
 
-    def analyze(self, text: str, doc_type: DocumentType) -> AnalysisResult:
+    def analyze(self, text: Union[str, PreparedDocument], doc_type: DocumentType) -> AnalysisResult:
         result = AnalysisResult(
             document_id="",  # Will be set by DocumentAnalyzer
             document_type=doc_type
         )
 
-        # Normalize text
-        normalized_text = self._normalize_text(text)
-        
-        # Split into sentences
-        sentences = self._split_into_sentences(normalized_text)
+        # Normalized text and sentences are prepared once per document
+        document = PreparedDocument.ensure(text)
+        store = FindingsStore(document.text)
         
         # Analyze patterns
-        self._analyze_patterns(normalized_text, sentences, result)
+        self._analyze_patterns(document, store)
         
-        # Categorize findings
-        self._categorize_findings(result)
+        # Row views for callers, with categories as row indices
+        result.findings_store = store
+        result.findings = store.views()
+        result.categories = store.category_index()
         
         return result
 
-    def _normalize_text(self, text: str) -> str:
-        """Normalize text for analysis"""
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        
-        # Remove special characters (keeping punctuation)
-        text = re.sub(r'[^\w\s.!?,;:-]', '', text)
+    def _analyze_patterns(self, document: PreparedDocument, store: FindingsStore):
+        """Analyze text patterns and add findings to the store"""
+        # Analyze legal references, dates and deadlines, and monetary values
+        self._find_pattern_matches(document, store)
         
-        return text
+        # Analyze specific clauses
+        self._analyze_clauses(document, store)
 
-    def _split_into_sentences(self, text: str) -> List[str]:
-        """Split text into sentences"""
-        sentences = self.sentence_end_pattern.split(text)
-        return [s.strip() for s in sentences if s.strip()]
+    def _add_finding(
+        self,
+        store: FindingsStore,
+        document: PreparedDocument,
+        keyword: str,
+        risk_level: str,
+        category: str,
+        start: int,
+        end: int,
+        sentence_span: Optional[Tuple[int, int]] = None
+    ):
+        """Add a finding located in the original text from a normalized span.
 
-    def _analyze_patterns(self, text: str, sentences: List[str], result: AnalysisResult):
-        """Analyze text patterns and update result"""
-        # Analyze legal references
-        self._find_legal_references(text, result)
-        
-        # Analyze dates and deadlines
-        self._find_dates_and_deadlines(text, result)
-        
-        # Analyze monetary values
-        self._find_monetary_values(text, result)
-        
-        # Analyze specific clauses
-        self._analyze_clauses(sentences, result)
-
-    def _find_legal_references(self, text: str, result: AnalysisResult):
-        """Find legal references in text"""
-        legal_patterns = [
-            r'section\s+\d+',
-            r'article\s+\d+',
-            r'act\s+of\s+\d{4}',
-            r'regulation\s+\d+'
-        ]
-        
-        for pattern in legal_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                result.findings.append(Finding(
-                    keyword=match.group(),
-                    risk_level="MEDIUM",
-                    category="Legal References",
-                    occurrences=1,
-                    context=self._get_context(text, match.start(), match.end())
-                ))
-
-    def _find_dates_and_deadlines(self, text: str, result: AnalysisResult):
-        """Find dates and deadlines in text"""
-        date_patterns = [
-            r'\d{1,2}/\d{1,2}/\d{4}',
-            r'\d{1,2}-\d{1,2}-\d{4}',
-            r'\d{1,2}\s+(?:january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{4}'
-        ]
-        
-        for pattern in date_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                result.findings.append(Finding(
-                    keyword=match.group(),
-                    risk_level="LOW",
-                    category="Dates and Deadlines",
-                    occurrences=1,
-                    context=self._get_context(text, match.start(), match.end())
-                ))
-
-    def _find_monetary_values(self, text: str, result: AnalysisResult):
-        """Find monetary values in text"""
-        money_patterns = [
-            r'€\s*\d+(?:,\d{3})*(?:\.\d{2})?',
-            r'eur\s*\d+(?:,\d{3})*(?:\.\d{2})?',
-            r'\d+(?:,\d{3})*(?:\.\d{2})?\s*euros?'
-        ]
-        
-        for pattern in money_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                result.findings.append(Finding(
-                    keyword=match.group(),
-                    risk_level="MEDIUM",
-                    category="Monetary Values",
-                    occurrences=1,
-                    context=self._get_context(text, match.start(), match.end())
-                ))
-
-    def _analyze_clauses(self, sentences: List[str], result: AnalysisResult):
-        """Analyze specific clauses in the document"""
-        clause_indicators = [
-            "hereby agrees",
-            "shall be",
-            "must",
-            "will not",
-            "is prohibited",
-            "is required"
-        ]
-        
-        for i, sentence in enumerate(sentences):
-            for indicator in clause_indicators:
-                if indicator in sentence:
-                    result.findings.append(Finding(
-                        keyword=indicator,
-                        risk_level="LOW",
-                        category="Contractual Clauses",
-                        occurrences=1,
-                        context=sentence
-                    ))
-
-    def _get_context(self, text: str, start: int, end: int) -> str:
-     """Get better formatted context around a matched pattern"""
-    # Expand the context window
-     context_start = max(0, start - self.context_window)
-     context_end = min(len(text), end + self.context_window)
-    
-    # Get the context
-     context = text[context_start:context_end]
-    
-    # Clean and format the context
-     context = context.replace('\n', ' ')  # Replace newlines with spaces
-     context = ' '.join(context.split())   # Remove extra whitespace
-    
-    # Add ellipsis if context is truncated
-     if context_start > 0:
-        context = f"...{context}"
-     if context_end < len(text):
-        context = f"{context}..."
-    
-    # Format the matched text to make it stand out
-     matched_text = text[start:end]
-     formatted_context = context.replace(
-        matched_text,
-        f"**{matched_text}**"  # Bold the matched text
-    )
-    
-     return formatted_context
-
-
-    def _categorize_findings(self, result: AnalysisResult):
-        """Categorize findings by type"""
-        categories: Dict[str, List[Finding]] = {}
-        
-        for finding in result.findings:
-            if finding.category not in categories:
-                categories[finding.category] = []
-            categories[finding.category].append(finding)
-        
-        result.categories = categories
\ No newline at end of file
+        Only offsets are recorded; the context is rendered from the original
+        text if and when the finding is displayed. Given a sentence span,
+        the context is that sentence rather than a window around the match.
+        """
+        original_start, original_end = document.original_span(start, end)
+        context_start = context_end = None
+        if sentence_span is not None:
+            context_start, context_end = document.original_span(*sentence_span)
+        store.add(
+            keyword,
+            category,
+            risk_level,
+            start=original_start,
+            end=original_end,
+            page_number=document.page_number(original_start),
+            context_start=context_start,
+            context_end=context_end
+        )
+
+    def _find_pattern_matches(self, document: PreparedDocument, store: FindingsStore):
+        """Find legal references, dates and monetary values in a single scan"""
+        text = document.normalized
+        for match in self.pattern_matcher.finditer(text):
+            category, risk_level = self.pattern_groups[match.lastgroup]
+            self._add_finding(
+                store,
+                document,
+                match.group(),
+                risk_level,
+                category,
+                match.start(),
+                match.end()
+            )
+
+    def _analyze_clauses(self, document: PreparedDocument, store: FindingsStore):
+        """Report each clause indicator once per sentence it appears in.
+
+        Indicator hits come from the document-wide keyword scan; each is
+        mapped to its sentence by binary search over the sentence offsets.
+        """
+        indicator_order = {indicator: rank for rank, indicator in enumerate(CLAUSE_INDICATORS)}
+        first_hits: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        for start, end, keyword in document.keyword_hits(self.keyword_matcher):
+            rank = indicator_order.get(keyword)
+            if rank is None:
+                continue
+            sentence = document.sentence_at(start)
+            if sentence is not None and end <= document.sentence_ends[sentence]:
+                first_hits.setdefault((sentence, rank), (start, end))
+
+        for sentence, rank in sorted(first_hits):
+            start, end = first_hits[(sentence, rank)]
+            self._add_finding(
+                store,
+                document,
+                CLAUSE_INDICATORS[rank],
+                "LOW",
+                "Contractual Clauses",
+                start,
+                end,
+                document.sentence_span(sentence)
+            )
@@ -0,0 +1,98 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+from concurrent.futures import Future
+import copy
+import hashlib
+import json
+import threading
+from core.enums import ProcessingStatus
+from utils.cache import LRUCache, DiskCache
+
+
+class AnalysisResultCache:
+    """Content-addressed cache for analysis responses.
+
+    Keys combine the SHA-256 of the uploaded bytes with the analyzer and
+    rules versions, so a rules change never serves stale results. Identical
+    uploads that arrive while the first one is still being analyzed wait
+    for that computation instead of starting their own. Only completed
+    analyses are stored, so a failure is recomputed on the next upload.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        analyzer_version: str = "",
+        disk_cache: Optional[DiskCache] = None
+    ):
+        self.analyzer_version = analyzer_version
+        self.memory = LRUCache(max_entries)
+        self.disk = disk_cache
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def make_key(self, content_hash: str, variant: str = "") -> str:
+        """Key for an upload; ``variant`` separates results of differently configured analyses"""
+        return hashlib.sha256(
+            f"{content_hash}:{self.analyzer_version}:{variant}".encode()
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            data = self.disk.get(key)
+            if data is not None:
+                value = json.loads(data)
+                self.memory.set(key, value)
+        return copy.deepcopy(value) if value is not None else None
+
+    def set(self, key: str, value: Dict):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, json.dumps(value, default=str).encode())
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[..., Dict],
+        *args: Any
+    ) -> Tuple[Dict, bool]:
+        """Return (value, cache_hit), computing the value at most once per key at a time.
+
+        Requests waiting on the computation share its outcome either way;
+        the value is only cached when its status is COMPLETED, and
+        ``cache_hit`` is only true for values that were cached.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not owner:
+            # Another request is computing this key; share its outcome
+            value, cached = future.result()
+            return copy.deepcopy(value), cached
+
+        try:
+            value = compute(*args)
+            cached = value.get("status") == ProcessingStatus.COMPLETED.value
+            if cached:
+                self.set(key, value)
+            future.set_result((value, cached))
+            return copy.deepcopy(value), False
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
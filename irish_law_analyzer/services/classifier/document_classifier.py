@@ -1,114 +1,197 @@
-from typing import Dict, Tuple, List
+from typing import Dict, Iterable, Optional, Tuple, List, Sequence, Union
 from core.document_types import DocumentType
+from core.keyword_matcher import KeywordAutomaton
+from core.prepared_document import PreparedDocument, normalize_text
+from core.rule_pack import RulePack, default_rule_pack, parse_enum
+from .ngram_classifier import HashedNgramClassifier
 import re
 from collections import Counter
 
+WHITESPACE_PATTERN = re.compile(r'\s')
+
+
+class PrefixClassification:
+    """Keyword scores of a growing document prefix.
+
+    Keyword hits are fed in order of their end offset in the normalized
+    text. Each time they pass the next prefix boundary (``prefix_chars``,
+    then doubling), the scores so far are checked, and the classification
+    is decided once the top score leads the runner-up by at least
+    ``margin_threshold``; later hits are ignored. Undecided, it reflects
+    the whole document.
+    """
+
+    def __init__(self, classifier: "DocumentClassifier"):
+        self.classifier = classifier
+        self.counts: Dict[str, int] = {}
+        self.boundary = classifier.prefix_chars or None
+        self.decided = False
+
+    def feed(self, hits: Iterable[Tuple[int, str]]) -> bool:
+        """Count (end, keyword) hits; returns whether the classification is decided"""
+        if self.decided:
+            return True
+        keywords = self.classifier.scored_keywords
+        threshold = self.classifier.margin_threshold
+        for end, keyword in hits:
+            if keyword not in keywords:
+                continue
+            while self.boundary is not None and end > self.boundary:
+                if self.classifier._margin(self.scores()) >= threshold:
+                    self.decided = True
+                    return True
+                self.boundary *= 2
+            self.counts[keyword] = self.counts.get(keyword, 0) + 1
+        return False
+
+    def scores(self) -> Dict[DocumentType, float]:
+        return self.classifier._scores_from_counts(self.counts)
+
+    def result(self) -> Tuple[DocumentType, Dict[DocumentType, float]]:
+        """The document type and the normalized confidence of every scored type"""
+        return self.classifier._label_and_confidences(self.scores())
+
+
 class DocumentClassifier:
-    def __init__(self):
-        self._initialize_patterns()
+    def __init__(
+        self,
+        prefix_chars: int = 10000,
+        margin_threshold: float = 15.0,
+        rule_pack: Optional[RulePack] = None
+    ):
+        # Classification stops at the first prefix (prefix_chars normalized
+        # characters, doubling) whose top score leads by margin_threshold;
+        # 0 prefix_chars always scores the whole document
+        self.prefix_chars = prefix_chars
+        self.margin_threshold = margin_threshold
+        self._initialize_patterns(rule_pack or default_rule_pack())
+        self.scored_keywords = frozenset(self.vocabulary())
+        self.keyword_matcher = KeywordAutomaton(self.vocabulary())
+        self.ngram_classifier = HashedNgramClassifier.from_keyword_table(self.patterns)
 
-    def _initialize_patterns(self):
+    def _initialize_patterns(self, rule_pack: RulePack):
         self.patterns = {
-            DocumentType.EMPLOYMENT_CONTRACT: {
-                'keywords': [
-                    'employment contract',
-                    'contract of employment',
-                    'terms and conditions',
-                    'job description',
-                    'position',
-                    'salary',
-                    'working hours'
-                ],
-                'weight': 1.5
-            },
-            DocumentType.TERMINATION_LETTER: {
-                'keywords': [
-                    'termination',
-                    'dismissal',
-                    'notice period',
-                    'redundancy',
-                    'end of employment'
-                ],
-                'weight': 1.3
-            },
-            DocumentType.DISCIPLINARY_NOTICE: {
-                'keywords': [
-                    'disciplinary',
-                    'warning',
-                    'misconduct',
-                    'improvement required',
-                    'performance issues'
-                ],
-                'weight': 1.2
-            },
-            DocumentType.WORKPLACE_POLICY: {
-                'keywords': [
-                    'policy',
-                    'procedure',
-                    'guidelines',
-                    'handbook',
-                    'rules'
-                ],
-                'weight': 1.0
+            parse_enum(DocumentType, name, f"classifier.{name}"): {
+                'keywords': list(entry['keywords']),
+                'weight': float(entry['weight'])
             }
+            for name, entry in rule_pack.classifier.items()
         }
 
-    def classify_document(self, text: str) -> DocumentType:
-        text = self._preprocess_text(text)
-        
-        # Calculate scores for each document type
-        scores = self._calculate_scores(text)
-        
-        # Get the document type with highest score
-        if scores:
-            max_score_type = max(scores.items(), key=lambda x: x[1])[0]
-            return max_score_type
-        
-        return DocumentType.UNKNOWN
+    def vocabulary(self) -> List[str]:
+        """Every keyword the classifier scores"""
+        return [
+            keyword
+            for pattern_info in self.patterns.values()
+            for keyword in pattern_info['keywords']
+        ]
 
-    def _preprocess_text(self, text: str) -> str:
-        """Preprocess text for classification"""
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        
-        # Remove special characters
-        text = re.sub(r'[^\w\s]', '', text)
-        
-        return text
+    def classify_document(self, text: Union[str, PreparedDocument]) -> DocumentType:
+        return self.classify_with_confidence(text)[0]
 
-    def _calculate_scores(self, text: str) -> Dict[DocumentType, float]:
+    def get_confidence_scores(self, text: Union[str, PreparedDocument]) -> Dict[DocumentType, float]:
+        """Get confidence scores for all document types"""
+        return self.classify_with_confidence(text)[1]
+
+    def classify_with_confidence(
+        self,
+        text: Union[str, PreparedDocument]
+    ) -> Tuple[DocumentType, Dict[DocumentType, float]]:
+        """Classify a document and return its normalized confidences from the same scores.
+
+        Raw text is normalized and scanned one growing prefix at a time,
+        stopping as soon as the classification is decided. A prepared
+        document reuses its (memoized) keyword hits; objects offering only
+        keyword counts, such as a streaming tally, are scored as a whole.
+        """
+        if isinstance(text, str):
+            classification = self.start_classification()
+            self._feed_prefixes(classification, text)
+            return classification.result()
+        if isinstance(text, PreparedDocument):
+            classification = self.start_classification()
+            classification.feed(
+                (end, keyword) for _, end, keyword in text.keyword_hits(self.keyword_matcher)
+            )
+            return classification.result()
+        return self._label_and_confidences(self._calculate_scores(text))
+
+    def start_classification(self) -> PrefixClassification:
+        """Classification fed keyword hits incrementally, e.g. while streaming"""
+        return PrefixClassification(self)
+
+    def _feed_prefixes(self, classification: PrefixClassification, text: str):
+        """Normalize and scan ``text`` in doubling pieces until the classification is decided.
+
+        Pieces end at whitespace, so their normalized forms joined with
+        single spaces are exactly the normalized text.
+        """
+        matcher = self.keyword_matcher
+        step = self.prefix_chars or len(text)
+        state = 0
+        position = 0
+        raw_position = 0
+        while raw_position < len(text) and not classification.decided:
+            split = WHITESPACE_PATTERN.search(text, raw_position + step)
+            raw_end = split.start() if split else len(text)
+            piece = normalize_text(text[raw_position:raw_end])
+            if piece:
+                if position:
+                    piece = ' ' + piece
+                hits, state = matcher.scan(piece, state)
+                classification.feed(
+                    (position + end, matcher.keywords[keyword_id]) for _, end, keyword_id in hits
+                )
+                position += len(piece)
+            raw_position = raw_end
+            step *= 2
+
+    def classify_batch(self, texts: Sequence[Union[str, PreparedDocument]]) -> List[DocumentType]:
+        """Classify many documents in one vectorized pass of the hashed n-gram model"""
+        return self.ngram_classifier.classify_batch(texts)
+
+    def _calculate_scores(self, text: Union[str, PreparedDocument]) -> Dict[DocumentType, float]:
+        """Scores over the whole document"""
+        # Count every keyword occurrence in one pass over the prepared text
+        counts = PreparedDocument.ensure(text).keyword_counts(self.keyword_matcher)
+        return self._scores_from_counts(counts)
+
+    def _scores_from_counts(self, counts: Dict[str, int]) -> Dict[DocumentType, float]:
         scores = {}
         
         for doc_type, pattern_info in self.patterns.items():
             score = 0
             weight = pattern_info['weight']
             
-            # Count keyword occurrences
             for keyword in pattern_info['keywords']:
-                count = text.count(keyword)
-                score += count * weight
+                score += counts.get(keyword, 0) * weight
             
             if score > 0:
                 scores[doc_type] = score
         
         return scores
 
-    def get_confidence_scores(self, text: str) -> Dict[DocumentType, float]:
-        """Get confidence scores for all document types"""
-        scores = self._calculate_scores(text)
+    @staticmethod
+    def _margin(scores: Dict[DocumentType, float]) -> float:
+        """Lead of the top score over the runner-up (0 when nothing scores)"""
+        ranked = sorted(scores.values(), reverse=True) + [0.0, 0.0]
+        return ranked[0] - ranked[1]
+
+    def _label_and_confidences(
+        self,
+        scores: Dict[DocumentType, float]
+    ) -> Tuple[DocumentType, Dict[DocumentType, float]]:
+        # Get the document type with highest score
+        if not scores:
+            return DocumentType.UNKNOWN, {DocumentType.UNKNOWN: 1.0}
+        label = max(scores.items(), key=lambda x: x[1])[0]
         
         # Normalize scores
         total_score = sum(scores.values())
-        if total_score > 0:
-            return {
-                doc_type: score / total_score
-                for doc_type, score in scores.items()
-            }
-        
-        return {DocumentType.UNKNOWN: 1.0}
+        return label, {
+            doc_type: score / total_score
+            for doc_type, score in scores.items()
+        }
 
     def analyze_structure(self, text: str) -> Dict:
         """Analyze document structure"""
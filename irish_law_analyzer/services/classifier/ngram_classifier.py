@@ -0,0 +1,297 @@
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from core.document_types import DocumentType
+from core.prepared_document import PreparedDocument, normalize_text
+
+# Joins the documents of a batch; normalization never leaves it in the text
+_SEPARATOR = '\x00'
+# Characters that end a word, as a lookup table over code points below 128;
+# normalized text only has single spaces
+_WORD_BREAKS = np.zeros(128, dtype=bool)
+_WORD_BREAKS[[ord(c) for c in ' \x00.!?,;:']] = True
+
+# Polynomial string hashing modulo 2**64 (numpy integer arithmetic wraps)
+_BASE = 0x100000001B3
+_BASE_INVERSE = pow(_BASE, -1, 2 ** 64)
+_COMBINE = np.uint64(0x9E3779B97F4A7C15)
+_MIX = np.uint64(0xBF58476D1CE4E5B9)
+
+
+def _seed(kind: str, n: int) -> np.uint64:
+    """Per n-gram family seed, so word and character n-grams hash apart"""
+    offset = 0 if kind == "word" else 0x100
+    return np.uint64(((offset + n) * 0x9E3779B97F4A7C15) % 2 ** 64)
+
+
+_power_tables = (np.ones(1, dtype=np.uint64), np.ones(1, dtype=np.uint64))
+
+
+def _powers(length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Powers of the hash base and of its inverse, at least ``length + 1`` of each"""
+    global _power_tables
+    powers, inverse_powers = _power_tables
+    if len(powers) <= length:
+        size = max(length + 1, 2 * len(powers))
+        powers = np.ones(size, dtype=np.uint64)
+        inverse_powers = np.ones(size, dtype=np.uint64)
+        powers[1:] = np.cumprod(np.full(size - 1, _BASE, dtype=np.uint64))
+        inverse_powers[1:] = np.cumprod(np.full(size - 1, _BASE_INVERSE, dtype=np.uint64))
+        _power_tables = (powers, inverse_powers)
+    return powers, inverse_powers
+
+
+class _EncodedBatch:
+    """A batch of normalized documents as one array of character codes.
+
+    Prefix hashes let the hash of any substring be computed in constant
+    time, so word and character n-grams of every document are hashed with
+    a handful of whole-array operations.
+    """
+
+    def __init__(self, documents: Sequence[str]):
+        text = _SEPARATOR.join(documents) + _SEPARATOR
+        characters = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        length = len(characters)
+        self.length = length
+
+        self.characters = characters
+        self.separator_positions = np.flatnonzero(characters == 0)
+        self._separators: Optional[np.ndarray] = None
+
+        in_word = np.ones(length + 2, dtype=bool)
+        in_word[[0, -1]] = False
+        in_word[1:-1] ^= _WORD_BREAKS[np.minimum(characters, 127)]
+        edges = np.diff(in_word.view(np.int8))
+        self.word_starts = np.flatnonzero(edges == 1)
+        word_ends = np.flatnonzero(edges == -1)
+
+        powers, self.inverse_powers = _powers(length)
+        self.prefix = np.zeros(length + 1, dtype=np.uint64)
+        np.cumsum(characters * powers[:length], out=self.prefix[1:])
+        self.word_hashes = self.substring_hashes(self.word_starts, word_ends)
+        # A position's document is the number of separators before it
+        self.word_documents = np.searchsorted(self.separator_positions, self.word_starts)
+
+    @property
+    def separators(self) -> np.ndarray:
+        """Number of separators before each position, built when first needed"""
+        if self._separators is None:
+            self._separators = np.zeros(self.length + 1, dtype=np.int64)
+            np.cumsum(self.characters == 0, out=self._separators[1:])
+        return self._separators
+
+    def substring_hashes(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        return (self.prefix[ends] - self.prefix[starts]) * self.inverse_powers[starts]
+
+    def word_ngrams(self, order: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(document, hash) of every run of ``order`` words within one document"""
+        count = len(self.word_hashes) - order + 1
+        if count <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint64)
+        hashes = self.word_hashes[:count].copy()
+        for shift in range(1, order):
+            hashes = hashes * _COMBINE + self.word_hashes[shift:shift + count]
+        documents = self.word_documents[:count]
+        valid = documents == self.word_documents[order - 1:order - 1 + count]
+        return documents[valid], hashes[valid]
+
+    def char_ngrams(self, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(document, hash) of every ``n`` characters within one document"""
+        count = max(self.length - n + 1, 0)
+        hashes = (self.prefix[n:n + count] - self.prefix[:count]) * self.inverse_powers[:count]
+        documents = self.separators[:count]
+        valid = self.separators[n:n + count] == documents
+        return documents[valid], hashes[valid]
+
+
+class HashedNgramClassifier:
+    """Linear document classifier over hashed word and character n-grams.
+
+    Word and character n-grams are hashed into two separate spaces of
+    ``2 ** hash_bits`` features each, and a document's score for each
+    label is the sum of that label's weights over the document's feature
+    occurrences. ``scores`` hashes a whole batch at once and sums the
+    weights with one weighted ``bincount`` per label, so there is no
+    per-document or per-keyword Python loop. Occurrences of features
+    without weight for any label are dropped before the sums, and
+    character n-grams are not extracted at all while none of them has a
+    weight. Weights are float32 to halve the size of the table.
+
+    Weights start at zero; ``from_keyword_table`` seeds them from the
+    keyword classifier's table and ``partial_fit`` refines them from
+    labelled documents.
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[DocumentType],
+        hash_bits: int = 18,
+        word_ngram_range: Tuple[int, int] = (1, 3),
+        char_ngram_range: Optional[Tuple[int, int]] = (3, 5),
+        block_chars: int = 1 << 20
+    ):
+        if not 1 <= hash_bits <= 32:
+            raise ValueError("hash_bits must be between 1 and 32")
+        self.labels: List[DocumentType] = list(labels)
+        self.label_ids: Dict[DocumentType, int] = {label: i for i, label in enumerate(self.labels)}
+        self.hash_bits = hash_bits
+        self.word_ngram_range = word_ngram_range
+        self.char_ngram_range = char_ngram_range
+        # Documents are hashed in blocks of about this many characters to bound memory
+        self.block_chars = block_chars
+        # Word n-gram features first, then character n-gram features
+        self.weights = np.zeros((len(self.labels), 2 << hash_bits), dtype=np.float32)
+        # Cached by _weighted_features; reset to None whenever weights change
+        self._weighted: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_keyword_table(
+        cls,
+        patterns: Dict[DocumentType, Dict],
+        **kwargs
+    ) -> "HashedNgramClassifier":
+        """Seed the weights from a ``DocumentClassifier.patterns`` table.
+
+        Each keyword becomes the word n-gram of its own length, weighted
+        with its document type's weight, so a seeded model scores whole-word
+        keyword occurrences the way the keyword classifier does.
+        """
+        classifier = cls(list(patterns), **kwargs)
+        low, high = classifier.word_ngram_range
+        for label, pattern_info in patterns.items():
+            for keyword in pattern_info['keywords']:
+                batch = _EncodedBatch([normalize_text(keyword)])
+                order = len(batch.word_hashes)
+                if not low <= order <= high:
+                    raise ValueError(
+                        f"Keyword '{keyword}' has {order} words, outside the word n-gram range"
+                    )
+                _, hashes = batch.word_ngrams(order)
+                feature = classifier._features(hashes, _seed("word", order), 0)
+                classifier.weights[classifier.label_ids[label], feature] += pattern_info['weight']
+        classifier._weighted = None
+        return classifier
+
+    def _features(self, hashes: np.ndarray, seed: np.uint64, space: int) -> np.ndarray:
+        """Feature index of each hash in feature space 0 (words) or 1 (characters)"""
+        mixed = hashes ^ seed
+        mixed = (mixed ^ (mixed >> np.uint64(31))) * _MIX
+        mixed ^= mixed >> np.uint64(29)
+        features = (mixed >> np.uint64(64 - self.hash_bits)).astype(np.intp)
+        if space:
+            features += space << self.hash_bits
+        return features
+
+    def _normalize(self, texts: Sequence[Union[str, PreparedDocument]]) -> List[str]:
+        return [
+            text.normalized if isinstance(text, PreparedDocument) else normalize_text(text)
+            for text in texts
+        ]
+
+    def _blocks(self, documents: Sequence[str]) -> Iterator[Tuple[int, List[str]]]:
+        """Split a batch into (first index, documents) blocks of bounded size"""
+        block: List[str] = []
+        first = 0
+        size = 0
+        for index, document in enumerate(documents):
+            if block and size + len(document) > self.block_chars:
+                yield first, block
+                block, first, size = [], index, 0
+            block.append(document)
+            size += len(document) + 1
+        if block:
+            yield first, block
+
+    def _occurrences(self, documents: List[str], chars: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """(document, feature) of every n-gram occurrence in a block"""
+        batch = _EncodedBatch(documents)
+        rows = []
+        columns = []
+        low, high = self.word_ngram_range
+        for order in range(low, high + 1):
+            document_ids, hashes = batch.word_ngrams(order)
+            rows.append(document_ids)
+            columns.append(self._features(hashes, _seed("word", order), 0))
+        if chars and self.char_ngram_range is not None:
+            low, high = self.char_ngram_range
+            for n in range(low, high + 1):
+                document_ids, hashes = batch.char_ngrams(n)
+                rows.append(document_ids)
+                columns.append(self._features(hashes, _seed("char", n), 1))
+        return np.concatenate(rows), np.concatenate(columns)
+
+    def _weighted_features(self) -> np.ndarray:
+        """Whether each feature has a weight for any label"""
+        if self._weighted is None:
+            self._weighted = (self.weights != 0).any(axis=0)
+        return self._weighted
+
+    def _block_scores(
+        self,
+        rows: np.ndarray,
+        columns: np.ndarray,
+        count: int,
+        weighted: np.ndarray
+    ) -> np.ndarray:
+        # Most features carry no weight; dropping their occurrences first
+        # only looks them up in a table small enough to stay in cache
+        keep = weighted[columns]
+        rows = rows[keep]
+        columns = columns[keep]
+        scores = np.empty((count, len(self.labels)))
+        for label_id in range(len(self.labels)):
+            scores[:, label_id] = np.bincount(
+                rows, weights=self.weights[label_id, columns], minlength=count
+            )
+        return scores
+
+    def scores(self, texts: Sequence[Union[str, PreparedDocument]]) -> np.ndarray:
+        """Score matrix of shape (documents, labels) for a batch"""
+        documents = self._normalize(texts)
+        weighted = self._weighted_features()
+        chars = bool(weighted[1 << self.hash_bits:].any())
+        scores = np.zeros((len(documents), len(self.labels)))
+        for first, block in self._blocks(documents):
+            rows, columns = self._occurrences(block, chars)
+            scores[first:first + len(block)] = self._block_scores(rows, columns, len(block), weighted)
+        return scores
+
+    def _predict(self, scores: np.ndarray) -> np.ndarray:
+        """Best label id per document, or -1 where no label scores above zero"""
+        if not self.labels:
+            return np.full(len(scores), -1)
+        best = scores.argmax(axis=1)
+        best[scores.max(axis=1) <= 0] = -1
+        return best
+
+    def classify_batch(self, texts: Sequence[Union[str, PreparedDocument]]) -> List[DocumentType]:
+        """Classify every document of a batch; UNKNOWN when nothing scores"""
+        return [
+            self.labels[label_id] if label_id >= 0 else DocumentType.UNKNOWN
+            for label_id in self._predict(self.scores(texts))
+        ]
+
+    def partial_fit(
+        self,
+        texts: Sequence[Union[str, PreparedDocument]],
+        labels: Sequence[DocumentType],
+        learning_rate: float = 0.1
+    ) -> "HashedNgramClassifier":
+        """One perceptron pass: move weights toward the labels of misclassified documents"""
+        if len(texts) != len(labels):
+            raise ValueError("texts and labels must have the same length")
+        unknown = [label for label in labels if label not in self.label_ids]
+        if unknown:
+            raise ValueError(f"Unknown label: {unknown[0]}")
+
+        for first, block in self._blocks(self._normalize(texts)):
+            rows, columns = self._occurrences(block)
+            scores = self._block_scores(rows, columns, len(block), self._weighted_features())
+            predicted = self._predict(scores)
+            expected = np.array([self.label_ids[label] for label in labels[first:first + len(block)]])
+            wrong = (predicted != expected)[rows]
+            np.add.at(self.weights, (expected[rows[wrong]], columns[wrong]), learning_rate)
+            penalized = wrong & (predicted[rows] >= 0)
+            np.add.at(self.weights, (predicted[rows[penalized]], columns[penalized]), -learning_rate)
+            self._weighted = None
+        return self
@@ -0,0 +1,105 @@
+from typing import Any, Callable, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import asyncio
+import threading
+import uuid
+from core.models import Job
+from core.enums import ProcessingStatus
+
+
+class JobQueueFullError(Exception):
+    """Raised when the number of unfinished jobs reaches the configured limit"""
+    pass
+
+
+class JobManager:
+    """Runs document pipelines on a bounded worker pool and tracks their status"""
+
+    def __init__(self, max_workers: int, max_pending: int = 100, result_ttl: int = 3600):
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="analysis-worker"
+            )
+        return self._executor
+
+    def submit(self, filename: str, func: Callable[..., Dict], *args: Any) -> Job:
+        """Queue a pipeline call and return its job record immediately"""
+        with self._lock:
+            self._prune_expired()
+            if self.active_count() >= self.max_pending:
+                raise JobQueueFullError(
+                    f"Too many pending jobs (limit {self.max_pending})"
+                )
+            job = Job(job_id=uuid.uuid4().hex, filename=filename)
+            self.jobs[job.job_id] = job
+
+        self.executor.submit(self._run_job, job, func, *args)
+        return job
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a pipeline call on the worker pool without registering a job"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def active_count(self) -> int:
+        return sum(
+            1 for job in self.jobs.values()
+            if job.status in (ProcessingStatus.PENDING, ProcessingStatus.PROCESSING)
+        )
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def _run_job(self, job: Job, func: Callable[..., Dict], *args: Any):
+        job.status = ProcessingStatus.PROCESSING
+        job.started_at = datetime.now()
+        try:
+            job.result = func(*args)
+            job.status = ProcessingStatus.COMPLETED
+        except Exception as e:
+            # HTTPException carries a status code and detail; keep both
+            job.error = str(getattr(e, "detail", e))
+            job.error_code = getattr(e, "status_code", 500)
+            job.status = ProcessingStatus.FAILED
+        finally:
+            job.completed_at = datetime.now()
+
+    def _prune_expired(self):
+        """Drop finished jobs whose results are older than the TTL"""
+        cutoff = datetime.now() - timedelta(seconds=self.result_ttl)
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.completed_at is not None and job.completed_at < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    def to_dict(self, job: Job) -> Dict:
+        return {
+            "job_id": job.job_id,
+            "filename": job.filename,
+            "status": job.status.value,
+            "result": job.result,
+            "error": job.error,
+            "error_code": job.error_code,
+            "created_at": job.created_at.isoformat(),
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "completed_at": job.completed_at.isoformat() if job.completed_at else None
+        }
@@ -0,0 +1,96 @@
+from typing import Dict, Optional, Type
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import threading
+import time
+from .base import BaseDocumentProcessor
+from .ocr import get_ocr_budget, set_ocr_budget
+from core.models import ProcessingResult
+
+# Processor instances owned by the current worker process, one per class
+_worker_processors: Dict[Type[BaseDocumentProcessor], BaseDocumentProcessor] = {}
+
+
+def _process_in_worker(
+    processor_cls: Type[BaseDocumentProcessor],
+    file_bytes: bytes,
+    filename: str
+) -> ProcessingResult:
+    """Entry point executed inside a pool worker"""
+    processor = _worker_processors.get(processor_cls)
+    if processor is None:
+        processor = processor_cls()
+        _worker_processors[processor_cls] = processor
+    return processor.process_document(file_bytes, filename)
+
+
+class ProcessPoolBackend:
+    """Runs BaseDocumentProcessor.process_document in a pool of worker processes.
+
+    Text extraction and OCR are CPU-bound, so running them in separate
+    processes lets several uploads use several cores. Processors are built
+    once per worker from the application settings; configuration changed on
+    a processor instance in the parent process is not forwarded.
+    """
+
+    def __init__(self, max_workers: int, max_concurrency: Optional[int] = None):
+        self.max_workers = max(0, max_workers)
+        self.max_concurrency = max_concurrency or max(1, self.max_workers * 2)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # Workers share this process's OCR budget instead of each
+                # OCRing with every CPU
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=set_ocr_budget,
+                    initargs=(get_ocr_budget(),)
+                )
+            return self._pool
+
+    def _reset_pool(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+
+    def process_document(
+        self,
+        processor: BaseDocumentProcessor,
+        file_bytes: bytes,
+        filename: str
+    ) -> ProcessingResult:
+        """Process a document in a worker process, blocking until it finishes"""
+        if not self.enabled:
+            return processor.process_document(file_bytes, filename)
+
+        start_time = time.time()
+        with self._slots:
+            try:
+                future = self._get_pool().submit(
+                    _process_in_worker, type(processor), file_bytes, filename
+                )
+                return future.result()
+            except BrokenProcessPool as e:
+                # A worker died (e.g. OOM-killed); start a fresh pool next time
+                self._reset_pool()
+                return ProcessingResult(
+                    success=False,
+                    message="Processing worker crashed",
+                    error=str(e) or "BROKEN_PROCESS_POOL",
+                    processing_time=time.time() - start_time
+                )
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
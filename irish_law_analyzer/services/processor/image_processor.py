@@ -1,8 +1,9 @@
 from typing import List
-import pytesseract
 from PIL import Image
 import io
 from .base import BaseDocumentProcessor
+from .ocr import OCREngine, TESSERACT_CONFIG, get_default_ocr_engine
+from .ocr_cache import get_default_ocr_cache
 from core.models import ProcessingResult, DocumentMetadata
 from app.config import settings
 
@@ -17,6 +18,8 @@ class ImageProcessor(BaseDocumentProcessor):
         }
         self.ocr_language = settings.OCR_LANGUAGE
         self.min_quality = 300  # Minimum DPI
+        self.ocr_engine = get_default_ocr_engine()
+        self.ocr_cache = get_default_ocr_cache()
 
     def extract_text(self, file_bytes: bytes, filename: str) -> ProcessingResult:
         try:
@@ -26,12 +29,23 @@ class ImageProcessor(BaseDocumentProcessor):
             # Preprocess image if needed
             processed_image = self._preprocess_image(image)
             
-            # Extract text using OCR
-            text = pytesseract.image_to_string(
-                processed_image,
-                lang=self.ocr_language,
-                config='--psm 1 --oem 3'
-            )
+            # Extract text using OCR, reusing results for previously seen images
+            cache_key = None
+            text = None
+            if self.ocr_cache is not None:
+                cache_key = self.ocr_cache.make_key(
+                    processed_image, self.min_quality, self.ocr_language, TESSERACT_CONFIG
+                )
+                text = self.ocr_cache.get(cache_key)
+
+            if text is None:
+                text = self.ocr_engine.image_to_string(
+                    processed_image,
+                    self.ocr_language,
+                    TESSERACT_CONFIG
+                )
+                if cache_key is not None:
+                    self.ocr_cache.set(cache_key, text)
 
             # Get metadata
             metadata = self._get_image_metadata(image, filename)
@@ -40,7 +54,8 @@ class ImageProcessor(BaseDocumentProcessor):
                 success=True,
                 message="Image processed successfully",
                 extracted_text=text,
-                metadata=metadata
+                metadata=metadata,
+                pages=[text]
             )
 
         except Exception as e:
@@ -79,6 +94,10 @@ class ImageProcessor(BaseDocumentProcessor):
         """Set OCR language"""
         self.ocr_language = language
 
+    def set_ocr_engine(self, engine: OCREngine):
+        """Set the engine used for OCR"""
+        self.ocr_engine = engine
+
     def set_minimum_quality(self, dpi: int):
         """Set minimum DPI requirement"""
         self.min_quality = dpi
\ No newline at end of file
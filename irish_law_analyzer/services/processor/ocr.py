@@ -0,0 +1,314 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Deque, Iterable, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+import multiprocessing
+import os
+import queue
+import re
+import threading
+import pytesseract
+from PIL import Image
+from app.config import settings
+
+TESSERACT_CONFIG = '--psm 1 --oem 3'
+
+
+def ocr_image(image: Image.Image, lang: str, config: str = TESSERACT_CONFIG) -> str:
+    """OCR a single page image with pytesseract"""
+    return pytesseract.image_to_string(image, lang=lang, config=config)
+
+
+def _parse_tesseract_config(config: str) -> Tuple[int, int]:
+    """Extract (psm, oem) from a tesseract command-line config string"""
+    psm = re.search(r'--psm\s+(\d+)', config)
+    oem = re.search(r'--oem\s+(\d+)', config)
+    return (int(psm.group(1)) if psm else 3, int(oem.group(1)) if oem else 3)
+
+
+class OCREngine(ABC):
+    """Recognises page images; shared by the PDF and image processors"""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max(1, max_workers)
+
+    @abstractmethod
+    def image_to_string(self, image: Image.Image, lang: str, config: str = TESSERACT_CONFIG) -> str:
+        pass
+
+    @abstractmethod
+    def _submit(self, image: Image.Image, lang: str, config: str) -> Future:
+        pass
+
+    def ocr_pages(
+        self,
+        pages: Iterable[Tuple[int, Image.Image]],
+        lang: str,
+        config: str = TESSERACT_CONFIG,
+        max_in_flight: Optional[int] = None
+    ) -> List[Tuple[int, str]]:
+        """OCR (page_number, image) pairs and return (page_number, text) sorted by page.
+
+        ``pages`` is consumed lazily; at most ``max_in_flight`` images are
+        submitted and not yet recognised at any time, so a streaming source
+        never has to hold the whole document in memory. Each page also holds
+        a slot of the OCR budget while it is recognised, which caps the pages
+        OCRed at once across every processor worker.
+        """
+        budget = get_ocr_budget()
+        if self.max_workers == 1:
+            results = []
+            for page_number, image in pages:
+                with budget:
+                    results.append((page_number, self.image_to_string(image, lang, config)))
+        else:
+            limit = max(1, max_in_flight or self.max_workers * 2)
+            in_flight: Deque[Tuple[int, Future]] = deque()
+            results = []
+            for page_number, image in pages:
+                if len(in_flight) >= limit:
+                    done_page, future = in_flight.popleft()
+                    results.append((done_page, future.result()))
+                # Wait for a slot of the budget shared by every processor worker
+                budget.acquire()
+                try:
+                    future = self._submit(image, lang, config)
+                except BaseException:
+                    budget.release()
+                    raise
+                future.add_done_callback(lambda _: budget.release())
+                in_flight.append((page_number, future))
+            results.extend((page_number, future.result()) for page_number, future in in_flight)
+
+        return sorted(results, key=lambda item: item[0])
+
+    def shutdown(self, wait: bool = True):
+        pass
+
+
+class PageOCRPool(OCREngine):
+    """Spreads page OCR over threads and reassembles pages in order.
+
+    pytesseract runs each page in its own tesseract process and Pillow
+    releases the GIL while encoding the page for it, so threads are enough
+    to OCR pages in parallel. Only the running tesseract processes use
+    CPUs, and the OCR budget caps them across every processor worker, so
+    no OCR processes are forked up front. With a single worker, pages are
+    OCRed in the calling thread.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        ocr_func: Callable[[Image.Image, str, str], str] = ocr_image
+    ):
+        super().__init__(max_workers)
+        self.ocr_func = ocr_func
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="ocr-page"
+                )
+            return self._pool
+
+    def image_to_string(self, image: Image.Image, lang: str, config: str = TESSERACT_CONFIG) -> str:
+        return self.ocr_func(image, lang, config)
+
+    def _submit(self, image: Image.Image, lang: str, config: str) -> Future:
+        return self._get_pool().submit(self.ocr_func, image, lang, config)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
+
+
+def _tesseract_worker(conn):
+    """Serve OCR requests over a pipe until told to stop.
+
+    One Tesseract API per (lang, psm, oem) is kept loaded for the life of
+    the worker, so the traineddata model is read once instead of once per
+    page.
+    """
+    import tesserocr
+
+    apis = {}
+    try:
+        while True:
+            try:
+                request = conn.recv()
+            except EOFError:
+                break
+            if request is None:
+                break
+
+            mode, size, data, lang, config = request
+            try:
+                image = Image.frombytes(mode, size, data)
+                psm, oem = _parse_tesseract_config(config)
+                api = apis.get((lang, psm, oem))
+                if api is None:
+                    api = tesserocr.PyTessBaseAPI(lang=lang, psm=psm, oem=oem)
+                    apis[(lang, psm, oem)] = api
+                api.SetImage(image)
+                conn.send((True, api.GetUTF8Text()))
+            except Exception as e:
+                conn.send((False, str(e)))
+    finally:
+        for api in apis.values():
+            api.End()
+        conn.close()
+
+
+class _TesseractWorker:
+    def __init__(self):
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_tesseract_worker, args=(child_conn,), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+
+
+class PersistentTesseractEngine(OCREngine):
+    """OCR engine backed by long-lived worker processes fed over pipes.
+
+    Page pixels are sent raw, so there is no temporary file or image
+    encoding per page, and each worker keeps its language model loaded
+    through tesserocr, which this engine requires.
+    """
+
+    def __init__(self, max_workers: int):
+        try:
+            import tesserocr  # noqa: F401
+        except ImportError:
+            raise RuntimeError(
+                "The persistent OCR engine requires tesserocr "
+                "(pip install irish_law_analyzer[tesserocr])"
+            ) from None
+        super().__init__(max_workers)
+        self._lock = threading.Lock()
+        self._idle: "queue.Queue[_TesseractWorker]" = queue.Queue()
+        self._workers: List[_TesseractWorker] = []
+        self._dispatcher: Optional[ThreadPoolExecutor] = None
+
+    def _ensure_started(self):
+        with self._lock:
+            if not self._workers:
+                for _ in range(self.max_workers):
+                    worker = _TesseractWorker()
+                    self._workers.append(worker)
+                    self._idle.put(worker)
+                self._dispatcher = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="ocr-dispatch"
+                )
+
+    def _replace(self, worker: _TesseractWorker) -> _TesseractWorker:
+        worker.stop()
+        replacement = _TesseractWorker()
+        with self._lock:
+            self._workers[self._workers.index(worker)] = replacement
+        return replacement
+
+    def image_to_string(self, image: Image.Image, lang: str, config: str = TESSERACT_CONFIG) -> str:
+        self._ensure_started()
+        worker = self._idle.get()
+        try:
+            worker.conn.send((image.mode, image.size, image.tobytes(), lang, config))
+            ok, payload = worker.conn.recv()
+        except (EOFError, OSError):
+            worker = self._replace(worker)
+            raise RuntimeError("OCR worker exited unexpectedly")
+        finally:
+            self._idle.put(worker)
+
+        if not ok:
+            raise RuntimeError(payload)
+        return payload
+
+    def _submit(self, image: Image.Image, lang: str, config: str) -> Future:
+        self._ensure_started()
+        return self._dispatcher.submit(self.image_to_string, image, lang, config)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._dispatcher is not None:
+                self._dispatcher.shutdown(wait=wait)
+                self._dispatcher = None
+            for worker in self._workers:
+                worker.stop()
+            self._workers = []
+            self._idle = queue.Queue()
+
+
+def create_ocr_engine(name: str, max_workers: int) -> OCREngine:
+    """Build an OCR engine by name ('pytesseract' or 'persistent', which needs tesserocr)"""
+    if name == "persistent":
+        return PersistentTesseractEngine(max_workers)
+    if name == "pytesseract":
+        return PageOCRPool(max_workers)
+    raise ValueError(f"Unknown OCR engine: {name}")
+
+
+_default_engine: Optional[OCREngine] = None
+
+
+def ocr_worker_count() -> int:
+    """Pages OCRed at once across the whole application: OCR_WORKERS, or one per CPU"""
+    if settings.OCR_WORKERS > 0:
+        return settings.OCR_WORKERS
+    return os.cpu_count() or 1
+
+
+def persistent_worker_count() -> int:
+    """Persistent tesseract processes per engine.
+
+    Each processor pool worker builds its own engine and every persistent
+    worker keeps a model loaded, so the budget is divided between them.
+    """
+    return max(1, ocr_worker_count() // max(1, settings.PROCESSOR_POOL_SIZE))
+
+
+_ocr_budget = None
+
+
+def get_ocr_budget():
+    """Semaphore bounding the pages OCRed at once by this process and its processor workers"""
+    global _ocr_budget
+    if _ocr_budget is None:
+        _ocr_budget = multiprocessing.BoundedSemaphore(ocr_worker_count())
+    return _ocr_budget
+
+
+def set_ocr_budget(budget):
+    """Share a parent's OCR budget; run as the processor pool initializer"""
+    global _ocr_budget
+    _ocr_budget = budget
+
+
+def get_default_ocr_engine() -> OCREngine:
+    """Return this process's OCR engine built from settings.
+
+    A lone document may fan out over the whole budget; concurrent documents
+    share it, so the CPUs are never oversubscribed.
+    """
+    global _default_engine
+    if _default_engine is None:
+        workers = persistent_worker_count() if settings.OCR_ENGINE == "persistent" else ocr_worker_count()
+        _default_engine = create_ocr_engine(settings.OCR_ENGINE, workers)
+    return _default_engine
@@ -0,0 +1,45 @@
+from typing import Optional
+import hashlib
+from PIL import Image
+from utils.cache import DiskCache
+from app.config import settings
+
+
+class PageOCRCache:
+    """Disk-backed OCR results keyed by the rendered page and OCR settings.
+
+    Identical pages (standard appendices, boilerplate cover letters) render
+    to identical pixels, so their text can be reused across documents and
+    across worker processes sharing the cache directory.
+    """
+
+    def __init__(self, disk_cache: DiskCache):
+        self.disk_cache = disk_cache
+
+    @staticmethod
+    def make_key(image: Image.Image, dpi: Optional[int], lang: str, config: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{image.mode}:{image.size}:{dpi}:{lang}:{config}".encode())
+        digest.update(image.tobytes())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        data = self.disk_cache.get(key)
+        return data.decode("utf-8") if data is not None else None
+
+    def set(self, key: str, text: str):
+        self.disk_cache.set(key, text.encode("utf-8"))
+
+
+_default_cache: Optional[PageOCRCache] = None
+
+
+def get_default_ocr_cache() -> Optional[PageOCRCache]:
+    """Return this process's cache built from settings, or None when disabled"""
+    global _default_cache
+    if _default_cache is None and settings.OCR_CACHE_DIR:
+        _default_cache = PageOCRCache(DiskCache(
+            settings.BASE_DIR / settings.OCR_CACHE_DIR,
+            max_bytes=settings.OCR_CACHE_MAX_BYTES
+        ))
+    return _default_cache
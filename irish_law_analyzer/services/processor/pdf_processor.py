@@ -1,11 +1,15 @@
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 import pdfplumber
-import pytesseract
-from pdf2image import convert_from_bytes
+from pdf2image import convert_from_path
 from PIL import Image
 import io
+import queue
+import tempfile
+import threading
 import time
 from .base import BaseDocumentProcessor
+from .ocr import OCREngine, TESSERACT_CONFIG, get_default_ocr_engine
+from .ocr_cache import get_default_ocr_cache
 from core.models import ProcessingResult, DocumentMetadata
 from app.config import settings
 
@@ -16,24 +20,43 @@ class PDFProcessor(BaseDocumentProcessor):
         self.dpi = settings.OCR_DPI           # Değişti
         self.ocr_language = settings.OCR_LANGUAGE  # Değişti
         self.enable_ocr = True
+        # Pages with fewer text-layer characters than this are treated as scanned
+        self.min_page_text_chars = settings.OCR_MIN_PAGE_CHARS
+        self.ocr_engine = get_default_ocr_engine()
+        self.render_batch_size = settings.OCR_RENDER_BATCH
+        self.max_pages_in_memory = settings.OCR_MAX_PAGES_IN_MEMORY
+        self.ocr_cache = get_default_ocr_cache()
 
     def extract_text(self, file_bytes: bytes, filename: str) -> ProcessingResult:
         try:
-            # First try direct text extraction
-            text = self._extract_text_direct(file_bytes)
+            # Single pass over the text layer yields every page at once
+            pages, page_count = self._extract_pages_direct(file_bytes)
             
-            # If no text found and OCR is enabled, try OCR
-            if not text.strip() and self.enable_ocr:
-                text = self._extract_text_ocr(file_bytes)
+            # OCR only the pages that have no usable text layer
+            ocr_pages = []
+            if self.enable_ocr:
+                ocr_pages = [
+                    page_number
+                    for page_number, page_text in enumerate(pages, start=1)
+                    if len(page_text.strip()) < self.min_page_text_chars
+                ]
+                for page_number, page_text in self._extract_text_ocr(file_bytes, ocr_pages):
+                    # Keep a short text layer if OCR finds nothing better
+                    if page_text.strip():
+                        pages[page_number - 1] = page_text
+
+            text = "\n".join(pages)
 
             # Get metadata
-            metadata = self._get_pdf_metadata(file_bytes, filename)
+            metadata = self._get_pdf_metadata(file_bytes, filename, page_count, text)
+            metadata.ocr_pages = ocr_pages
 
             return ProcessingResult(
                 success=True,
                 message="PDF processed successfully",
                 extracted_text=text,
-                metadata=metadata
+                metadata=metadata,
+                pages=pages
             )
 
         except Exception as e:
@@ -43,36 +66,153 @@ class PDFProcessor(BaseDocumentProcessor):
                 error=str(e)
             )
 
-    def _extract_text_direct(self, file_bytes: bytes) -> str:
-        text = ""
+    def _extract_pages_direct(self, file_bytes: bytes) -> Tuple[List[str], int]:
+        """Open the PDF once and return the text of each page and the page count"""
         with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+            pages = []
             for page in pdf.pages:
-                text += page.extract_text() or ""
-        return text
-
-    def _extract_text_ocr(self, file_bytes: bytes) -> str:
-        text = ""
-        images = convert_from_bytes(file_bytes, dpi=self.dpi)
-        
-        for image in images:
-            text += pytesseract.image_to_string(
-                image, 
-                lang=self.ocr_language,
-                config='--psm 1 --oem 3'
-            )
-        
-        return text
+                pages.append(page.extract_text() or "")
+                # Release parsed layout objects as we go (pdfplumber >= 0.10)
+                close_page = getattr(page, "close", None)
+                if close_page is not None:
+                    close_page()
+            return pages, len(pages)
 
-    def _get_pdf_metadata(self, file_bytes: bytes, filename: str) -> DocumentMetadata:
-        with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-            metadata = DocumentMetadata(
-                file_name=filename,
-                file_size=len(file_bytes),
-                mime_type='application/pdf',
-                page_count=len(pdf.pages),
-                word_count=len(self._extract_text_direct(file_bytes).split())
-            )
-        return metadata
+    def _extract_text_ocr(
+        self,
+        file_bytes: bytes,
+        page_numbers: List[int]
+    ) -> List[Tuple[int, str]]:
+        """OCR the given 1-based pages in parallel while they are still being rendered"""
+        if not page_numbers:
+            return []
+
+        # Pages held at once: one render window, one queued page, the rest in OCR
+        batch_size = max(1, self.render_batch_size)
+        max_in_flight = max(1, self.max_pages_in_memory - batch_size - 1)
+
+        cached_pages: List[Tuple[int, str]] = []
+        cache_keys: Dict[int, str] = {}
+
+        def uncached_pages():
+            # Skip OCR for pages whose rendered pixels we have seen before
+            for page_number, image in self._render_pages(file_bytes, page_numbers):
+                if self.ocr_cache is not None:
+                    key = self.ocr_cache.make_key(
+                        image, self.dpi, self.ocr_language, TESSERACT_CONFIG
+                    )
+                    cached_text = self.ocr_cache.get(key)
+                    if cached_text is not None:
+                        cached_pages.append((page_number, cached_text))
+                        continue
+                    cache_keys[page_number] = key
+                yield page_number, image
+
+        recognised_pages = self.ocr_engine.ocr_pages(
+            uncached_pages(),
+            self.ocr_language,
+            TESSERACT_CONFIG,
+            max_in_flight=max_in_flight
+        )
+
+        if self.ocr_cache is not None:
+            for page_number, page_text in recognised_pages:
+                self.ocr_cache.set(cache_keys[page_number], page_text)
+
+        return sorted(cached_pages + recognised_pages, key=lambda item: item[0])
+
+    def _render_pages(
+        self,
+        file_bytes: bytes,
+        page_numbers: List[int]
+    ) -> Iterator[Tuple[int, Image.Image]]:
+        """Rasterize pages window by window on a background thread.
+
+        Rendering the next window overlaps with OCR of the pages already
+        yielded; the one-slot queue keeps the producer from running ahead.
+        """
+        pages_queue: queue.Queue = queue.Queue(maxsize=1)
+        stop = threading.Event()
+        done = object()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    pages_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                # pdf2image writes its input to disk on every call; do it once
+                with tempfile.NamedTemporaryFile(suffix=".pdf") as pdf_file:
+                    pdf_file.write(file_bytes)
+                    pdf_file.flush()
+                    for first_page, last_page in self._render_windows(page_numbers):
+                        images = convert_from_path(
+                            pdf_file.name,
+                            dpi=self.dpi,
+                            first_page=first_page,
+                            last_page=last_page
+                        )
+                        for page_number, image in enumerate(images, start=first_page):
+                            if not put((page_number, image)):
+                                return
+                        del images
+                put(done)
+            except Exception as e:
+                put(e)
+
+        producer = threading.Thread(target=produce, name="pdf-page-renderer", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = pages_queue.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            producer.join()
+
+    def _render_windows(self, page_numbers: List[int]) -> List[Tuple[int, int]]:
+        """Split page runs into (first_page, last_page) windows of at most render_batch_size"""
+        batch_size = max(1, self.render_batch_size)
+        windows = []
+        for first_page, last_page in self._group_page_ranges(page_numbers):
+            for start in range(first_page, last_page + 1, batch_size):
+                windows.append((start, min(start + batch_size - 1, last_page)))
+        return windows
+
+    @staticmethod
+    def _group_page_ranges(page_numbers: List[int]) -> List[Tuple[int, int]]:
+        """Collapse sorted page numbers into (first_page, last_page) runs"""
+        ranges = []
+        for page_number in sorted(page_numbers):
+            if ranges and ranges[-1][1] == page_number - 1:
+                ranges[-1] = (ranges[-1][0], page_number)
+            else:
+                ranges.append((page_number, page_number))
+        return ranges
+
+    def _get_pdf_metadata(
+        self,
+        file_bytes: bytes,
+        filename: str,
+        page_count: int,
+        text: str
+    ) -> DocumentMetadata:
+        return DocumentMetadata(
+            file_name=filename,
+            file_size=len(file_bytes),
+            mime_type='application/pdf',
+            page_count=page_count,
+            word_count=len(text.split())
+        )
 
     def set_ocr_language(self, language: str):
         """Set OCR language (e.g., 'eng', 'fra', etc.)"""
@@ -82,6 +222,20 @@ class PDFProcessor(BaseDocumentProcessor):
         """Set DPI for image conversion"""
         self.dpi = dpi
 
+    def set_min_page_text_chars(self, min_chars: int):
+        """Set the text-layer length below which a page is OCRed"""
+        self.min_page_text_chars = min_chars
+
+    def set_ocr_engine(self, engine: OCREngine):
+        """Set the engine used for page OCR"""
+        self.ocr_engine = engine
+
+    def set_max_pages_in_memory(self, max_pages: int, render_batch_size: Optional[int] = None):
+        """Cap the number of rendered pages held in memory during OCR"""
+        self.max_pages_in_memory = max_pages
+        if render_batch_size is not None:
+            self.render_batch_size = render_batch_size
+
     def enable_ocr_processing(self, enable: bool):
         """Enable or disable OCR processing"""
         self.enable_ocr = enable
\ No newline at end of file
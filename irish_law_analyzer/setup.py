@@ -4,6 +4,8 @@ setup(
     name="irish_law_analyzer",
     version="0.1.0",
     packages=find_packages(),
+    # Rule packs are data files read at startup
+    package_data={"irish_law_analyzer": ["rules/*.json", "rules/*.yaml"]},
     install_requires=[
         "fastapi",
         "uvicorn",
@@ -14,6 +16,13 @@ setup(
         "pdfplumber",
         "Pillow",
         "filetype",  # python-magic yerine filetype
-        "pydantic-settings"
+        "pydantic-settings",
+        "numpy"
     ],
+    extras_require={
+        # Lets persistent OCR workers keep the Tesseract model loaded
+        "tesserocr": ["tesserocr"],
+        # Rule packs written in YAML instead of JSON
+        "yaml": ["PyYAML"]
+    },
 )
\ No newline at end of file
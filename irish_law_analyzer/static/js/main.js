@@ -53,7 +53,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 ${data.analysis.findings.map(finding => `
                     <li class="finding-item ${finding.risk_level.toLowerCase()}">
                         <strong>${finding.category}:</strong> ${finding.keyword}
-                        <div class="context">${finding.context}</div>
+                        ${finding.context ? `<div class="context">${finding.context}</div>` : ''}
                         <div class="occurrences">Occurrences: ${finding.occurrences}</div>
                     </li>
                 `).join('')}
@@ -3,7 +3,8 @@ from services.analyzer.document_analyzer import DocumentAnalyzer
 from services.analyzer.text_analyzer import TextAnalyzer
 from core.models import AnalysisResult
 from core.document_types import DocumentType
-from core.enums import RiskLevel
+from core.enums import RiskLevel, AnalysisType
+from core.prepared_document import PreparedDocument
 
 class TestDocumentAnalyzer:
     def setup_method(self):
@@ -26,6 +27,211 @@ class TestDocumentAnalyzer:
         assert result.overall_risk_level == RiskLevel.LOW
         assert len(result.findings) == 0
 
+    def test_stages_share_one_keyword_scan(self, monkeypatch):
+        scans = []
+        original = PreparedDocument.keyword_hits
+
+        def counting_hits(document, matcher):
+            if id(matcher) not in document._keyword_hits:
+                scans.append(matcher)
+            return original(document, matcher)
+
+        monkeypatch.setattr(PreparedDocument, "keyword_hits", counting_hits)
+        self.analyzer.analyze("The employee shall give notice of termination.", "test_doc")
+        assert scans == [self.analyzer.keyword_matcher]
+
+    def test_findings_aggregated_by_keyword(self):
+        text = "The employee must attend. The employer must pay. Notice must be given."
+        result = self.analyzer.analyze(text, "test_doc")
+
+        must = [f for f in result.findings if f.keyword == "must"]
+        assert len(must) == 1
+        assert must[0].occurrences == 3
+        assert [text[start:start + 4] for start in must[0].offsets] == ["must"] * 3
+        assert list(result.categories["Contractual Clauses"]) == [
+            i for i, f in enumerate(result.findings) if f.category == "Contractual Clauses"
+        ]
+
+    def test_aggregation_keeps_risk_score(self):
+        text = "The employee must attend. The employer must pay. Notice must be given."
+        aggregated = self.analyzer.analyze(text, "test_doc")
+        self.analyzer.config.aggregate_findings = False
+        separate = self.analyzer.analyze(text, "test_doc")
+
+        assert len(separate.findings) > len(aggregated.findings)
+        assert separate.risk_score == aggregated.risk_score
+
+    def test_max_findings_keeps_highest_risk(self):
+        self.analyzer.config.max_findings = 1
+        result = self.analyzer.analyze("Staff must comply with section 4.", "test_doc")
+
+        assert [f.keyword for f in result.findings] == ["section 4"]
+        assert result.metadata["total_findings"] == 2
+
+    def test_basic_analysis_skips_findings_and_compliance(self, sample_text):
+        result = self.analyzer.analyze(sample_text, "test_doc", analysis_type=AnalysisType.BASIC)
+
+        assert result.document_type == DocumentType.EMPLOYMENT_CONTRACT
+        assert result.findings == []
+        assert result.recommendations == []
+        assert "requirements_validation" in result.metadata
+        assert "compliance_results" not in result.metadata
+        assert result.metadata["analysis_type"] == "BASIC"
+
+    def test_detailed_analysis_adds_findings(self, sample_text):
+        result = self.analyzer.analyze(sample_text, "test_doc", analysis_type="DETAILED")
+
+        assert len(result.findings) > 0
+        assert result.recommendations == []
+        assert "compliance_results" not in result.metadata
+
+    def test_comprehensive_is_the_default(self, sample_text):
+        result = self.analyzer.analyze(sample_text, "test_doc")
+
+        assert result.metadata["analysis_type"] == "COMPREHENSIVE"
+        assert "compliance_results" in result.metadata
+        assert len(result.recommendations) > 0
+
+    def test_detailed_analysis_flag_raises_basic_default(self):
+        self.analyzer.config.analysis_type = AnalysisType.BASIC
+        self.analyzer.config.detailed_analysis = True
+
+        assert self.analyzer.resolve_analysis_type(None) == AnalysisType.DETAILED
+        assert self.analyzer.resolve_analysis_type("BASIC") == AnalysisType.BASIC
+        self.analyzer.config.analysis_type = AnalysisType.COMPREHENSIVE
+        assert self.analyzer.resolve_analysis_type(None) == AnalysisType.COMPREHENSIVE
+
+class TestStreamingAnalysis:
+    PAGES = [
+        "Terms of employment. The employee shall be paid eur 2,500.00 monthly under section 12.",
+        "Notice given on 15 march 2024 must be acknowledged! Overtime is prohibited; leave is required.",
+        "The employer will not deduct more than 300 euros. The employee must sign. Termination notice period applies."
+    ] * 20
+
+    def setup_method(self):
+        self.analyzer = DocumentAnalyzer()
+        self.analyzer.config.max_findings = 10000
+
+    @staticmethod
+    def finding_keys(findings):
+        return sorted(
+            (f.keyword, f.category, f.occurrences, f.start, f.end, f.page_number)
+            for f in findings
+        )
+
+    def test_chunked_stream_matches_whole_document_analysis(self):
+        expected = self.analyzer.analyze("\n".join(self.PAGES), "doc", pages=self.PAGES)
+
+        stream = self.analyzer.start_stream("doc", overlap=64)
+        for page in self.PAGES:
+            stream.feed_page(page[:7])
+            for i in range(7, len(page), 13):
+                stream.feed(page[i:i + 13])
+        result = stream.finish()
+
+        assert result.document_type == expected.document_type
+        assert result.risk_score == expected.risk_score
+        assert result.metadata["word_count"] == expected.metadata["word_count"]
+        assert self.finding_keys(result.findings) == self.finding_keys(expected.findings)
+        assert result.findings[0].get_context()
+
+    def test_findings_emitted_incrementally(self):
+        self.analyzer.config.aggregate_findings = False
+        expected = self.analyzer.analyze("\n".join(self.PAGES), "doc", pages=self.PAGES)
+
+        stream = self.analyzer.start_stream("doc", overlap=64)
+        emitted = []
+        for page in self.PAGES:
+            emitted.extend(stream.feed_page(page))
+            # Only a bounded window of text is kept between pages
+            assert len(stream.buffer) <= len(page) + 64 + stream.context_window + 1
+        emitted.extend(stream.flush())
+
+        assert len(emitted) > 0
+        assert [f.start for f in emitted] == sorted(f.start for f in emitted)
+        assert self.finding_keys(emitted) == self.finding_keys(expected.findings)
+        assert all(f.context for f in emitted)
+
+    def test_analyze_pages_reports_findings_as_pages_arrive(self):
+        self.analyzer.config.aggregate_findings = False
+        batches = []
+
+        def pages():
+            for number, page in enumerate(self.PAGES):
+                if number == len(self.PAGES) - 1:
+                    # Earlier pages' findings arrived before the last page was read
+                    assert batches
+                yield page
+
+        result = self.analyzer.analyze_pages(pages(), "doc", on_findings=batches.append)
+
+        emitted = [finding for batch in batches for finding in batch]
+        assert len(batches) > 1
+        assert self.finding_keys(emitted) == self.finding_keys(result.findings)
+
+    def test_streamed_context_matches_whole_document_context(self):
+        self.analyzer.config.aggregate_findings = False
+        pages = [
+            "Terms  of EMPLOYMENT... The employee   SHALL be paid (*) \u20ac 2,500.00 monthly",
+            "under Section 12.  Notice given on 15 March 2024 must be acknowledged!",
+            "Overtime is PROHIBITED; leave is required.   The employer will not deduct more than 300 euros"
+        ] * 5
+        expected = self.analyzer.analyze("\n".join(pages), "doc", pages=pages)
+
+        stream = self.analyzer.start_stream("doc", overlap=64)
+        emitted = []
+        for page in pages:
+            emitted.extend(stream.feed_page(page[:5]))
+            for i in range(5, len(page), 11):
+                emitted.extend(stream.feed(page[i:i + 11]))
+        emitted.extend(stream.flush())
+
+        window = stream.context_window
+        assert sorted((f.start, f.keyword, f.context) for f in emitted) == sorted(
+            (f.start, f.keyword, f.get_context(window)) for f in expected.findings
+        )
+
+    def test_match_across_chunk_boundary(self):
+        stream = self.analyzer.start_stream("doc", overlap=64)
+        found = stream.feed_page("Payment is due under sect") + stream.feed("ion 12 of the contract.")
+        found += stream.flush()
+
+        assert [(f.keyword, f.start, f.end) for f in found] == [("section 12", 21, 31)]
+
+class TestPreparedDocument:
+    def test_normalizes_and_indexes_once(self):
+        document = PreparedDocument("  The Employer   SHALL pay*.  Notice: 4 weeks!  ")
+
+        assert document.normalized == "the employer shall pay. notice: 4 weeks!"
+        assert document.word_count == 7
+        assert document.sentences() == ["the employer shall pay", "notice: 4 weeks"]
+
+    def test_offsets_map_back_to_original_text(self):
+        text = "Clause 1\n\nThe  Employer * pays \u20ac300."
+        document = PreparedDocument(text, pages=["Clause 1", "", "The  Employer * pays \u20ac300."])
+
+        assert document.normalized == "clause 1 the employer pays \u20ac300."
+        assert len(document.offsets) == len(document.normalized)
+        start = document.normalized.index("employer pays")
+        original_start, original_end = document.original_span(start, start + len("employer pays"))
+        assert text[original_start:original_end] == "Employer * pays"
+        assert document.page_number(original_start) == 3
+
+    def test_sentence_lookup_by_offset(self):
+        document = PreparedDocument("First one. Second one!  Third")
+
+        assert list(document.sentence_starts) == [0, 11, 23]
+        assert document.sentence_at(0) == 0
+        assert document.sentence_at(12) == 1
+        assert document.sentence_at(9) is None  # the full stop
+        assert document.sentence_at(23) == 2
+        assert document.sentence(1) == "second one"
+
+    def test_ensure_reuses_prepared_document(self):
+        document = PreparedDocument("text")
+        assert PreparedDocument.ensure(document) is document
+        assert PreparedDocument.ensure("text").normalized == "text"
+
 class TestTextAnalyzer:
     def setup_method(self):
         self.analyzer = TextAnalyzer()
@@ -44,4 +250,73 @@ class TestTextAnalyzer:
         
         salary_findings = [f for f in result.findings if f.keyword.lower() == "salary"]
         if salary_findings:
-            assert "test sentence with salary information" in salary_findings[0].context
\ No newline at end of file
+            assert "test sentence with salary information" in salary_findings[0].get_context()
+
+    def test_pattern_findings_single_scan(self):
+        text = "Under section 12 the notice given on 15 march 2024 pays 300 euros."
+        result = self.analyzer.analyze(text, DocumentType.EMPLOYMENT_CONTRACT)
+
+        found = {(f.category, f.keyword) for f in result.findings}
+        assert ("Legal References", "section 12") in found
+        assert ("Dates and Deadlines", "15 march 2024") in found
+        assert ("Monetary Values", "300 euros") in found
+
+    def test_findings_carry_original_spans_and_pages(self):
+        pages = ["Terms of employment.", "The Employee SHALL be paid \u20ac 2,500.00 monthly."]
+        text = "\n".join(pages)
+        result = self.analyzer.analyze(PreparedDocument(text, pages), DocumentType.EMPLOYMENT_CONTRACT)
+
+        money = [f for f in result.findings if f.category == "Monetary Values"]
+        assert [f.keyword for f in money] == ["\u20ac 2,500.00"]
+        assert text[money[0].start:money[0].end] == "\u20ac 2,500.00"
+        assert money[0].page_number == 2
+
+        clause = next(f for f in result.findings if f.keyword == "shall be")
+        assert text[clause.start:clause.end] == "SHALL be"
+        assert clause.page_number == 2
+
+    def test_context_is_rendered_on_demand(self):
+        text = "Intro.   The employee SHALL be given section 12   notice in writing."
+        result = self.analyzer.analyze(text, DocumentType.EMPLOYMENT_CONTRACT)
+
+        assert all(f.context == "" for f in result.findings)
+        reference = next(f for f in result.findings if f.category == "Legal References")
+        assert reference.get_context(window=10) == "...be given **section 12** notice..."
+        clause = next(f for f in result.findings if f.keyword == "shall be")
+        assert clause.get_context() == "The employee SHALL be given section 12 notice in writing"
+        assert clause.to_dict(include_context=False)["context"] == ""
+
+    def test_clause_hits_match_per_sentence_search(self):
+        from services.analyzer.text_analyzer import CLAUSE_INDICATORS
+        text = (
+            "The employee hereby agrees that pay shall be monthly. It must not and will not "
+            "be late! Smoking is prohibited; leave is required. Nothing here? It shall be, must."
+        ) * 50
+        document = PreparedDocument(text)
+        result = self.analyzer.analyze(document, DocumentType.EMPLOYMENT_CONTRACT)
+
+        expected = [
+            (indicator, sentence)
+            for sentence in document.sentences()
+            for indicator in CLAUSE_INDICATORS
+            if indicator in sentence
+        ]
+        found = [
+            (f.keyword, " ".join(f.get_context().lower().split()))
+            for f in result.findings if f.category == "Contractual Clauses"
+        ]
+        assert found == expected
+
+    def test_compiled_patterns_match_individual_patterns(self):
+        import re
+        from services.analyzer.text_analyzer import FINDING_PATTERNS
+        text = "article 4, regulation 9, act of 1997, 01/02/2024, 3-4-2024, eur 1,000.00"
+
+        expected = sorted(
+            match.group()
+            for _, _, patterns in FINDING_PATTERNS
+            for pattern in patterns
+            for match in re.finditer(pattern, text)
+        )
+        combined = sorted(match.group() for match in self.analyzer.pattern_matcher.finditer(text))
+        assert combined == expected
@@ -0,0 +1,122 @@
+import pytest
+import threading
+import time
+from utils.cache import LRUCache, DiskCache
+from services.cache.result_cache import AnalysisResultCache
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert cache.get("c") == 3
+
+class TestDiskCache:
+    def test_round_trip(self, tmp_path):
+        cache = DiskCache(tmp_path, max_bytes=1024)
+        cache.set("ab12", b"payload")
+        assert cache.get("ab12") == b"payload"
+        assert cache.get("cd34") is None
+
+    def test_evicts_oldest_entries_over_limit(self, tmp_path):
+        cache = DiskCache(tmp_path, max_bytes=10)
+        cache.set("aa01", b"12345")
+        time.sleep(0.01)
+        cache.set("bb02", b"12345")
+        time.sleep(0.01)
+        cache.set("cc03", b"12345")
+
+        assert cache.get("aa01") is None
+        assert cache.get("cc03") == b"12345"
+
+class TestAnalysisResultCache:
+    def test_key_depends_on_version(self):
+        old = AnalysisResultCache(analyzer_version="1.0.0:1")
+        new = AnalysisResultCache(analyzer_version="1.0.0:2")
+        assert old.make_key("abc") != new.make_key("abc")
+
+    def test_get_or_compute_caches(self):
+        cache = AnalysisResultCache()
+        key = cache.make_key("abc")
+
+        value, hit = cache.get_or_compute(key, lambda: {"status": "COMPLETED", "risk_score": 1.0})
+        assert not hit
+        value, hit = cache.get_or_compute(key, lambda: {"status": "COMPLETED", "risk_score": 9.0})
+        assert hit
+        assert value == {"status": "COMPLETED", "risk_score": 1.0}
+
+    def test_concurrent_requests_share_one_computation(self):
+        cache = AnalysisResultCache()
+        key = cache.make_key("abc")
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"status": "COMPLETED", "risk_score": 2.0}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_compute(key, compute)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert all(value == {"status": "COMPLETED", "risk_score": 2.0} for value, _ in results)
+
+    def test_failures_are_not_cached(self):
+        cache = AnalysisResultCache()
+        key = cache.make_key("abc")
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            cache.get_or_compute(key, fail)
+        value, hit = cache.get_or_compute(key, lambda: {"ok": True})
+        assert not hit
+
+    def test_shared_failure_is_not_a_cache_hit(self):
+        cache = AnalysisResultCache()
+        key = cache.make_key("abc")
+
+        def compute():
+            time.sleep(0.2)
+            return {"status": "FAILED"}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_compute(key, compute)))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [hit for _, hit in results] == [False, False, False]
+
+    def test_failed_analyses_are_not_cached(self):
+        cache = AnalysisResultCache()
+        key = cache.make_key("abc")
+
+        value, hit = cache.get_or_compute(key, lambda: {"status": "FAILED"})
+        assert not hit and value == {"status": "FAILED"}
+        value, hit = cache.get_or_compute(key, lambda: {"status": "COMPLETED"})
+        assert not hit and value == {"status": "COMPLETED"}
+
+    def test_disk_persistence(self, tmp_path):
+        key = AnalysisResultCache().make_key("abc")
+        AnalysisResultCache(disk_cache=DiskCache(tmp_path)).set(key, {"risk_score": 3.0})
+
+        cache = AnalysisResultCache(disk_cache=DiskCache(tmp_path))
+        assert cache.get(key) == {"risk_score": 3.0}
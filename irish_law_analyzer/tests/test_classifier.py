@@ -0,0 +1,57 @@
+import pytest
+from core.document_types import DocumentType
+from core.prepared_document import PreparedDocument
+from services.analyzer.document_analyzer import DocumentAnalyzer
+from services.classifier.document_classifier import DocumentClassifier
+
+# Opens as a termination letter, but employment terms dominate the whole text
+OPENING = "Notice of termination and dismissal, with your notice period set out below. " * 40
+BODY = "Your salary, position and working hours follow the employment contract. " * 400
+DOCUMENT = OPENING + BODY
+
+class TestPrefixClassification:
+    def test_decided_on_opening_prefix(self):
+        classifier = DocumentClassifier(prefix_chars=1000, margin_threshold=15.0)
+
+        assert classifier.classify_document(DOCUMENT) == DocumentType.TERMINATION_LETTER
+
+    def test_whole_document_without_prefix(self):
+        classifier = DocumentClassifier(prefix_chars=0)
+
+        assert classifier.classify_document(DOCUMENT) == DocumentType.EMPLOYMENT_CONTRACT
+
+    def test_undecided_prefix_falls_back_to_whole_document(self):
+        classifier = DocumentClassifier(prefix_chars=1000, margin_threshold=1e9)
+
+        assert classifier.classify_document(DOCUMENT) == DocumentType.EMPLOYMENT_CONTRACT
+
+    def test_label_and_confidences_from_one_computation(self):
+        classifier = DocumentClassifier(prefix_chars=1000)
+        label, confidences = classifier.classify_with_confidence(DOCUMENT)
+
+        assert label == max(confidences, key=confidences.get)
+        assert sum(confidences.values()) == pytest.approx(1.0)
+        assert classifier.get_confidence_scores(DOCUMENT) == confidences
+
+    def test_nothing_scored(self):
+        classifier = DocumentClassifier()
+
+        assert classifier.classify_with_confidence("nothing relevant") == (
+            DocumentType.UNKNOWN, {DocumentType.UNKNOWN: 1.0}
+        )
+
+    def test_raw_prepared_and_streamed_agree(self):
+        analyzer = DocumentAnalyzer()
+        analyzer.document_classifier.prefix_chars = 1000
+        classifier = analyzer.document_classifier
+        pages = [DOCUMENT[i:i + 997] for i in range(0, len(DOCUMENT), 997)]
+        text = "\n".join(pages)
+
+        raw = classifier.classify_with_confidence(text)
+        prepared = classifier.classify_with_confidence(PreparedDocument(text))
+        streamed = analyzer.analyze_pages(pages, "doc-stream")
+
+        assert raw == prepared
+        assert raw[0] == DocumentType.TERMINATION_LETTER
+        assert streamed.document_type == raw[0]
+        assert analyzer.analyze(text, "doc-whole").document_type == raw[0]
@@ -0,0 +1,24 @@
+import pytest
+from core.document_types import DocumentRequirements, DocumentType
+
+class TestDocumentRequirements:
+    def test_requirement_plans_are_compiled_once(self):
+        requirements = DocumentRequirements()
+        plan = requirements.get_plan(DocumentType.TERMINATION_LETTER)
+
+        assert plan is requirements.get_plan(DocumentType.TERMINATION_LETTER)
+        assert requirements.get_plan(DocumentType.UNKNOWN) is requirements.get_plan(DocumentType.GRIEVANCE_LETTER)
+        with pytest.raises(AttributeError):
+            plan.minimum_content_length = 0
+
+    def test_default_requirement_is_not_shared(self):
+        requirements = DocumentRequirements()
+        requirements.get_requirements(DocumentType.UNKNOWN).required_clauses.append("signature")
+
+        assert requirements.get_requirements(DocumentType.UNKNOWN).required_clauses == []
+        assert DocumentRequirements().get_requirements(DocumentType.GRIEVANCE_LETTER).required_clauses == []
+
+    def test_validate_document_without_requirements(self):
+        result = DocumentRequirements().validate_document(DocumentType.UNKNOWN, "anything")
+        assert result["is_valid"]
+        assert result["missing_required_clauses"] == []
@@ -0,0 +1,55 @@
+import pytest
+from core.findings_store import FindingsStore
+from core.models import Finding
+
+SOURCE = "The employee must attend. Payment under section 4 must be made."
+
+def make_store():
+    store = FindingsStore(SOURCE)
+    store.add("must", "Contractual Clauses", "LOW", start=13, end=17, page_number=1,
+              context_start=0, context_end=24)
+    store.add("section 4", "Legal References", "MEDIUM", start=40, end=49, page_number=1)
+    store.add("must", "Contractual Clauses", "LOW", start=50, end=54, page_number=2,
+              context_start=26, context_end=62)
+    return store
+
+class TestFindingsStore:
+    def test_views_expose_finding_fields(self):
+        store = make_store()
+        view = store[1]
+
+        assert len(store) == 3
+        assert (view.keyword, view.category, view.risk_level) == ("section 4", "Legal References", "MEDIUM")
+        assert (view.start, view.end, view.page_number, view.occurrences) == (40, 49, 1, 1)
+        assert view.context_start is None and view.offsets is None
+        assert store.keywords == ["must", "section 4"]
+
+    def test_context_rendered_on_demand(self):
+        store = make_store()
+
+        assert store[0].context == ""
+        assert store[0].get_context() == "The employee must attend"
+        assert store[0].context == "The employee must attend"
+        assert store[1].get_context(window=8) == "...t under **section 4** must be..."
+
+    def test_aggregate_merges_rows(self):
+        merged = make_store().aggregate()
+
+        assert [(f.keyword, f.occurrences) for f in merged] == [("must", 2), ("section 4", 1)]
+        assert list(merged[0].offsets) == [13, 50]
+        assert merged[0].page_number == 1
+        assert {k: list(v) for k, v in merged.category_index().items()} == {
+            "Contractual Clauses": [0],
+            "Legal References": [1]
+        }
+
+    def test_select_and_append(self):
+        store = make_store().select([2, 1])
+        store.append(Finding("notice", "Dates and Deadlines", "LOW", 3, context="given"))
+
+        assert [f.keyword for f in store] == ["must", "section 4", "notice"]
+        assert store[0].page_number == 2
+        assert store[-1].to_dict()["context"] == "given"
+        assert store[-1].start is None
+        with pytest.raises(IndexError):
+            store[3]
@@ -0,0 +1,65 @@
+import pytest
+from core.irish_law_rules import IrishEmploymentLaw, LegalRequirement
+
+class CountingSet(set):
+    """Set that records every membership test"""
+    def __init__(self, items):
+        super().__init__(items)
+        self.lookups = []
+
+    def __contains__(self, item):
+        self.lookups.append(item)
+        return super().__contains__(item)
+
+class TestComplianceEngine:
+    def test_check_compliance(self):
+        law = IrishEmploymentLaw()
+        text = "Check length of service. Verify notice period calculation."
+        result = law.check_compliance("termination", text)
+
+        assert not result["compliant"]
+        assert result["compliance_score"] == 0.0
+        assert result["missing_requirements"] == [{
+            "requirement": "Minimum notice periods",
+            "checklist_item": "Ensure proper notice delivery",
+            "reference": "Minimum Notice and Terms of Employment Act 1973"
+        }]
+        assert result["legal_references"][0]["section"] == "Section 4"
+
+    def test_results_do_not_share_legal_references(self):
+        law = IrishEmploymentLaw()
+        result = law.check_compliance("termination", "anything")
+        result["legal_references"][0]["section"] = "Section 99"
+
+        assert law.check_compliance("termination", "anything")["legal_references"][0]["section"] == "Section 4"
+        with pytest.raises(TypeError):
+            law.engine.get_plan("termination").legal_references[0]["section"] = "Section 99"
+
+    def test_unknown_document_type_is_compliant(self):
+        result = IrishEmploymentLaw().check_compliance("grievance_letter", "anything")
+        assert result["compliant"]
+        assert result["compliance_score"] == 100.0
+        assert result["legal_references"] == []
+
+    def test_shared_predicates_evaluated_once_and_short_circuit(self):
+        law = IrishEmploymentLaw()
+        law.requirements["termination"].append(LegalRequirement(
+            description="Written reasons",
+            compliance_checklist=["Check length of service", "State the reasons"]
+        ))
+        law.requirements["termination"].append(LegalRequirement(
+            description="Appeal",
+            compliance_checklist=["Offer an appeal", "Check length of service"]
+        ))
+        law.compile()
+
+        found = CountingSet({"verify notice period calculation"})
+        result = law.engine.evaluate("termination", found)
+
+        # "check length of service" fails once and is memoized for the second
+        # requirement; nothing after a failing item is looked up
+        assert found.lookups == ["check length of service", "offer an appeal"]
+        assert [m["checklist_item"] for m in result["missing_requirements"]] == [
+            "Check length of service", "Check length of service", "Offer an appeal"
+        ]
+        assert law.vocabulary().count("check length of service") == 1
@@ -0,0 +1,47 @@
+import pytest
+from core.keyword_matcher import KeywordAutomaton
+from core.document_types import DocumentRequirements, DocumentType
+from services.classifier.document_classifier import DocumentClassifier
+
+class TestKeywordAutomaton:
+    def test_finds_overlapping_hits_with_offsets(self):
+        matcher = KeywordAutomaton(["notice", "notice period", "period"])
+        hits = matcher.find_all("the notice period ends")
+
+        assert (4, 10, "notice") in hits
+        assert (4, 17, "notice period") in hits
+        assert (11, 17, "period") in hits
+
+    def test_count_and_present(self):
+        matcher = KeywordAutomaton(["shall be", "must"])
+        text = "it shall be done and must be done and shall be paid"
+
+        assert matcher.count(text) == {"shall be": 2, "must": 1}
+        assert matcher.present("nothing here") == set()
+
+    def test_matches_substring_search(self):
+        keywords = ["he", "she", "his", "hers"]
+        text = "ushers and his sheep"
+        matcher = KeywordAutomaton(keywords)
+
+        expected = sorted(
+            (i, i + len(k), k) for k in keywords
+            for i in range(len(text)) if text.startswith(k, i)
+        )
+        assert sorted(matcher.find_all(text)) == expected
+
+class TestKeywordUsers:
+    def test_classifier_scores(self):
+        classifier = DocumentClassifier()
+        scores = classifier._calculate_scores("termination notice period termination")
+        assert scores[DocumentType.TERMINATION_LETTER] == pytest.approx(3 * 1.3)
+
+    def test_validate_document_single_scan(self):
+        requirements = DocumentRequirements()
+        result = requirements.validate_document(
+            DocumentType.TERMINATION_LETTER,
+            "Termination Date: today. Notice Period: one week. Appeal rights apply."
+        )
+        assert "termination date" not in result["missing_required_clauses"]
+        assert "reason for termination" in result["missing_required_clauses"]
+        assert "appeal rights" not in result["missing_recommended_clauses"]
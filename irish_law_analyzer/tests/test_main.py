@@ -1,4 +1,6 @@
+import asyncio
 import pytest
+import time
 from fastapi.testclient import TestClient
 from pathlib import Path
 
@@ -19,6 +21,82 @@ def test_upload_pdf(client, test_pdf):
     assert "analysis" in data
     assert "risk_score" in data["analysis"]
     assert "findings" in data["analysis"]
+    findings = data["analysis"]["findings"]
+    for category, indices in data["analysis"]["categories"].items():
+        assert all(findings[index]["category"] == category for index in indices)
+
+def test_upload_pdf_streamed_analysis(client, test_pdf, monkeypatch):
+    from app import main
+    monkeypatch.setattr(main.settings, "STREAM_ANALYSIS_MIN_PAGES", 1)
+    monkeypatch.setattr(main.document_analyzer, "analyze", None)
+
+    with open(test_pdf, "rb") as f:
+        # Distinct bytes so the result cache cannot answer
+        content = f.read() + b"\n%streamed"
+    response = client.post("/upload/", files={"file": ("long.pdf", content, "application/pdf")})
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "COMPLETED"
+
+def test_repeat_upload_served_from_cache(client, test_pdf):
+    with open(test_pdf, "rb") as f:
+        content = f.read()
+
+    first = client.post("/upload/", files={"file": ("a.pdf", content, "application/pdf")})
+    second = client.post("/upload/", files={"file": ("b.pdf", content, "application/pdf")})
+
+    assert first.status_code == 200 and second.status_code == 200
+    assert second.json()["metadata"]["cache_hit"]
+    assert second.json()["filename"] == "b.pdf"
+    assert second.json()["analysis"] == first.json()["analysis"]
+
+def test_failed_analysis_not_served_from_cache(client, test_pdf, monkeypatch):
+    from app import main
+    classifier = main.document_analyzer.document_classifier
+    classify = classifier.classify_document
+    calls = []
+
+    def fail_once(document):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("transient failure")
+        return classify(document)
+
+    monkeypatch.setattr(classifier, "classify_document", fail_once)
+    with open(test_pdf, "rb") as f:
+        # Distinct bytes so earlier tests' cached results cannot answer
+        content = f.read() + b"\n%fail-once"
+
+    first = client.post("/upload/", files={"file": ("a.pdf", content, "application/pdf")})
+    second = client.post("/upload/", files={"file": ("a.pdf", content, "application/pdf")})
+
+    assert first.json()["status"] == "FAILED"
+    assert second.json()["status"] == "COMPLETED"
+    assert not second.json()["metadata"]["cache_hit"]
+    assert len(calls) == 2
+
+def test_upload_analysis_type(client, test_pdf):
+    with open(test_pdf, "rb") as f:
+        content = f.read()
+
+    full = client.post("/upload/", files={"file": ("a.pdf", content, "application/pdf")})
+    basic = client.post(
+        "/upload/?analysis_type=BASIC",
+        files={"file": ("a.pdf", content, "application/pdf")}
+    )
+
+    assert basic.status_code == 200
+    assert basic.json()["analysis"]["analysis_type"] == "BASIC"
+    assert basic.json()["analysis"]["findings"] == []
+    assert full.json()["analysis"]["analysis_type"] == "COMPREHENSIVE"
+
+def test_upload_unknown_analysis_type(client, test_pdf):
+    with open(test_pdf, "rb") as f:
+        response = client.post(
+            "/upload/?analysis_type=EXHAUSTIVE",
+            files={"file": ("test.pdf", f, "application/pdf")}
+        )
+    assert response.status_code == 422
 
 def test_upload_invalid_file(client):
     response = client.post(
@@ -35,8 +113,120 @@ def test_upload_large_file(client):
     )
     assert response.status_code == 413
 
+def test_create_job_and_poll(client, test_pdf):
+    with open(test_pdf, "rb") as f:
+        response = client.post(
+            "/jobs/",
+            files={"file": ("test.pdf", f, "application/pdf")}
+        )
+    
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    for _ in range(100):
+        data = client.get(f"/jobs/{job_id}").json()
+        if data["status"] in ("COMPLETED", "FAILED"):
+            break
+        time.sleep(0.1)
+
+    assert data["status"] == "COMPLETED"
+    assert "risk_score" in data["result"]["analysis"]
+
+def test_get_unknown_job(client):
+    response = client.get("/jobs/does-not-exist")
+    assert response.status_code == 404
+
+def test_upload_empty_file(client):
+    response = client.post(
+        "/upload/",
+        files={"file": ("empty.pdf", b"", "application/pdf")}
+    )
+    assert response.status_code == 415
+
+def test_upload_rejected_by_declared_length(client, test_pdf, monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", 100)
+    monkeypatch.setattr(settings, "UPLOAD_ENVELOPE_ALLOWANCE", 0)
+
+    with open(test_pdf, "rb") as f:
+        response = client.post(
+            "/jobs/",
+            files={"file": ("test.pdf", f, "application/pdf")}
+        )
+    assert response.status_code == 413
+
+def test_context_rendered_for_top_findings_only(monkeypatch):
+    from app.config import settings
+    from app.main import _serialize_findings
+    from core.models import Finding
+    monkeypatch.setattr(settings, "CONTEXT_TOP_N", 1)
+
+    source = "Notice is due under section 12 of the act."
+    low = Finding("notice", "LOW", "Dates and Deadlines", 1, start=0, end=6, source=source)
+    medium = Finding("section 12", "MEDIUM", "Legal References", 1, start=20, end=30, source=source)
+    serialized = _serialize_findings([low, medium])
+
+    assert serialized[1]["context"] == "Notice is due under **section 12** of the act."
+    assert serialized[0]["context"] == ""
+    assert low.context == ""
+
 def test_health_check(client):
     response = client.get("/health")
     assert response.status_code == 200
     data = response.json()
-    assert data["status"] == "healthy"
\ No newline at end of file
+    assert data["status"] == "healthy"
+
+
+def test_chunked_upload_over_limit_is_cut_off(client, test_pdf, monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", 1024)
+    monkeypatch.setattr(settings, "UPLOAD_ENVELOPE_ALLOWANCE", 0)
+
+    with open(test_pdf, "rb") as f:
+        head = f.read(512)
+    boundary = "upload-boundary"
+
+    def body():
+        # A generator body is sent chunked, without a Content-Length
+        yield (
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="file"; filename="big.pdf"\r\n'
+            "Content-Type: application/pdf\r\n\r\n"
+        ).encode() + head
+        for _ in range(100):
+            yield b"0" * 1024
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    response = client.post(
+        "/upload/",
+        content=body(),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"}
+    )
+
+    assert response.status_code == 413
+
+
+def test_upload_size_limit_stops_reading_the_body(monkeypatch):
+    from app.config import settings
+    from app.main import UploadSizeLimitMiddleware
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", 1024)
+    monkeypatch.setattr(settings, "UPLOAD_ENVELOPE_ALLOWANCE", 0)
+    received = []
+    sent = []
+
+    async def receive():
+        received.append(1)
+        return {"type": "http.request", "body": b"0" * 512, "more_body": len(received) < 100}
+
+    async def send(message):
+        sent.append(message)
+
+    async def app(scope, receive, send):
+        while (await receive())["more_body"]:
+            pass
+
+    scope = {"type": "http", "method": "POST", "path": "/upload/", "headers": []}
+    asyncio.run(UploadSizeLimitMiddleware(app)(scope, receive, send))
+
+    assert len(received) == 3
+    assert sent[0]["status"] == 413
@@ -0,0 +1,71 @@
+import pytest
+from core.document_types import DocumentType
+from core.prepared_document import PreparedDocument
+from services.classifier.document_classifier import DocumentClassifier
+from services.classifier.ngram_classifier import HashedNgramClassifier
+
+DOCUMENTS = [
+    "This employment contract sets out the salary and working hours.",
+    "Notice of termination. Your notice period is four weeks.",
+    "A disciplinary warning is issued for misconduct.",
+    "The handbook sets out each policy and procedure.",
+    "Nothing to classify here.",
+    ""
+]
+
+class TestHashedNgramClassifier:
+    def test_seeded_model_matches_keyword_classifier(self):
+        classifier = DocumentClassifier()
+
+        assert classifier.classify_batch(DOCUMENTS) == [
+            classifier.classify_document(document) for document in DOCUMENTS
+        ]
+
+    def test_seeded_scores_weight_whole_word_keywords(self):
+        classifier = DocumentClassifier()
+        model = classifier.ngram_classifier
+        scores = model.scores(["termination notice period termination"])
+
+        label = model.label_ids[DocumentType.TERMINATION_LETTER]
+        assert scores[0, label] == pytest.approx(3 * 1.3)
+        assert scores.shape == (1, len(classifier.patterns))
+
+    def test_blocks_do_not_change_scores(self):
+        classifier = DocumentClassifier()
+        small_blocks = HashedNgramClassifier.from_keyword_table(classifier.patterns, block_chars=40)
+        documents = DOCUMENTS * 5
+
+        assert (small_blocks.scores(documents) == classifier.ngram_classifier.scores(documents)).all()
+
+    def test_accepts_prepared_documents(self):
+        classifier = DocumentClassifier()
+        prepared = [PreparedDocument(document) for document in DOCUMENTS]
+
+        assert classifier.classify_batch(prepared) == classifier.classify_batch(DOCUMENTS)
+
+    def test_partial_fit_learns_from_character_ngrams(self):
+        labels = [DocumentType.GRIEVANCE_LETTER, DocumentType.HEALTH_SAFETY]
+        model = HashedNgramClassifier(labels)
+        texts = ["I wish to raise a grievance", "report every hazard to the safety officer"]
+
+        assert model.classify_batch(texts) == [DocumentType.UNKNOWN, DocumentType.UNKNOWN]
+        model.partial_fit(texts, labels)
+        assert model.classify_batch(texts) == labels
+        # Character n-grams carry the weights over to unseen inflections
+        assert model.classify_batch(["my grievances", "hazardous"]) == labels
+
+    def test_weighted_feature_mask_follows_partial_fit(self):
+        labels = [DocumentType.GRIEVANCE_LETTER, DocumentType.HEALTH_SAFETY]
+        model = HashedNgramClassifier(labels)
+        before = model._weighted_features()
+
+        assert model._weighted_features() is before
+        model.partial_fit(["I wish to raise a grievance"], [DocumentType.GRIEVANCE_LETTER])
+        assert (model._weighted_features() == (model.weights != 0).any(axis=0)).all()
+        assert model._weighted_features().any() and not before.any()
+
+    def test_keyword_longer_than_ngram_range_is_rejected(self):
+        patterns = {DocumentType.WORKPLACE_POLICY: {'keywords': ['code of conduct'], 'weight': 1.0}}
+
+        with pytest.raises(ValueError):
+            HashedNgramClassifier.from_keyword_table(patterns, word_ngram_range=(1, 2))
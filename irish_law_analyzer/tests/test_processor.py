@@ -1,6 +1,15 @@
 import pytest
+import os
+import sys
+import threading
+import time
 from services.processor.pdf_processor import PDFProcessor
 from services.processor.image_processor import ImageProcessor
+from services.processor.executor import ProcessPoolBackend
+from services.processor.ocr import PageOCRPool, PersistentTesseractEngine, _parse_tesseract_config
+from services.processor.ocr_cache import PageOCRCache
+from utils.cache import DiskCache
+from PIL import Image
 from core.models import ProcessingResult
 
 class TestPDFProcessor:
@@ -26,6 +35,79 @@ class TestPDFProcessor:
         assert not result.success
         assert result.error
 
+    def test_single_pass_metadata(self, test_pdf):
+        with open(test_pdf, 'rb') as f:
+            result = self.processor.process_document(f.read(), "test.pdf")
+
+        assert result.metadata.page_count == len(result.pages)
+        assert result.extracted_text == "\n".join(result.pages)
+        assert result.metadata.word_count == len(result.extracted_text.split())
+
+    def test_ocr_only_pages_without_text_layer(self, monkeypatch):
+        from services.processor import pdf_processor as module
+
+        rendered = []
+
+        def fake_convert(pdf_path, dpi, first_page, last_page):
+            rendered.append((first_page, last_page))
+            return [f"image-{n}" for n in range(first_page, last_page + 1)]
+
+        monkeypatch.setattr(
+            self.processor, "_extract_pages_direct",
+            lambda file_bytes: (["typed page one", "", "typed page three", "", ""], 5)
+        )
+        monkeypatch.setattr(module, "convert_from_path", fake_convert)
+        self.processor.ocr_cache = None
+        self.processor.ocr_engine = PageOCRPool(
+            max_workers=1, ocr_func=lambda image, lang, config: f"ocr {image}"
+        )
+
+        result = self.processor.extract_text(b"%PDF", "mixed.pdf")
+
+        assert result.success
+        assert rendered == [(2, 2), (4, 5)]
+        assert result.pages == [
+            "typed page one", "ocr image-2", "typed page three", "ocr image-4", "ocr image-5"
+        ]
+        assert result.metadata.ocr_pages == [2, 4, 5]
+
+    def test_render_windows_respect_batch_size(self):
+        self.processor.set_max_pages_in_memory(8, render_batch_size=2)
+        assert self.processor._render_windows([1, 2, 3, 4, 5, 9]) == [(1, 2), (3, 4), (5, 5), (9, 9)]
+
+    def test_render_errors_propagate(self, monkeypatch):
+        from services.processor import pdf_processor as module
+
+        def failing_convert(pdf_path, dpi, first_page, last_page):
+            raise RuntimeError("poppler missing")
+
+        monkeypatch.setattr(module, "convert_from_path", failing_convert)
+        with pytest.raises(RuntimeError):
+            list(self.processor._render_pages(b"%PDF", [1]))
+
+    def test_ocr_cache_skips_seen_pages(self, monkeypatch, tmp_path):
+        from services.processor import pdf_processor as module
+
+        page_image = Image.new('L', (20, 20), color=255)
+        monkeypatch.setattr(
+            module, "convert_from_path",
+            lambda pdf_path, dpi, first_page, last_page: [page_image.copy()]
+        )
+        recognised = []
+
+        def fake_ocr(image, lang, config):
+            recognised.append(image)
+            return "appendix text"
+
+        self.processor.ocr_cache = PageOCRCache(DiskCache(tmp_path))
+        self.processor.ocr_engine = PageOCRPool(max_workers=1, ocr_func=fake_ocr)
+
+        first = self.processor._extract_text_ocr(b"%PDF", [1])
+        second = self.processor._extract_text_ocr(b"%PDF", [1])
+
+        assert first == second == [(1, "appendix text")]
+        assert len(recognised) == 1
+
 class TestImageProcessor:
     def setup_method(self):
         self.processor = ImageProcessor()
@@ -47,4 +129,166 @@ class TestImageProcessor:
     def test_process_invalid_image(self):
         result = self.processor.process_document(b"invalid data", "test.jpg")
         assert not result.success
-        assert result.error
\ No newline at end of file
+        assert result.error
+
+def fake_page_ocr(image, lang, config):
+    return f"{lang}:{image}"
+
+class TestPageOCRPool:
+    def test_pages_reassembled_in_order(self):
+        pool = PageOCRPool(max_workers=2, ocr_func=fake_page_ocr)
+        try:
+            pages = [(3, "c"), (1, "a"), (2, "b")]
+            assert pool.ocr_pages(pages, "eng") == [(1, "eng:a"), (2, "eng:b"), (3, "eng:c")]
+        finally:
+            pool.shutdown()
+
+class TestOCRWorkerCount:
+    def test_budget_covers_every_cpu(self, monkeypatch):
+        from services.processor import ocr as module
+        monkeypatch.setattr(module.os, "cpu_count", lambda: 8)
+        monkeypatch.setattr(module.settings, "OCR_WORKERS", 0)
+        monkeypatch.setattr(module.settings, "PROCESSOR_POOL_SIZE", 8)
+
+        assert module.ocr_worker_count() == 8
+        # Persistent workers keep a model loaded each, so they split the CPUs
+        assert module.persistent_worker_count() == 1
+
+    def test_explicit_worker_count(self, monkeypatch):
+        from services.processor import ocr as module
+        monkeypatch.setattr(module.settings, "OCR_WORKERS", 3)
+        assert module.ocr_worker_count() == 3
+
+    def test_lone_document_fans_out_under_default_settings(self, monkeypatch):
+        from services.processor import ocr as module
+        monkeypatch.setattr(module.os, "cpu_count", lambda: 4)
+        monkeypatch.setattr(module.settings, "PROCESSOR_POOL_SIZE", 4)
+        monkeypatch.setattr(module, "_default_engine", None)
+        monkeypatch.setattr(module, "_ocr_budget", None)
+        engine = module.get_default_ocr_engine()
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_ocr(image, lang, config):
+            with lock:
+                running.append(image)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(image)
+            return image
+
+        engine.ocr_func = slow_ocr
+        try:
+            results = engine.ocr_pages([(n, f"page-{n}") for n in range(1, 9)], "eng")
+        finally:
+            engine.shutdown()
+
+        assert [text for _, text in results] == [f"page-{n}" for n in range(1, 9)]
+        assert 1 < max(peak) <= 4
+
+    def test_budget_caps_pages_across_engines(self, monkeypatch):
+        from services.processor import ocr as module
+        monkeypatch.setattr(module, "_ocr_budget", threading.BoundedSemaphore(2))
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_ocr(image, lang, config):
+            with lock:
+                running.append(image)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(image)
+            return image
+
+        engines = [PageOCRPool(max_workers=4, ocr_func=slow_ocr) for _ in range(2)]
+        threads = [
+            threading.Thread(target=engine.ocr_pages, args=([(n, f"{i}-{n}") for n in range(6)], "eng"))
+            for i, engine in enumerate(engines)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for engine in engines:
+            engine.shutdown()
+
+        assert max(peak) == 2
+
+class FakeTesserocr:
+    """Stand-in for tesserocr reporting which process and API recognised a page"""
+
+    class PyTessBaseAPI:
+        created = 0
+
+        def __init__(self, lang, psm, oem):
+            FakeTesserocr.PyTessBaseAPI.created += 1
+            self.lang = lang
+            self.number = FakeTesserocr.PyTessBaseAPI.created
+
+        def SetImage(self, image):
+            self.image = image
+
+        def GetUTF8Text(self):
+            return f"{self.lang}:{self.image.size[0]}:{os.getpid()}:{self.number}"
+
+        def End(self):
+            pass
+
+class TestPersistentTesseractEngine:
+    def test_parse_tesseract_config(self):
+        assert _parse_tesseract_config('--psm 1 --oem 3') == (1, 3)
+        assert _parse_tesseract_config('') == (3, 3)
+
+    def test_requires_tesserocr(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "tesserocr", None)
+        with pytest.raises(RuntimeError, match="requires tesserocr"):
+            PersistentTesseractEngine(max_workers=1)
+
+    def test_workers_keep_models_loaded_across_pages(self, monkeypatch):
+        # Workers are forked, so they inherit the stand-in module
+        monkeypatch.setitem(sys.modules, "tesserocr", FakeTesserocr)
+        engine = PersistentTesseractEngine(max_workers=2)
+        try:
+            pages = [(n, Image.new('L', (n, 10))) for n in (3, 1, 2, 4)]
+            results = engine.ocr_pages(pages, "eng")
+
+            assert [page for page, _ in results] == [1, 2, 3, 4]
+            assert [text.split(":")[1] for _, text in results] == ["1", "2", "3", "4"]
+            # Every page ran in one of the two long-lived workers, each
+            # loading the model once
+            apis = {tuple(text.split(":")[2:]) for _, text in results}
+            assert len(apis) <= 2
+            assert all(api[1] == "1" for api in apis)
+        finally:
+            engine.shutdown()
+
+class TestProcessPoolBackend:
+    def setup_method(self):
+        self.backend = ProcessPoolBackend(max_workers=1)
+        self.processor = PDFProcessor()
+
+    def teardown_method(self):
+        self.backend.shutdown()
+
+    def test_process_valid_pdf(self, test_pdf):
+        with open(test_pdf, 'rb') as f:
+            result = self.backend.process_document(self.processor, f.read(), "test.pdf")
+
+        assert isinstance(result, ProcessingResult)
+        assert result.success
+        assert result.extracted_text
+
+    def test_process_invalid_file(self):
+        result = self.backend.process_document(self.processor, b"invalid data", "test.pdf")
+        assert not result.success
+        assert result.error
+
+    def test_disabled_backend_runs_inline(self, test_pdf):
+        backend = ProcessPoolBackend(max_workers=0)
+        with open(test_pdf, 'rb') as f:
+            result = backend.process_document(self.processor, f.read(), "test.pdf")
+        assert result.success
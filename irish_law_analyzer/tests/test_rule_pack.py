@@ -0,0 +1,149 @@
+import copy
+import json
+import pytest
+from core.document_types import DocumentType
+from core.rule_pack import (
+    DEFAULT_RULE_PACK_PATH, RulePack, RulePackError, load_rule_pack
+)
+from services.analyzer.document_analyzer import DocumentAnalyzer
+from services.analyzer.rule_snapshot import RuleSnapshot
+
+with open(DEFAULT_RULE_PACK_PATH, encoding="utf-8") as f:
+    PACK_DATA = json.load(f)
+
+
+def write_pack(tmp_path, data, name="rules.json"):
+    path = tmp_path / name
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return path
+
+
+def custom_pack():
+    """The bundled pack with an extra termination keyword and a new version"""
+    data = copy.deepcopy(PACK_DATA)
+    data["version"] = "2.0.0"
+    data["classifier"]["TERMINATION_LETTER"]["keywords"].append("zebra")
+    return data
+
+
+class TestRulePack:
+    def test_bundled_pack(self):
+        pack = load_rule_pack()
+
+        assert pack.name == "irish-employment"
+        assert pack.fingerprint.startswith(f"{pack.name}@{pack.version}:")
+        assert pack.source == str(DEFAULT_RULE_PACK_PATH)
+
+    def test_fingerprint_follows_content(self):
+        data = copy.deepcopy(PACK_DATA)
+        data["classifier"]["EMPLOYMENT_CONTRACT"]["weight"] += 1
+
+        assert RulePack.from_dict(PACK_DATA).fingerprint == RulePack.from_dict(PACK_DATA).fingerprint
+        assert RulePack.from_dict(data).fingerprint != RulePack.from_dict(PACK_DATA).fingerprint
+
+    @pytest.mark.parametrize("change, message", [
+        (lambda d: d.pop("version"), "rule pack: missing field 'version'"),
+        (lambda d: d.update(format_version=2), "unsupported format 2"),
+        (lambda d: d["classifier"]["EMPLOYMENT_CONTRACT"].update(weight="high"),
+         "rule pack.classifier.EMPLOYMENT_CONTRACT.weight: expected int or float"),
+        (lambda d: d["document_requirements"]["EMPLOYMENT_CONTRACT"].update(extra=1),
+         "rule pack.document_requirements.EMPLOYMENT_CONTRACT: unknown field 'extra'"),
+    ])
+    def test_schema_errors_name_the_field(self, change, message):
+        data = copy.deepcopy(PACK_DATA)
+        change(data)
+
+        with pytest.raises(RulePackError, match=message):
+            RulePack.from_dict(data)
+
+    def test_unknown_names_are_rejected_when_compiled(self):
+        data = copy.deepcopy(PACK_DATA)
+        data["classifier"]["OFFER_LETTER"] = data["classifier"]["EMPLOYMENT_CONTRACT"]
+        with pytest.raises(RulePackError, match="unknown DocumentType 'OFFER_LETTER'"):
+            RuleSnapshot.compile(RulePack.from_dict(data))
+
+        data = copy.deepcopy(PACK_DATA)
+        reference = data["legal_requirements"]["employment_contract"][0]["references"][0]
+        reference["act_id"] = "NO_SUCH_ACT"
+        with pytest.raises(RulePackError, match="unknown act 'NO_SUCH_ACT'"):
+            RuleSnapshot.compile(RulePack.from_dict(data))
+
+    def test_unreadable_files(self, tmp_path):
+        with pytest.raises(RulePackError, match="Cannot read"):
+            load_rule_pack(tmp_path / "missing.json")
+
+        path = tmp_path / "broken.json"
+        path.write_text("{", encoding="utf-8")
+        with pytest.raises(RulePackError, match="Cannot parse"):
+            load_rule_pack(path)
+
+    def test_yaml_pack(self, tmp_path):
+        yaml = pytest.importorskip("yaml")
+        path = tmp_path / "rules.yaml"
+        path.write_text(yaml.safe_dump(PACK_DATA), encoding="utf-8")
+
+        pack = load_rule_pack(path)
+
+        # YAML reads ISO dates as dates; they compile to the same rules
+        snapshot = RuleSnapshot.compile(pack)
+        bundled = RuleSnapshot.compile(load_rule_pack())
+        assert snapshot.irish_law.requirements == bundled.irish_law.requirements
+
+
+class TestRuleReload:
+    def test_reload_swaps_rules(self, tmp_path):
+        analyzer = DocumentAnalyzer()
+        old = analyzer.rules
+        assert analyzer.document_classifier.classify_document("zebra zebra") == DocumentType.UNKNOWN
+
+        new = analyzer.reload_rules(str(write_pack(tmp_path, custom_pack())))
+
+        assert analyzer.rules is new and new is not old
+        assert new.fingerprint.startswith("irish-employment@2.0.0:")
+        assert analyzer.document_classifier.classify_document("zebra zebra") == DocumentType.TERMINATION_LETTER
+        result = analyzer.analyze("zebra zebra, notice of termination.", "doc-1")
+        assert result.metadata["rules"] == new.fingerprint
+
+    def test_running_stream_keeps_its_rules(self, tmp_path):
+        analyzer = DocumentAnalyzer()
+        old = analyzer.rules
+        stream = analyzer.start_stream("doc-1")
+        stream.feed_page("Zebra zebra zebra. Your salary and working hours are set out below.")
+
+        analyzer.reload_rules(str(write_pack(tmp_path, custom_pack())))
+        stream.feed_page("Zebra zebra zebra.")
+        result = stream.finish()
+
+        assert result.metadata["rules"] == old.fingerprint
+        assert result.document_type == DocumentType.EMPLOYMENT_CONTRACT
+
+    def test_invalid_reload_keeps_rules(self, tmp_path):
+        analyzer = DocumentAnalyzer()
+        old = analyzer.rules
+        data = custom_pack()
+        data["classifier"]["TERMINATION_LETTER"]["weight"] = "heavy"
+
+        with pytest.raises(RulePackError):
+            analyzer.reload_rules(str(write_pack(tmp_path, data)))
+
+        assert analyzer.rules is old
+
+
+def test_rules_endpoints(client, tmp_path, monkeypatch):
+    from app import main
+    analyzer = DocumentAnalyzer()
+    monkeypatch.setattr(main, "document_analyzer", analyzer)
+
+    current = client.get("/rules").json()
+    assert current["fingerprint"] == analyzer.rules.fingerprint
+
+    monkeypatch.setattr(analyzer, "rule_pack_path", str(tmp_path / "missing.json"))
+    response = client.post("/rules/reload")
+    assert response.status_code == 422
+    assert client.get("/rules").json()["fingerprint"] == current["fingerprint"]
+
+    monkeypatch.setattr(analyzer, "rule_pack_path", str(write_pack(tmp_path, custom_pack())))
+    response = client.post("/rules/reload")
+    assert response.status_code == 200
+    assert response.json()["version"] == "2.0.0"
+    assert client.get("/rules").json()["fingerprint"] == response.json()["fingerprint"]
@@ -1,4 +1,5 @@
 from .helpers import (
+    compute_content_hash,
     generate_document_id,
     create_temp_file_path,
     cleanup_old_files,
@@ -9,10 +10,12 @@ from .logger import logger
 from .validators import (
     validate_file_type,
     validate_file_size,
+    validate_upload_size,
     validate_text_content
 )
 
 __all__ = [
+    'compute_content_hash',
     'generate_document_id',
     'create_temp_file_path',
     'cleanup_old_files',
@@ -21,5 +24,6 @@ __all__ = [
     'logger',
     'validate_file_type',
     'validate_file_size',
+    'validate_upload_size',
     'validate_text_content'
 ]
\ No newline at end of file
@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Optional, Union
+import os
+import tempfile
+import threading
+
+
+class LRUCache:
+    """Thread-safe in-memory cache that evicts the least recently used entry"""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCache:
+    """Size-bounded file cache keyed by hex digests.
+
+    Entries are written atomically, so several worker processes can share
+    one directory. Reads refresh an entry's mtime and eviction removes the
+    oldest files first once the directory grows past ``max_bytes``.
+    """
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = 512 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._size = sum(path.stat().st_size for path in self._iter_files())
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def _iter_files(self):
+        return (
+            path for path in self.directory.glob("*/*")
+            if path.is_file() and not path.name.startswith(".tmp-")
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+            return data
+        except (FileNotFoundError, IsADirectoryError):
+            return None
+
+    def set(self, key: str, data: bytes):
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                temp_file.write(data)
+            os.replace(temp_path, path)
+        except Exception:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Remove least recently used files until the cache fits again"""
+        files = []
+        for path in self._iter_files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        self._size = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files, key=lambda item: item[0]):
+            if self._size <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                self._size -= size
+            except FileNotFoundError:
+                continue
+
+    def clear(self):
+        with self._lock:
+            for path in self._iter_files():
+                path.unlink(missing_ok=True)
+            self._size = 0
@@ -1,14 +1,18 @@
 import os
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import hashlib
 from pathlib import Path
 
-def generate_document_id(filename: str, content: bytes) -> str:
+def compute_content_hash(content: bytes) -> str:
+    """Return the SHA-256 hex digest used to address uploaded content"""
+    return hashlib.sha256(content).hexdigest()
+
+def generate_document_id(filename: str, content: bytes, content_hash: Optional[str] = None) -> str:
     """Generate unique document ID based on content and timestamp"""
     timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-    content_hash = hashlib.md5(content).hexdigest()[:10]
-    return f"{timestamp}_{content_hash}"
+    content_hash = content_hash or compute_content_hash(content)
+    return f"{timestamp}_{content_hash[:10]}"
 
 def create_temp_file_path(filename: str, folder: str = "uploads") -> Path:
     """Create temporary file path for uploaded documents"""
@@ -35,7 +35,14 @@ def validate_file_size(content: bytes) -> Tuple[bool, str]:
     Validate file size
     Returns: (is_valid, error_message)
     """
-    if len(content) > settings.MAX_FILE_SIZE:
+    return validate_upload_size(len(content))
+
+def validate_upload_size(size: int) -> Tuple[bool, str]:
+    """
+    Validate a byte count, e.g. the running total of a streamed upload
+    Returns: (is_valid, error_message)
+    """
+    if size > settings.MAX_FILE_SIZE:
         return False, f"File size exceeds maximum limit of {settings.MAX_FILE_SIZE} bytes"
     return True, ""
 